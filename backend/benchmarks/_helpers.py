@@ -0,0 +1,29 @@
+"""Utilities shared by the benchmark scripts."""
+import ast
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+
+def load_literal(relative_path, name):
+    """
+    Reads a module-level literal (e.g. a skills list) from a service source
+    file without importing it, since the services connect to Firestore and
+    load models at import time.
+    """
+    with open(os.path.join(BACKEND_DIR, relative_path), encoding="utf-8") as source:
+        tree = ast.parse(source.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == name for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise KeyError(f"{name} not found in {relative_path}")
+
+
+def timed(fn, *args, **kwargs):
+    """Returns (result, elapsed seconds) of a single call."""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
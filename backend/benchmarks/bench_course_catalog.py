@@ -0,0 +1,108 @@
+"""
+Binary course catalog (common.course_catalog) versus parsing the CSV
+at import. First, every course record read from the catalog must equal
+the one the old code built from the DataFrame. Then startup time and
+per-worker memory are measured in fresh processes: each worker loads
+the courses as the skill analysis service does at import (before: a
+DataFrame plus in-process records and tag index) and serves one
+lookup. RSS counts the mapped catalog pages. USS (private memory)
+leaves out pages shared with the other workers.
+
+    python benchmarks/bench_course_catalog.py [workers]
+"""
+import math
+import os
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+from _helpers import BACKEND_DIR
+
+from common.course_catalog import DEFAULT_CSV_PATH, CourseCatalog, build_catalog, parse_tags
+
+WORKER = r"""
+import os, sys, time
+sys.path[:0] = [{backend!r}, os.path.join({backend!r}, "skill_analysis")]
+import numpy, pandas as pd
+from fuzzywuzzy import fuzz
+
+def memory():
+    values = {{}}
+    with open("/proc/self/smaps_rollup") as rollup:
+        for line in rollup:
+            name, _, rest = line.partition(":")
+            if name in ("Rss", "Private_Clean", "Private_Dirty"):
+                values[name] = int(rest.split()[0])
+    return values["Rss"], values["Private_Clean"] + values["Private_Dirty"]
+
+rss_before, uss_before = memory()
+started = time.perf_counter()
+if {mode!r} == "csv":
+    courses_df = pd.read_csv({csv!r})
+    courses_df["Tags"] = courses_df["Tags"].apply(
+        lambda x: [tag.strip(" '[]") for tag in x.split(',')] if isinstance(x, str) else []
+    )
+    # What an in-process index holds: a record per course and tag -> course ids
+    records = courses_df[["Name", "Url", "Rating", "Difficulty", "Tags"]].to_dict(orient="records")
+    tag_courses = {{}}
+    for course_id, tags in enumerate(courses_df["Tags"]):
+        for tag in tags:
+            tag_courses.setdefault(tag.lower(), []).append(course_id)
+    found = [records[course_id] for tag in tag_courses if fuzz.partial_ratio("python", tag) >= 70 for course_id in tag_courses[tag]][:12]
+else:
+    from course_index import CourseIndex
+    index = CourseIndex({csv!r}, {catalog!r})
+    found = index.courses_for("python")
+elapsed = time.perf_counter() - started
+rss_after, uss_after = memory()
+print(elapsed, rss_after - rss_before, uss_after - uss_before, len(found))
+"""
+
+
+def safe_type(value):
+    return None if value is None or (isinstance(value, float) and math.isnan(value)) else value
+
+
+def legacy_records(csv_path):
+    """Records as skill_gap_analysis built them, with safe_type applied to every field."""
+    courses_df = pd.read_csv(csv_path)
+    records = []
+    for _, row in courses_df.iterrows():
+        records.append({
+            "name": safe_type(row["Name"]),
+            "url": safe_type(row["Url"]),
+            "rating": safe_type(row["Rating"]),
+            "difficulty": safe_type(row["Difficulty"]),
+            "tags": parse_tags(row["Tags"])
+        })
+    return records
+
+
+def run_workers(mode, count, catalog_path):
+    script = WORKER.format(backend=BACKEND_DIR, mode=mode, csv=DEFAULT_CSV_PATH, catalog=catalog_path)
+    workers = [subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE, text=True) for _ in range(count)]
+    results = [worker.communicate()[0].split()[-4:] for worker in workers]
+    return [(float(elapsed), int(rss), int(uss)) for elapsed, rss, uss, _ in results]
+
+
+def main(workers=4):
+    with tempfile.TemporaryDirectory() as directory:
+        catalog_path = build_catalog(DEFAULT_CSV_PATH, os.path.join(directory, "courses.catalog"))
+        catalog = CourseCatalog(catalog_path)
+        expected = legacy_records(DEFAULT_CSV_PATH)
+        mismatches = [course_id for course_id, record in enumerate(expected) if catalog.record(course_id) != record]
+        print(f"{len(expected)} courses, record mismatches: {len(mismatches)} {mismatches[:5]}")
+        print(f"CSV {os.path.getsize(DEFAULT_CSV_PATH) / 1024:.0f} KiB, catalog {os.path.getsize(catalog_path) / 1024:.0f} KiB")
+
+        print(f"{workers} workers, each loading the courses and serving one lookup (mean per worker):")
+        for mode in ("csv", "catalog"):
+            results = run_workers(mode, workers, catalog_path)
+            elapsed, rss, uss = (sum(values) / len(values) for values in zip(*results))
+            print(f"  {mode:<8} startup {elapsed * 1000:8.1f} ms   RSS +{rss / 1024:6.2f} MiB   USS +{uss / 1024:6.2f} MiB")
+    assert not mismatches
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4)
@@ -0,0 +1,92 @@
+"""
+skill_analysis.course_index.CourseIndex versus the original
+courses_df.iterrows() scan in skill_gap_analysis: the set of courses
+matched for each skill must be identical (the index only changes their
+order, best rated first), then latency of the course step for a typical
+request of missing skills, plus a reload after the CSV changes.
+
+    python benchmarks/bench_course_index.py [n_requests]
+"""
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+
+import pandas as pd
+from fuzzywuzzy import fuzz
+
+from _helpers import BACKEND_DIR, load_literal, timed
+
+sys.path.append(os.path.join(BACKEND_DIR, "skill_analysis"))
+from course_index import CourseIndex  # noqa: E402
+from common.course_catalog import DEFAULT_CSV_PATH as CSV_PATH, parse_tags  # noqa: E402
+
+SERVICE = "skill_analysis/skill_analysis_api.py"
+
+
+def fuzzy_match(text1, text2, threshold=70):
+    return fuzz.partial_ratio(text1.lower(), text2.lower()) >= threshold
+
+
+def legacy_matches(courses_df, missing_skill):
+    """Positions of the courses the original loop appended for one skill, in CSV order."""
+    matched = []
+    for position, (_, row) in enumerate(courses_df.iterrows()):
+        if any(fuzzy_match(missing_skill, tag, 70) for tag in row["Tags"]):
+            matched.append(position)
+    return matched
+
+
+def legacy_request(courses_df, missing_skills):
+    recommended = []
+    for missing_skill in missing_skills:
+        for position in legacy_matches(courses_df, missing_skill):
+            recommended.append(position)
+    return recommended[:12]
+
+
+def index_request(index, missing_skills):
+    recommended = []
+    for missing_skill in missing_skills:
+        remaining = 12 - len(recommended)
+        if remaining <= 0:
+            break
+        recommended.extend(index.courses_for(missing_skill, k=remaining))
+    return recommended
+
+
+def main(requests=5):
+    courses_df = pd.read_csv(CSV_PATH)
+    courses_df["Tags"] = courses_df["Tags"].apply(parse_tags)
+    index, build_s = timed(CourseIndex, CSV_PATH)
+
+    skills = sorted(set(load_literal(SERVICE, "sales_skills") + load_literal(SERVICE, "computer_science_skills")))
+    mismatches = [skill for skill in skills if sorted(legacy_matches(courses_df, skill)) != sorted(index.course_ids(skill))]
+    print(f"{len(skills)} skills checked, mismatched course sets: {len(mismatches)} {mismatches[:5]}")
+
+    rng = random.Random(3)
+    workload = [rng.sample(skills, 10) for _ in range(requests)]
+    fresh = CourseIndex(CSV_PATH)
+    legacy_ms = [timed(legacy_request, courses_df, missing)[1] * 1000 for missing in workload]
+    cold_ms = [timed(index_request, fresh, missing)[1] * 1000 for missing in workload]
+    warm_ms = [timed(index_request, fresh, missing)[1] * 1000 for missing in workload]
+    print(f"index build {build_s * 1000:.0f} ms; per request of 10 missing skills (median):")
+    print(f"  iterrows scan      {statistics.median(legacy_ms):10.1f} ms")
+    print(f"  index (cold tags)  {statistics.median(cold_ms):10.2f} ms")
+    print(f"  index (memoized)   {statistics.median(warm_ms):10.3f} ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "courses.csv")
+        shutil.copy(CSV_PATH, path)
+        reloading = CourseIndex(path, os.path.join(directory, "courses.catalog"), check_interval=0)
+        pd.read_csv(path).head(100).to_csv(path, index=False)
+        reloaded, reload_s = timed(reloading.maybe_reload)
+        print(f"reload after CSV change: {reloaded}, {reload_s * 1000:.0f} ms, {reloading.stats()['courses']} courses")
+        assert reloaded and reloading.stats()["courses"] == 100
+    assert not mismatches
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,115 @@
+"""
+Cross-source deduplication (dedup.JobDeduplicator) on a cross-posted
+fixture: every posting appears on one to three boards with tracking
+parameters, reworded titles and lightly edited descriptions. Reports the
+dedup rate, pair precision/recall against the true postings, dedup time
+(cold, then with cached signatures) and the scoring time saved. The
+request path uses merge(): Firestore jobs deduplicated once per mirror
+version, then one search key's scraped jobs merged in; its time per new
+key and its agreement with a full dedup are reported too.
+
+    python benchmarks/bench_dedup.py [n_postings...]
+"""
+import os
+import random
+import sys
+
+import pandas as pd
+
+from _helpers import BACKEND_DIR, timed
+from bench_scoring import CITIES, ROLES, SKILLS
+
+sys.path.append(os.path.join(BACKEND_DIR, "job_recommendation"))
+from dedup import JobDeduplicator  # noqa: E402
+from scoring import rank_jobs, score_jobs  # noqa: E402
+
+BOILERPLATE = ("We are an equal opportunity employer and value diversity at our company. "
+               "All employment is decided on the basis of qualifications, merit and business need.")
+# Vocabulary of made-up words so unrelated descriptions overlap about as little as real ones
+WORDS = ["".join(random.Random(index).choices("abcdefghijklmnoprstuvw", k=random.Random(-index).randint(3, 9)))
+         for index in range(3000)]
+
+
+def posting(rng, index, size):
+    role = rng.choice(ROLES)
+    skills = rng.sample(SKILLS, rng.randint(2, 6))
+    body = " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 120)))
+    return {
+        "posting": index,
+        "title": role.title(),
+        "company": f"Company {rng.randrange(size // 2 + 1)}",
+        "location": rng.choice(CITIES),
+        "description": f"{role} with {', '.join(skills)}. {body}. {BOILERPLATE}",
+        "skills": skills,
+    }
+
+
+def copies(rng, job):
+    """The posting as it shows up on one to three sources."""
+    listed = []
+    for source in rng.sample(["indeed", "linkedin", "firestore"], rng.randint(1, 3)):
+        copy = dict(job)
+        if source == "indeed":
+            copy["url"] = f"https://in.indeed.com/viewjob?jk={job['posting']:x}&from=serp&vjs=3"
+        elif source == "linkedin":
+            copy["url"] = f"https://www.linkedin.com/jobs/view/{job['posting']}/?trk=public_jobs&refId=abc{rng.random()}"
+            copy["title"] = "Senior " + job["title"] if rng.random() < 0.3 else job["title"]
+            copy["location"] = copy["location"].split(",")[0]
+            copy["skills"] = []
+        else:
+            copy["url"] = ""
+            copy["description"] = job["description"] + " Apply through CareerZenith."
+        copy["source"] = source
+        listed.append(copy)
+    return listed
+
+
+def make_fixture(size, seed=5):
+    rng = random.Random(seed)
+    rows = [copy for index in range(size) for copy in copies(rng, posting(rng, index, size))]
+    rng.shuffle(rows)
+    jobs = pd.DataFrame(rows)
+    jobs.index = [f"job:{i}" for i in range(len(jobs))]
+    return jobs
+
+
+def pairs(labels):
+    groups = {}
+    for position, label in enumerate(labels):
+        groups.setdefault(label, []).append(position)
+    return {(a, b) for members in groups.values() for i, a in enumerate(members) for b in members[i + 1:]}
+
+
+def main(sizes):
+    for size in sizes:
+        jobs = make_fixture(size)
+        deduplicator = JobDeduplicator()
+        labels, cold_s = timed(deduplicator.clusters, jobs)
+        # Later corpus versions reuse the MinHash signatures of descriptions already seen
+        _, warm_s = timed(deduplicator.clusters, jobs)
+        found, truth = pairs(labels), pairs(jobs["posting"].tolist())
+        precision = len(found & truth) / len(found) if found else 1.0
+        recall = len(found & truth) / len(truth) if truth else 1.0
+        unique, stats = deduplicator.dedup(jobs)
+        _, before_s = timed(lambda: rank_jobs(jobs, score_jobs(jobs, "software engineer", ["python", "sql"], "pune")))
+        _, after_s = timed(lambda: rank_jobs(unique, score_jobs(unique, "software engineer", ["python", "sql"], "pune")))
+        print(f"{len(jobs):>7} listings of {size} postings | dedup rate {stats['dedup_rate']:.1%} | "
+              f"pair precision {precision:.3f} recall {recall:.3f} | dedup {cold_s:.2f}s cold, {warm_s:.2f}s warm | "
+              f"scoring {before_s:.3f}s -> {after_s:.3f}s")
+
+        # Firestore copies as the mirrored base, 40 board listings per search key on top
+        base, scraped = jobs[jobs["source"] == "firestore"], jobs[jobs["source"] != "firestore"]
+        merger = JobDeduplicator()
+        _, first_s = timed(merger.merge, base, scraped.iloc[:40], 1, version=(1, "key 0"))
+        keys = [scraped.iloc[start:start + 40] for start in range(40, min(len(scraped), 440), 40)]
+        per_key = [timed(merger.merge, base, extra, 1, version=(1, f"key {n}"))[1] for n, extra in enumerate(keys, 1)]
+        agree = all(
+            merger.merge(base, extra, 1)[0].index.equals(JobDeduplicator().dedup(pd.concat([base, extra]))[0].index)
+            for extra in keys[:3]
+        )
+        print(f"{'':>7} merge per search key: first {first_s:.2f}s (dedups the base), then "
+              f"{sum(per_key) / len(per_key) * 1000:.1f}ms per new key | same rows as a full dedup: {agree}")
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [1000, 10000, 50000])
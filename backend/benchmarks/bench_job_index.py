@@ -0,0 +1,107 @@
+"""
+Candidate retrieval with job_index.JobIndex versus scoring every job:
+scoring time and recall of the recommendations against the full scan.
+
+Besides the synthetic corpus of bench_scoring, a corpus of realistic
+titles (plurals, abbreviations, seniority and team suffixes) shows what
+plain title-token overlap, the index's first rule, missed there.
+Profiles without a role are served from the skill and location postings.
+
+    python benchmarks/bench_job_index.py [sizes...]
+"""
+import os
+import random
+import re
+import sys
+
+import pandas as pd
+
+from _helpers import BACKEND_DIR, timed
+from bench_scoring import CITIES, SKILLS, make_jobs
+
+sys.path.append(os.path.join(BACKEND_DIR, "job_recommendation"))
+from job_index import JobIndex  # noqa: E402
+from scoring import fallback_prefix, rank_jobs, score_jobs  # noqa: E402
+
+USERS = [
+    ("software engineer", ["python", "react", "sql", "docker"], "bangalore"),
+    ("data scientist", ["python", "machine learning"], "pune"),
+    ("python developer", ["python", "django"], "hyderabad"),
+    ("dev", ["javascript"], "remote"),
+    ("sales executive", ["crm"], "mumbai"),
+    ("", ["java", "aws"], "hyderabad"),
+    ("", [], "bangalore"),
+    ("", [], ""),
+]
+
+REALISTIC_TITLES = [
+    "Software Engineers (Multiple Openings)", "Sr. Software Engineer II", "Software Engg - Backend",
+    "Software Developer", "SDE-2, Payments", "Python Dev", "Python Developer/Django", "Backend Developers",
+    "Full-Stack Developer (React/Node)", "Data Scientists", "Senior Data Scientist - NLP", "Data Science Lead",
+    "ML Engineer", "Frontend Dev", "DevOps Engineer", "Sales Executive - B2B", "Inside Sales Exec",
+    "Business Development Executive", "QA Engineer", "Engineering Manager", "Associate Data Analyst",
+    "Web Developer", "iOS Developer", "Java Developers", "Software Engineer in Test"
+]
+_TOKEN = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9]+)*")
+
+
+def realistic_jobs(size, seed=5):
+    rng = random.Random(seed)
+    return pd.DataFrame([{
+        "title": rng.choice(REALISTIC_TITLES),
+        "company": f"company {rng.randrange(size // 10 + 1)}",
+        "location": rng.choice(CITIES),
+        "description": "",
+        "url": f"https://jobs.example.com/{index}",
+        "skills": rng.sample(SKILLS, rng.randint(0, 6)),
+        "source": "scraped"
+    } for index in range(size)], index=[f"job:{i}" for i in range(size)])
+
+
+def token_overlap_candidates(jobs, role):
+    """The former rule: jobs sharing an exact title token with the role."""
+    role_tokens = set(_TOKEN.findall(role))
+    return jobs[[bool(role_tokens & set(_TOKEN.findall(title.lower()))) for title in jobs["title"]]]
+
+
+def rank(jobs, role, skills, location):
+    recommendations, _ = rank_jobs(jobs, score_jobs(jobs, role, skills, location))
+    return {job["url"] for job in recommendations}
+
+
+def recall_of(full, found):
+    return len(full & found) / len(full) if full else 1.0
+
+
+def run(name, jobs):
+    index = JobIndex()
+    _, build_s = timed(index.sync, "bench", {
+        job_id: (title, skills, location)
+        for job_id, title, skills, location in zip(jobs.index, jobs["title"], jobs["skills"], jobs["location"])
+    })
+    print(f"{name}: {len(jobs)} jobs, index built in {build_s:.3f}s")
+    for role, skills, location in USERS:
+        full, full_s = timed(rank, jobs, role, skills, location)
+        candidate_ids, lookup_s = timed(index.candidates, role, skills, location)
+        if not role:
+            candidate_ids |= set(fallback_prefix(jobs))
+        candidates = jobs[jobs.index.isin(candidate_ids)]
+        found, cand_s = timed(rank, candidates, role, skills, location)
+        recall = recall_of(full, found)
+        old = f"{recall_of(full, rank(token_overlap_candidates(jobs, role), role, skills, location)):.3f}" if role else "  -  "
+        profile = role or f"(no role) {'+'.join(skills) or '-'}/{location or '-'}"
+        print(f"  {profile:<26} candidates {len(candidates):>7} | full {full_s:7.3f}s | "
+              f"indexed {lookup_s + cand_s:7.3f}s | recall {recall:.3f} (token overlap {old})")
+        assert recall == 1.0, (name, role, recall)
+
+
+def main(sizes):
+    for size in sizes:
+        jobs = make_jobs(size)
+        jobs.index = [f"job:{i}" for i in range(size)]
+        run("synthetic titles", jobs)
+        run("realistic titles", realistic_jobs(size))
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [1000, 10000, 100000])
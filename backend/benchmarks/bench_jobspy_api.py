@@ -0,0 +1,208 @@
+"""
+Concurrency load test of job_scraper/jobspy_api.py against a fake
+scrape_jobs that sleeps, in-process through httpx's ASGI transport.
+
+1. Event loop: while distinct scrapes run, a cheap endpoint must keep
+   answering. With the old handler (blocking scrape inside async def),
+   every request queues behind the running scrape.
+2. Single flight: concurrent identical requests must trigger one scrape.
+3. Overload: a burst past the queue limit must get 503 with Retry-After,
+   and one X-Client-Id starting more scrapes than its limit must get 429.
+4. Result cache: repeats are served from memory without scraping, stale
+   entries are served at once and refreshed by one background scrape,
+   and a new process finds the entries in the SQLite tier.
+5. Formats: ndjson, columns and offset/limit return the same jobs as json.
+
+    python benchmarks/bench_jobspy_api.py [scrape_seconds]
+"""
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import types
+
+import httpx
+import pandas as pd
+from fastapi import FastAPI
+
+from _helpers import BACKEND_DIR
+
+SCRAPE_SECONDS = float(sys.argv[1]) if len(sys.argv) > 1 else 0.5
+scrape_calls = []
+
+
+def fake_scrape_jobs(site_name, search_term, results_wanted=20, **params):
+    scrape_calls.append((site_name[0], search_term))
+    time.sleep(SCRAPE_SECONDS)
+    return pd.DataFrame({
+        "site": site_name[0],
+        "job_url": [f"https://{site_name[0]}.example/{search_term}/{i}" for i in range(results_wanted)],
+        "title": search_term
+    })
+
+
+# jobspy_api imports scrape_jobs from jobspy at import time; serve it the fake instead
+sys.modules["jobspy"] = types.SimpleNamespace(scrape_jobs=fake_scrape_jobs)
+os.environ.setdefault("SCRAPE_CONCURRENCY", "4")
+os.environ.setdefault("SCRAPE_MAX_QUEUE", "8")
+CACHE_DIR = tempfile.TemporaryDirectory()
+os.environ["SCRAPE_CACHE_PATH"] = os.path.join(CACHE_DIR.name, "scrape_cache.sqlite3")
+sys.path.append(os.path.join(BACKEND_DIR, "job_scraper"))
+import jobspy_api  # noqa: E402
+from scrape_cache import ScrapeCache  # noqa: E402
+
+jobspy_api.scrape_gate._duration = SCRAPE_SECONDS
+
+
+def legacy_app():
+    """The handler as it was: the blocking scrape runs on the event loop."""
+    app = FastAPI()
+
+    @app.get("/scrape_jobs")
+    async def get_jobs(search_term: str, location: str, results_wanted: int = 20):
+        return jobspy_api.run_scrape(search_term, location, results_wanted)[0]
+
+    @app.get("/scrape_stats")
+    async def scrape_stats():
+        return {}
+
+    return app
+
+
+def client(app, host="10.0.0.1", client_id=None):
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app, client=(host, 1234)), base_url="http://test", timeout=120,
+        headers={"X-Client-Id": client_id} if client_id else None
+    )
+
+
+async def probe_while_scraping(app, terms):
+    """
+    Wall time of the scrapes, and latencies of /scrape_stats probes sent
+    every 50 ms while they run, measured from when each probe was due, so
+    time the event loop spent blocked counts.
+    """
+    clients = [client(app, f"10.0.0.{i}") for i in range(len(terms))]
+    started = time.perf_counter()
+    scrapes = [asyncio.create_task(c.get("/scrape_jobs", params={"search_term": term, "location": "remote"}))
+               for c, term in zip(clients, terms)]
+    probes = []
+    async with client(app, "10.0.1.1") as prober:
+        while not all(task.done() for task in scrapes):
+            due = time.perf_counter() + 0.05
+            await asyncio.sleep(0.05)
+            await prober.get("/scrape_stats")
+            probes.append((time.perf_counter() - due) * 1000)
+    responses = await asyncio.gather(*scrapes)
+    elapsed = time.perf_counter() - started
+    for c in clients:
+        await c.aclose()
+    assert all(r.status_code == 200 for r in responses), [r.status_code for r in responses]
+    return elapsed, probes
+
+
+async def main():
+    terms = [f"role {i}" for i in range(8)]
+    legacy_s, legacy_probes = await probe_while_scraping(legacy_app(), terms)
+    gated_s, gated_probes = await probe_while_scraping(jobspy_api.app, terms)
+    print(f"8 distinct scrapes of {SCRAPE_SECONDS:g}s each (5 boards, scraped concurrently per request):")
+    print(f"  blocking handler   total {legacy_s:5.2f}s   /scrape_stats probe max {max(legacy_probes):8.1f} ms")
+    print(f"  executor + gate    total {gated_s:5.2f}s   /scrape_stats probe max {max(gated_probes):8.1f} ms "
+          f"(median {statistics.median(gated_probes):.1f} ms)")
+    assert max(gated_probes) < SCRAPE_SECONDS * 1000 / 2
+
+    # Single flight: 40 requests from 10 clients for the same normalized search
+    scrape_calls.clear()
+    clients = [client(jobspy_api.app, f"10.0.2.{i}") for i in range(10)]
+    variants = ["Data Engineer", "data engineer", "  data   ENGINEER "]
+    responses = await asyncio.gather(*[
+        clients[i % 10].get("/scrape_jobs", params={"search_term": variants[i % 3], "location": "Bangalore"})
+        for i in range(40)
+    ])
+    statuses = [r.status_code for r in responses]
+    print(f"40 identical requests: {statuses.count(200)} answered, {len(scrape_calls) // 5} scrape(s) run, "
+          f"{jobspy_api.scrape_gate.stats()['coalesced']} coalesced")
+    assert statuses.count(200) == 40 and len(scrape_calls) == 5
+
+    # Overload: 30 distinct searches at once, then one X-Client-Id sending 8
+    burst = await asyncio.gather(*[
+        clients[i % 10].get("/scrape_jobs", params={"search_term": f"burst {i}", "location": "remote"}) for i in range(30)
+    ])
+    rejected = [r for r in burst if r.status_code == 503]
+    print(f"30 distinct searches at once: {sum(r.status_code == 200 for r in burst)} served, {len(rejected)} got 503, "
+          f"Retry-After {sorted({r.headers['retry-after'] for r in rejected})}")
+    assert len(rejected) == 30 - (jobspy_api.scrape_gate.workers + jobspy_api.scrape_gate.max_queue)
+    greedy_client = client(jobspy_api.app, "127.0.0.1", "greedy")
+    greedy = await asyncio.gather(*[
+        greedy_client.get("/scrape_jobs", params={"search_term": f"greedy {i}", "location": "remote"}) for i in range(8)
+    ])
+    limited = [r for r in greedy if r.status_code == 429]
+    print(f"one client sending 8 at once: {len(limited)} got 429, Retry-After {sorted({r.headers['retry-after'] for r in limited})}")
+    assert len(limited) == 8 - jobspy_api.scrape_gate.max_per_client
+    for c in clients + [greedy_client]:
+        await c.aclose()
+    print(f"gate: {jobspy_api.scrape_gate.stats()}")
+    await cache_checks()
+    await format_checks()
+
+
+async def cache_checks():
+    cache = jobspy_api.scrape_cache
+    params = {"search_term": "Data Engineer", "location": "Bangalore"}
+    scrape_calls.clear()
+    async with client(jobspy_api.app, "10.0.3.1") as c:
+        started = time.perf_counter()
+        hits = [await c.get("/scrape_jobs", params=params) for _ in range(50)]
+        hit_ms = (time.perf_counter() - started) * 1000 / len(hits)
+        assert {r.headers["x-cache"] for r in hits} == {"HIT"} and not scrape_calls
+        print(f"50 repeats of a cached search: {hit_ms:.2f} ms each, 0 scrapes (a miss takes {SCRAPE_SECONDS * 1000:.0f} ms)")
+
+        # Let the entry go stale: every request is answered at once, one scrape refreshes it
+        cache.ttl = 0.2
+        await asyncio.sleep(0.3)
+        started = time.perf_counter()
+        stale = await asyncio.gather(*[c.get("/scrape_jobs", params=params) for _ in range(4)])
+        stale_ms = (time.perf_counter() - started) * 1000
+        assert {r.headers["x-cache"] for r in stale} == {"STALE"} and stale_ms < SCRAPE_SECONDS * 1000 / 2
+        while jobspy_api._revalidating:
+            await asyncio.sleep(0.05)
+        fresh = await c.get("/scrape_jobs", params=params)
+        print(f"4 requests on a stale entry: answered in {stale_ms:.1f} ms, {len(scrape_calls) // 5} background scrape, "
+              f"then X-Cache {fresh.headers['x-cache']} Age {fresh.headers['age']}")
+        assert len(scrape_calls) == 5 and fresh.headers["x-cache"] == "HIT" and fresh.headers["age"] == "0"
+        # Boards finish in any order, so compare the postings rather than the row order
+        assert sorted(job["job_url"] for job in fresh.json()) == sorted(job["job_url"] for job in hits[0].json())
+    print(f"cache: {(await client(jobspy_api.app).get('/scrape_stats')).json()['cache']}")
+
+    # A restarted process reads the same file; a 1 KB memory bound keeps only the newest entry
+    restarted = ScrapeCache(os.environ["SCRAPE_CACHE_PATH"], ttl=900, max_bytes=1024)
+    entry, state = restarted.get(jobspy_api.scrape_key(params["search_term"], params["location"], 20))
+    assert state == "HIT" and entry.body == fresh.json()
+    for i in range(3):
+        restarted.get(jobspy_api.scrape_key(f"role {i}", "remote", 20))
+    stats = restarted.stats()
+    print(f"after restart: {state} from disk, {stats['disk_entries']} entries on disk, "
+          f"{stats['memory_entries']} in memory ({stats['memory_bytes']} bytes), {stats['evictions']} evicted")
+    assert stats["disk_hits"] == 4 and stats["memory_entries"] == 1 and stats["evictions"] == 3
+
+
+
+async def format_checks():
+    params = {"search_term": "Data Engineer", "location": "Bangalore"}
+    async with client(jobspy_api.app, "10.0.4.1") as c:
+        jobs = (await c.get("/scrape_jobs", params=params)).json()
+        ndjson = await c.get("/scrape_jobs", params={**params, "format": "ndjson", "offset": 10, "limit": 25})
+        assert ndjson.headers["content-type"] == "application/x-ndjson" and ndjson.headers["x-total-count"] == str(len(jobs))
+        assert [json.loads(line) for line in ndjson.content.splitlines()] == jobs[10:35]
+        columns = (await c.get("/scrape_jobs", params={**params, "format": "columns"})).json()
+        assert [dict(zip(columns["columns"], row)) for row in zip(*columns["data"].values())] == jobs
+        statuses = [(await c.get("/scrape_jobs", params={**params, "format": fmt})).status_code for fmt in ("xml", "arrow")]
+        print(f"formats: ndjson page and columns match json; format=xml {statuses[0]}, format=arrow {statuses[1]}")
+        assert statuses[0] == 400 and statuses[1] in (200, 501)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,61 @@
+"""
+NER inference backends (common.ner_backends) side by side on CPU: load
+time, resident memory, BatchedNER throughput, and parity of the extracted
+entities with the full-precision pytorch backend on a fixture corpus.
+Each backend runs in its own process so memory numbers do not overlap.
+tests/test_ner_backends.py asserts the parity with a tolerance per backend.
+
+    python benchmarks/bench_ner_backends.py [n_descriptions] [threads]
+"""
+import multiprocessing
+import sys
+
+from _helpers import timed
+from bench_ner_batching import make_corpus
+
+BACKENDS = ["pytorch", "int8", "onnx"]
+
+
+def rss_mb():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def run_backend(backend, size, threads):
+    from common.ner_backends import load_ner_pipeline
+    from common.ner_batcher import BatchedNER
+
+    before = rss_mb()
+    ner_pipeline, load_s = timed(
+        load_ner_pipeline, "dslim/bert-base-NER", backend=backend, threads=threads, aggregation_strategy="simple"
+    )
+    batched = BatchedNER(ner_pipeline, batch_size=8)
+    corpus = make_corpus(size)
+    batched(corpus[:2])  # warmup
+    results, elapsed = timed(batched, corpus)
+    # What extract_skills keeps: ORG/MISC words per description
+    skills = [sorted({e["word"].lower() for e in entities if e["entity_group"] in ("ORG", "MISC")})
+              for entities in results]
+    return ner_pipeline.backend, load_s, rss_mb() - before, size / elapsed, skills
+
+
+def main(size=200, threads=None):
+    context = multiprocessing.get_context("spawn")
+    reference = None
+    print(f"{size} descriptions, threads={threads or 'default'}")
+    for backend in BACKENDS:
+        with context.Pool(1) as pool:
+            used, load_s, memory_mb, throughput, skills = pool.apply(run_backend, (backend, size, threads))
+        if reference is None:
+            reference = skills
+        same = sum(a == b for a, b in zip(reference, skills)) / len(reference)
+        label = backend if used == backend else f"{backend} (fell back to {used})"
+        print(f"  {label:<28} load {load_s:6.1f}s | +{memory_mb:7.0f} MB RSS | {throughput:7.1f} desc/s | "
+              f"same skills as pytorch: {same:.1%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200, int(sys.argv[2]) if len(sys.argv) > 2 else None)
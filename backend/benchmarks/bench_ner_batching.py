@@ -0,0 +1,54 @@
+"""
+CPU throughput of dslim/bert-base-NER: one call per description (the old
+`ner_pipeline(description[:512])` loop) versus BatchedNER at several batch
+sizes. BatchedNER reads whole descriptions, so it does more work per text
+than the truncated baseline; both numbers are reported per description.
+
+    python benchmarks/bench_ner_batching.py [n_descriptions]
+"""
+import random
+import sys
+
+import torch
+from transformers import AutoModelForTokenClassification, AutoTokenizer, pipeline
+
+from _helpers import timed
+from common.ner_batcher import BatchedNER
+
+BATCH_SIZES = [1, 2, 4, 8, 16, 32]
+
+SENTENCES = [
+    "Acme Corp is hiring a backend engineer in Bangalore.",
+    "You will build REST APIs with Python, Django and PostgreSQL on AWS.",
+    "Experience with Kubernetes, Docker and CI/CD pipelines is a plus.",
+    "Our team at Google Cloud works closely with Microsoft and Oracle partners.",
+    "Strong communication skills and ownership are expected.",
+    "The role reports to the engineering manager in London.",
+]
+
+
+def make_corpus(size, seed=3):
+    rng = random.Random(seed)
+    # Mix of short postings and long ones that need several windows
+    return [" ".join(rng.choice(SENTENCES) for _ in range(rng.choice([4, 10, 30, 80]))) for _ in range(size)]
+
+
+def main(size=200):
+    model_name = "dslim/bert-base-NER"
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForTokenClassification.from_pretrained(model_name)
+    ner_pipeline = pipeline("ner", model=model, tokenizer=tokenizer)
+    corpus = make_corpus(size)
+    ner_pipeline(corpus[0][:512])  # warmup
+
+    _, baseline_s = timed(lambda: [ner_pipeline(text[:512]) for text in corpus])
+    print(f"{size} descriptions, {torch.get_num_threads()} CPU threads")
+    print(f"{'per-job, [:512] chars':>24}: {size / baseline_s:8.1f} desc/s")
+    for batch_size in BATCH_SIZES:
+        batched = BatchedNER(ner_pipeline, batch_size=batch_size)
+        _, elapsed = timed(batched, corpus)
+        print(f"{'BatchedNER batch=' + str(batch_size):>24}: {size / elapsed:8.1f} desc/s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
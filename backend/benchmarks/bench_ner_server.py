@@ -0,0 +1,89 @@
+"""
+Total memory and throughput of NER under concurrent load: every worker
+process loading its own model (the current setup) versus one shared
+ner_service/ner_server.py with micro-batching and NERClient workers.
+Each worker runs `threads` threads sending one description per call, as
+request handlers do.
+
+    python benchmarks/bench_ner_server.py [workers] [threads] [n_descriptions]
+"""
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from _helpers import BACKEND_DIR
+from bench_ner_batching import make_corpus
+
+PORT = 5914
+
+
+def rss_mb(pid="self"):
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def worker(mode, threads, texts, start_barrier):
+    from common.model_manager import load_batched_ner
+    from common.ner_client import NERClient
+
+    if mode == "server":
+        extractor = NERClient(f"http://127.0.0.1:{PORT}")
+    else:
+        extractor = load_batched_ner("dslim/bert-base-NER")
+    start_barrier.wait()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(lambda text: extractor([text]), texts))
+    return rss_mb()
+
+
+def run(mode, workers, threads, corpus):
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Manager().Barrier(workers + 1)
+    shares = [corpus[index::workers] for index in range(workers)]
+    with context.Pool(workers) as pool:
+        results = [pool.apply_async(worker, (mode, threads, share, barrier)) for share in shares]
+        barrier.wait()
+        started = time.perf_counter()
+        worker_rss = [result.get() for result in results]
+        elapsed = time.perf_counter() - started
+    return sum(worker_rss), len(corpus) / elapsed
+
+
+def main(workers=3, threads=4, size=300):
+    corpus = make_corpus(size)
+    print(f"{workers} workers x {threads} threads, {size} descriptions")
+
+    rss, throughput = run("in-process", workers, threads, corpus)
+    print(f"  {'model per worker':<22} total RSS {rss:7.0f} MB | {throughput:7.1f} desc/s")
+
+    server = subprocess.Popen(
+        [sys.executable, "ner_server.py"], cwd=os.path.join(BACKEND_DIR, "ner_service"),
+        env=dict(os.environ, NER_SERVER_PORT=str(PORT))
+    )
+    try:
+        while True:
+            try:
+                if requests.get(f"http://127.0.0.1:{PORT}/ready", timeout=1).status_code == 200:
+                    break
+            except requests.RequestException:
+                pass
+            time.sleep(1)
+        rss, throughput = run("server", workers, threads, corpus)
+        rss += rss_mb(server.pid)
+        stats = requests.get(f"http://127.0.0.1:{PORT}/stats").json()
+        print(f"  {'shared server':<22} total RSS {rss:7.0f} MB | {throughput:7.1f} desc/s | "
+              f"{stats['calls_per_batch']} calls per model batch")
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:4]])
@@ -0,0 +1,76 @@
+"""
+Response size, peak Python memory and latency of the full recommendation
+list (rank_jobs, every job above threshold with its description) versus
+a compact first page and a cursor page from pagination.RankingPages,
+and the memory each stored ranking keeps: ids and scores of the best
+RankingPages.window jobs now, against the candidate frame plus scores
+frame kept before.
+
+    python benchmarks/bench_pagination.py [sizes...]
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from _helpers import BACKEND_DIR
+from bench_scoring import make_jobs
+
+sys.path.append(os.path.join(BACKEND_DIR, "job_recommendation"))
+from pagination import RankingPages  # noqa: E402
+from scoring import rank_jobs, score_jobs  # noqa: E402
+
+LIMIT = 20
+DESCRIPTION = ("We are looking for an engineer to design, build and run services used by millions of users. " * 20)
+
+
+def measure(fn):
+    """(result, JSON bytes, peak traced MB, seconds) of building and serializing a response."""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    body = json.dumps(result, default=str)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return result, len(body), peak, elapsed
+
+
+def retained_mb(store, repeats=10):
+    """Traced memory still held after calling `store` `repeats` times, per call."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(repeats):
+        store()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / repeats / 2 ** 20
+
+
+def main(sizes):
+    for size in sizes:
+        jobs = make_jobs(size)
+        jobs.index = [f"job:{i}" for i in range(size)]
+        jobs["description"] = DESCRIPTION
+        scores = score_jobs(jobs, "software engineer", ["python", "react", "sql"], "bangalore")
+        pages = RankingPages(lambda job_ids, context: jobs.loc[job_ids])
+
+        full, full_bytes, full_peak, full_s = measure(lambda: rank_jobs(jobs, scores)[0])
+        first, page_bytes, page_peak, page_s = measure(lambda: pages.first_page("bench", jobs, scores, LIMIT))
+        second, _, _, cursor_s = measure(lambda: pages.next_page("bench", first["next_cursor"], LIMIT))
+        same_order = [job["url"] for job in full[:2 * LIMIT]] == [job["url"] for job in first["jobs"] + second["jobs"]]
+        print(f"{size:>7} jobs, {len(full)} above threshold")
+        print(f"  full list        {full_bytes / 2 ** 20:8.2f} MB JSON | peak {full_peak:7.1f} MB | {full_s * 1000:8.1f}ms")
+        print(f"  first page ({LIMIT})  {page_bytes / 2 ** 10:8.2f} KB JSON | peak {page_peak:7.1f} MB | {page_s * 1000:8.1f}ms")
+        print(f"  cursor page                         |              | {cursor_s * 1000:8.1f}ms | same order: {same_order}")
+
+        # What the API stores per first page: candidates are a filtered copy of the corpus
+        kept = []
+        old_mb = retained_mb(lambda: kept.append({"jobs": jobs[jobs.index.notna()], "scores": scores.copy()}))
+        new_mb = retained_mb(lambda: RankingPages.first_page(pages, "bench", jobs, scores, LIMIT))
+        print(f"  kept per ranking: {old_mb:8.2f} MB (candidate + scores frames) -> {new_mb:8.3f} MB (ids + scores)")
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [1000, 10000, 100000])
@@ -0,0 +1,140 @@
+"""
+Encode time and payload size of a /scrape_jobs response at several sizes.
+
+The old path stringifies the frame (astype(str).replace("nan", "")),
+builds records with to_dict and lets FastAPI re-encode them with
+jsonable_encoder and json.dumps. The new path builds typed records once
+(frame_records, done when the scrape is cached) and encodes them with
+response_encoding. Times are the best of a few runs; gzip sizes show what
+goes over the wire with compression on.
+
+    python benchmarks/bench_response_encoding.py [rows...]
+"""
+import datetime
+import gzip
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+
+from _helpers import BACKEND_DIR
+
+sys.path.append(os.path.join(BACKEND_DIR, "job_scraper"))
+import response_encoding  # noqa: E402
+from response_encoding import (  # noqa: E402
+    arrow_available, encode_arrow, encode_columns, encode_json, frame_records, iter_ndjson
+)
+
+DESCRIPTION = ("Build and run data pipelines in Python and SQL on Spark and Airflow; "
+               "work with analysts on dashboards and with product on experiments. ") * 12
+
+
+def make_frame(rows, seed=7):
+    """Frame shaped like a jobspy result: strings, dates, float salaries with gaps, bools."""
+    rng = np.random.default_rng(seed)
+    sites = np.array(["indeed", "linkedin", "glassdoor", "bayt", "naukri"])
+    site = sites[rng.integers(0, len(sites), rows)]
+    has_salary = rng.random(rows) < 0.4
+    min_amount = np.where(has_salary, rng.integers(40, 150, rows) * 1000.0, np.nan)
+    today = datetime.date(2026, 10, 18)
+    return pd.DataFrame({
+        "id": [f"{s}-{i}" for i, s in enumerate(site)],
+        "site": site,
+        "job_url": [f"https://{s}.example/jobs/{i}" for i, s in enumerate(site)],
+        "job_url_direct": [f"https://careers.example/{i}" if i % 3 else None for i in range(rows)],
+        "title": [f"Data Engineer {i % 40}" for i in range(rows)],
+        "company": [f"Company {i % 300}" for i in range(rows)],
+        "location": ["Bangalore, KA, IN" if i % 2 else "Remote" for i in range(rows)],
+        "date_posted": [today - datetime.timedelta(days=int(d)) for d in rng.integers(0, 3, rows)],
+        "job_type": np.where(rng.random(rows) < 0.8, "fulltime", None),
+        "interval": np.where(has_salary, "yearly", None),
+        "min_amount": min_amount,
+        "max_amount": min_amount * 1.3,
+        "currency": np.where(has_salary, "USD", None),
+        "is_remote": rng.random(rows) < 0.3,
+        "job_level": np.where(rng.random(rows) < 0.5, "mid-senior level", None),
+        "emails": [None] * rows,
+        "company_rating": np.where(rng.random(rows) < 0.5, rng.integers(30, 50, rows) / 10, np.nan),
+        "company_num_employees": np.where(rng.random(rows) < 0.5, "1,001 to 5,000", None),
+        "description": [DESCRIPTION] * rows
+    })
+
+
+def legacy_records(jobs):
+    """
+    The old handler's records. On pandas 2 astype(str) gives "nan"/"None"
+    strings; pandas 3 keeps missing values in its str dtype, so the old
+    handler's response fails to encode there (NaN is not valid JSON).
+    map(str) reproduces the pandas 2 result on both.
+    """
+    return jobs.astype(object).map(str).replace("nan", "").to_dict(orient="records")
+
+
+def legacy_body(jobs):
+    """The old handler plus FastAPI's default JSONResponse rendering."""
+    records = legacy_records(jobs)
+    return json.dumps(jsonable_encoder(records), ensure_ascii=False, allow_nan=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def best(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - started)
+    return result, min(times) * 1000
+
+
+def check_parity(jobs, records):
+    """Typed output carries the same values as the old strings, with null for the old ""."""
+    legacy = legacy_records(jobs)
+    for old, new in zip(legacy, json.loads(encode_json(records))):
+        assert old.keys() == new.keys()
+        for column, value in new.items():
+            if value is None:
+                assert old[column] in ("", "None"), (column, old[column])
+            elif isinstance(value, bool):
+                assert old[column] == str(value)
+            elif isinstance(value, float):
+                assert float(old[column]) == value
+            else:
+                assert old[column] == str(value), (column, old[column], value)
+    lines = b"".join(iter_ndjson(records)).splitlines()
+    assert [json.loads(line) for line in lines] == json.loads(encode_json(records))
+    columns = json.loads(encode_columns(records))
+    rebuilt = [dict(zip(columns["columns"], row)) for row in zip(*columns["data"].values())]
+    assert columns["rows"] == len(records) and rebuilt == json.loads(encode_json(records))
+
+
+def main(sizes):
+    print(f"serializer: {'orjson' if response_encoding.orjson is not None else 'json (orjson not installed)'}")
+    for rows in sizes:
+        jobs = make_frame(rows)
+        repeats = 20 if rows <= 500 else 5
+        records, records_ms = best(lambda: frame_records(jobs), repeats)
+        check_parity(jobs, records)
+
+        results = [("old: astype(str) + to_dict + FastAPI json", *best(lambda: legacy_body(jobs), repeats))]
+        results.append(("typed records (once per scrape)", b"", records_ms))
+        results.append(("json (orjson)", *best(lambda: encode_json(records), repeats)))
+        results.append(("ndjson", *best(lambda: b"".join(iter_ndjson(records)), repeats)))
+        results.append(("columns", *best(lambda: encode_columns(records), repeats)))
+        if arrow_available():
+            results.append(("arrow ipc", *best(lambda: encode_arrow(records), repeats)))
+
+        print(f"\n{rows} rows, {len(jobs.columns)} columns")
+        print(f"  {'':42} {'encode':>10} {'bytes':>11} {'gzip':>10}")
+        for name, body, ms in results:
+            sizes_text = f"{len(body):>11,} {len(gzip.compress(body)):>10,}" if body else ""
+            print(f"  {name:42} {ms:8.2f}ms {sizes_text}")
+        if not arrow_available():
+            print("  arrow ipc: pyarrow not installed, skipped")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [20, 500, 5000])
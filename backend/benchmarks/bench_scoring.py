@@ -0,0 +1,110 @@
+"""
+Scoring time of the old per-row iterrows/fuzzy_match loop in
+recommend_jobs versus scoring.score_jobs + rank_jobs, at 1k, 10k and 100k
+jobs. Also checks that both produce identical recommendations.
+
+    python benchmarks/bench_scoring.py [sizes...]
+"""
+import os
+import random
+import sys
+
+import pandas as pd
+from fuzzywuzzy import fuzz
+
+from _helpers import BACKEND_DIR, timed
+
+sys.path.append(os.path.join(BACKEND_DIR, "job_recommendation"))
+from scoring import rank_jobs, score_jobs  # noqa: E402
+
+ROLES = ["software engineer", "senior software engineer", "data scientist", "frontend developer",
+         "backend developer", "devops engineer", "java developer", "python developer",
+         "full stack developer", "sales executive", "product manager", "qa engineer"]
+SENIORITY = ["", "senior ", "junior ", "lead ", "staff ", "associate "]
+CITIES = ["bangalore, karnataka, india", "pune, maharashtra, india", "hyderabad, india",
+          "mumbai, india", "remote", "chennai, tamil nadu, india", "noida, uttar pradesh, india", ""]
+SKILLS = ["python", "java", "react", "node.js", "sql", "aws", "docker", "kubernetes", "django",
+          "javascript", "typescript", "css", "html", "machine learning", "git", "agile", "go"]
+
+
+def fuzzy_match(text1, text2, threshold=60):
+    if not text1 or not text2:
+        return False
+    return fuzz.partial_ratio(str(text1).lower(), str(text2).lower()) >= threshold
+
+
+def legacy_rank(all_jobs, preferred_role, user_skills, location):
+    scored_jobs = []
+    for _, job in all_jobs.iterrows():
+        job_title = str(job.get("title", "")).lower()
+        job_location = str(job.get("location", "")).lower()
+        job_skills = [str(s).lower() for s in job.get("skills", [])]
+        if preferred_role and job_title:
+            title_score = 100 if fuzzy_match(preferred_role, job_title, 70) else 0
+            if preferred_role in job_title:
+                title_score = 100
+        else:
+            title_score = 50
+        if location and job_location:
+            location_score = fuzz.partial_ratio(location, job_location)
+        else:
+            location_score = 50
+        skills_score = 0
+        if user_skills and job_skills:
+            matches = 0
+            for user_skill in user_skills:
+                if any(fuzzy_match(user_skill, job_skill, 70) for job_skill in job_skills):
+                    matches += 1
+            skills_score = int((matches / len(user_skills)) * 100)
+        elif not user_skills:
+            skills_score = 50
+        total_score = (title_score * 0.5) + (location_score * 0.3) + (skills_score * 0.2)
+        if total_score >= 60:
+            job_dict = job.to_dict()
+            job_dict['match_score'] = round(total_score, 1)
+            scored_jobs.append(job_dict)
+    recommendations = sorted(scored_jobs, key=lambda x: x['match_score'], reverse=True)
+    if len(recommendations) < 5:
+        fallback_jobs = []
+        for _, job in all_jobs.iterrows():
+            job_title = str(job.get("title", "")).lower()
+            if preferred_role in job_title or fuzzy_match(preferred_role, job_title, 60):
+                job_dict = job.to_dict()
+                job_dict['match_score'] = 50
+                fallback_jobs.append(job_dict)
+        existing_urls = {job.get('url', '') for job in recommendations}
+        for job in fallback_jobs:
+            if job.get('url', '') not in existing_urls and len(recommendations) < 10:
+                recommendations.append(job)
+                existing_urls.add(job.get('url', ''))
+    return recommendations
+
+
+def make_jobs(size, seed=11):
+    rng = random.Random(seed)
+    return pd.DataFrame([{
+        "title": (rng.choice(SENIORITY) + rng.choice(ROLES)).title(),
+        "company": f"company {rng.randrange(size // 10 + 1)}",
+        "location": rng.choice(CITIES),
+        "description": "",
+        "url": f"https://jobs.example.com/{index}",
+        "skills": rng.sample(SKILLS, rng.randint(0, 6)),
+        "source": "scraped"
+    } for index in range(size)])
+
+
+def main(sizes):
+    users = [("software engineer", ["python", "react", "sql", "docker"], "bangalore"),
+             ("data analyst", ["excel", "tableau"], "london")]
+    for size in sizes:
+        jobs = make_jobs(size)
+        for role, skills, location in users:
+            before, before_s = timed(legacy_rank, jobs, role, skills, location)
+            (after, _), after_s = timed(lambda: rank_jobs(jobs, score_jobs(jobs, role, skills, location)))
+            same = before == after
+            print(f"{size:>7} jobs | {role:<17} | loop {before_s:8.3f}s | bulk {after_s:7.3f}s | "
+                  f"{before_s / after_s:6.1f}x | identical: {same}")
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [1000, 10000, 100000])
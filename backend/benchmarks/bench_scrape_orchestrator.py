@@ -0,0 +1,68 @@
+"""
+common.scrape_orchestrator versus one scrape_jobs call over all sites.
+
+A fake scrape_jobs stands in for the job boards: it sleeps per site, and
+one board hangs, one fails once and one always fails. jobspy scrapes
+sites one after another inside a single call, so the fake does the same
+for multi-site calls. The orchestrator must return every answering
+board's jobs, with per-site status, by the slowest deadline instead of
+waiting on the hung board.
+
+    python benchmarks/bench_scrape_orchestrator.py [site_timeout]
+"""
+import sys
+import threading
+
+import pandas as pd
+
+from _helpers import timed
+
+from common.scrape_orchestrator import ScrapeOrchestrator, is_partial, status_header
+
+LATENCY = {"indeed": 0.4, "linkedin": 0.8, "glassdoor": 6.0, "bayt": 0.3, "naukri": 0.2}
+_flaky = {"bayt": 0}
+_lock = threading.Lock()
+
+
+def fake_scrape_jobs(site_name, results_wanted=20, **params):
+    frames = []
+    for site in site_name:
+        threading.Event().wait(LATENCY[site])
+        with _lock:
+            if _flaky.get(site):
+                _flaky[site] -= 1
+                raise ConnectionError(f"{site} reset the connection")
+        if site == "naukri":
+            raise PermissionError("naukri: 403 blocked")
+        frames.append(pd.DataFrame({
+            "site": site,
+            "job_url": [f"https://{site}.example/jobs/{i}" for i in range(results_wanted)],
+            "title": f"{params.get('search_term')} ({site})"
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def main(site_timeout=2.0):
+    sites = list(LATENCY)
+    # The single call fails outright as soon as one board raises, so it is timed without naukri or a bayt failure
+    _, legacy_s = timed(fake_scrape_jobs, [site for site in sites if site != "naukri"], search_term="data engineer")
+    _flaky["bayt"] = 1
+
+    orchestrator = ScrapeOrchestrator(fake_scrape_jobs, workers=8, timeout=site_timeout, retries=1, backoff=0.1)
+    arrivals = []
+    result, orchestrated_s = timed(
+        orchestrator.scrape, sites, on_site=lambda site, frame: arrivals.append(site), search_term="data engineer"
+    )
+    print(f"single call over {len(sites) - 1} sites:   {legacy_s:6.2f}s (and any failing board fails the whole call)")
+    print(f"orchestrator, {site_timeout:g}s per site:   {orchestrated_s:6.2f}s, {len(result.jobs)} jobs, partial={is_partial(result)}")
+    print(f"  arrival order: {arrivals}")
+    print(f"  X-Scrape-Sites: {status_header(result)}")
+    statuses = {site["site"]: site["status"] for site in result.sites}
+    assert statuses == {"indeed": "ok", "linkedin": "ok", "glassdoor": "timeout", "bayt": "ok", "naukri": "error"}
+    assert set(result.jobs["site"]) == {"indeed", "linkedin", "bayt"} and len(result.jobs) == 60
+    assert orchestrated_s < site_timeout + 0.5
+    print(f"  stats: {orchestrator.stats()['sites']['bayt']}")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 2.0)
@@ -0,0 +1,63 @@
+"""
+Semantic ranking (semantic_index.SemanticJobIndex, TF-IDF/SVD encoder
+unless a sentence model is cached) versus the fuzzy scorer: index build
+time, query latency, how many of the semantic top-k the fuzzy scorer also
+recommends, and recall of the approximate search against an exact scan.
+
+    python benchmarks/bench_semantic.py [sizes...]
+"""
+import os
+import sys
+
+import numpy as np
+
+from _helpers import BACKEND_DIR, timed
+from bench_scoring import make_jobs
+
+sys.path.append(os.path.join(BACKEND_DIR, "job_recommendation"))
+from scoring import rank_jobs, score_jobs  # noqa: E402
+from semantic_index import SemanticJobIndex  # noqa: E402
+
+USERS = [
+    ("software engineer", ["python", "react", "sql", "docker"], "bangalore"),
+    ("data scientist", ["python", "machine learning"], "pune"),
+    ("devops engineer", ["aws", "kubernetes", "docker"], "remote"),
+]
+K = 50
+
+
+def main(sizes):
+    for size in sizes:
+        jobs = make_jobs(size)
+        jobs.index = [f"job:{i}" for i in range(size)]
+        jobs["description"] = [f"We are hiring a {title}. Skills: {', '.join(skills)}."
+                               for title, skills in zip(jobs["title"], jobs["skills"])]
+        index = SemanticJobIndex(path=None)
+        _, build_s = timed(index.sync, "bench", {
+            job_id: (title, description)
+            for job_id, title, description in zip(jobs.index, jobs["title"], jobs["description"])
+        })
+        print(f"{size} jobs, {index.stats()['encoder']} index built in {build_s:.3f}s "
+              f"(ann: {index.stats()['ann_trained']})")
+        for role, skills, location in USERS:
+            (fuzzy, _), fuzzy_s = timed(lambda: rank_jobs(jobs, score_jobs(jobs, role, skills, location)))
+            fuzzy_ids = {job["url"] for job in fuzzy}
+            hits, semantic_s = timed(index.search, role, skills, K)
+            found = set(jobs.loc[[job_id for job_id, _ in hits], "url"])
+            agreement = len(fuzzy_ids & found) / len(found) if found else 0.0
+            print(f"  {role:<18} fuzzy {fuzzy_s * 1000:8.1f}ms | semantic {semantic_s * 1000:6.1f}ms | "
+                  f"top-{K} also recommended by fuzzy: {agreement:.2f} | ann recall: {ann_recall(index, role, skills):.2f}")
+
+
+def ann_recall(index, role, skills):
+    """Share of the exact top-k the inverted-file search returned."""
+    vectors = index.index.vectors[index.index.alive]
+    ids = [job_id for job_id, alive in zip(index.index.ids, index.index.alive) if alive]
+    query = index.encoder.encode([" ".join([role, role] + skills)])[0]
+    exact = {ids[position] for position in np.argsort(-(vectors @ query))[:K]}
+    approximate = {job_id for job_id, _ in index.search(role, skills, K)}
+    return len(exact & approximate) / len(exact)
+
+
+if __name__ == "__main__":
+    main([int(size) for size in sys.argv[1:]] or [1000, 10000, 100000])
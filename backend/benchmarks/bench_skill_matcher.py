@@ -0,0 +1,63 @@
+"""
+Descriptions per second of the per-skill regex loop that used to live in
+recommendation_api.extract_skills_from_text versus the compiled SkillMatcher.
+
+    python benchmarks/bench_skill_matcher.py [corpus_size]
+"""
+import random
+import re
+import sys
+
+from _helpers import load_literal, timed
+from common.skill_matcher import SkillMatcher, skill_variants
+
+FILLER = (
+    "we are looking for a motivated engineer to join our team you will work with "
+    "stakeholders to design build and ship features candidates should have strong "
+    "communication skills and experience with modern tooling competitive salary"
+).split()
+
+
+def legacy_find_skills(description, skills):
+    found_skills = []
+    for skill in skills:
+        if re.search(r'\b' + re.escape(skill) + r'\b', description):
+            found_skills.append(skill)
+    for skill in skills:
+        if skill not in found_skills:
+            for variation in skill_variants(skill):
+                if re.search(r'\b' + re.escape(variation) + r'\b', description):
+                    found_skills.append(skill)
+                    break
+    return list(dict.fromkeys(found_skills))
+
+
+def make_corpus(skills, size, seed=7):
+    rng = random.Random(seed)
+    spellings = skills + [variant for skill in skills for variant in skill_variants(skill)]
+    corpus = []
+    for _ in range(size):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(150, 400))]
+        for _ in range(rng.randint(3, 15)):
+            words.insert(rng.randrange(len(words)), rng.choice(spellings))
+        corpus.append(" ".join(words))
+    return corpus
+
+
+def main(size=10000):
+    skills = load_literal("job_recommendation/recommendation_api.py", "COMMON_SKILLS")
+    corpus = make_corpus(skills, size)
+    matcher = SkillMatcher(skills)
+
+    before, before_s = timed(lambda: [legacy_find_skills(d, skills) for d in corpus])
+    after, after_s = timed(lambda: [matcher.find_skills(d) for d in corpus])
+
+    mismatches = sum(1 for old, new in zip(before, after) if old != new)
+    print(f"corpus: {size} descriptions, {len(skills)} skills")
+    print(f"per-skill regex loop : {size / before_s:10.1f} desc/s ({before_s:.2f}s)")
+    print(f"compiled SkillMatcher: {size / after_s:10.1f} desc/s ({after_s:.2f}s)")
+    print(f"speedup: {before_s / after_s:.1f}x, mismatching descriptions: {mismatches}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,80 @@
+"""
+skill_validator.SkillValidator versus the original is_valid_skill loop:
+verdicts on a fixture of real, misspelled, partial and unrelated skills
+must be identical, then validations per second (cold and memoized).
+
+    python benchmarks/bench_skill_validator.py [n_skills]
+"""
+import os
+import random
+import sys
+
+from fuzzywuzzy import fuzz
+
+from _helpers import BACKEND_DIR, load_literal, timed
+
+sys.path.append(os.path.join(BACKEND_DIR, "skill_analysis"))
+from skill_validator import SkillValidator  # noqa: E402
+
+SERVICE = "skill_analysis/skill_analysis_api.py"
+NOISE = ["microsoft", "bangalore", "team", "experience", "google cloud", "excel", "tableau", "figma",
+         "kafka", "go-lang", "ms office", "leadership", "ux", "ml", "qa", "sap", "crm tools", "xyz", "de"]
+
+
+def fuzzy_match(text1, text2, threshold=70):
+    return fuzz.partial_ratio(text1.lower(), text2.lower()) >= threshold
+
+
+def legacy_is_valid_skill(skill, known_skills, threshold=85):
+    if skill.lower() in [ks.lower() for ks in known_skills]:
+        return True
+    for known_skill in known_skills:
+        if skill.lower() in known_skill.lower() or known_skill.lower() in skill.lower():
+            if len(skill) < 3:
+                continue
+            return True
+    for known_skill in known_skills:
+        if fuzzy_match(skill, known_skill, threshold):
+            return True
+    return False
+
+
+def make_fixture(known, size, seed=9):
+    rng = random.Random(seed)
+    words = list(known) + NOISE
+    fixture = []
+    for _ in range(size):
+        skill = rng.choice(words)
+        kind = rng.random()
+        if kind < 0.2 and len(skill) > 3:  # typo
+            position = rng.randrange(len(skill))
+            skill = skill[:position] + rng.choice("abcdefghijklmnopqrstuvwxyz") + skill[position + 1:]
+        elif kind < 0.35:  # fragment
+            start = rng.randrange(len(skill))
+            skill = skill[start:start + rng.randint(1, 6)]
+        elif kind < 0.5:  # upper case / extra word
+            skill = skill.upper() if rng.random() < 0.5 else f"{skill} {rng.choice(NOISE)}"
+        elif kind < 0.6:  # random letters
+            skill = "".join(rng.choice("bdfghjklmnpqstvwxz") for _ in range(rng.randint(1, 8)))
+        fixture.append(skill)
+    return fixture
+
+
+def main(size=5000):
+    known = set(skill.lower() for skill in load_literal(SERVICE, "sales_skills") + load_literal(SERVICE, "computer_science_skills"))
+    fixture = make_fixture(known, size)
+    validator = SkillValidator(known)
+
+    legacy, legacy_s = timed(lambda: [legacy_is_valid_skill(skill, known) for skill in fixture])
+    cold, cold_s = timed(lambda: [validator.is_valid(skill) for skill in fixture])
+    warm, warm_s = timed(lambda: [validator.is_valid(skill) for skill in fixture])
+    mismatches = [skill for skill, a, b in zip(fixture, legacy, cold) if a != b]
+    print(f"{size} skills ({len(set(fixture))} distinct), {sum(legacy)} valid, mismatches: {len(mismatches)} {mismatches[:5]}")
+    print(f"  legacy loop      {size / legacy_s:10.0f} validations/s")
+    print(f"  index (cold)     {size / cold_s:10.0f} validations/s")
+    print(f"  index (memoized) {size / warm_s:10.0f} validations/s")
+    assert not mismatches and cold == warm
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,106 @@
+"""
+common.skill_warehouse: ingest throughput, and trend queries served from
+the daily rollups versus the same questions answered by scanning the raw
+job_skills rows. Both must give the same numbers.
+
+    python benchmarks/bench_skill_warehouse.py [days] [postings_per_day]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+from collections import Counter
+from datetime import datetime, time as dt_time, timedelta, timezone
+from itertools import permutations
+
+from _helpers import load_literal, timed
+
+from common.skill_warehouse import SkillWarehouse, utc_today
+
+SERVICE = "skill_analysis/skill_analysis_api.py"
+BENCH_SERVICE = "bench"
+SEARCHES = [("data engineer", "bangalore"), ("software engineer", "remote"), ("sales manager", "mumbai")]
+
+
+def ingest(warehouse, skills, days, per_day, seed=4):
+    """Daily scrapes per search; a quarter of each day's postings were already seen earlier that day."""
+    rng = random.Random(seed)
+    today = utc_today()
+    postings = 0
+    for offset in range(days, 0, -1):
+        timestamp = datetime.combine(today - timedelta(days=offset - 1), dt_time(1), tzinfo=timezone.utc).timestamp()
+        for search_term, location in SEARCHES:
+            # Skill popularity drifts over time so growth queries have something to find
+            weights = [1 + (index % 7) * (days - offset) / days for index in range(len(skills))]
+            batch = []
+            for _ in range(per_day):
+                posting_id = f"{search_term}-{offset}-{rng.randrange(int(per_day * 0.75))}"
+                batch.append({"posting_id": posting_id, "skills": rng.choices(skills, weights, k=rng.randint(3, 10)), "site": "indeed"})
+            # Same posting on the same day carries the same skills
+            seen = {}
+            for posting in batch:
+                posting["skills"] = seen.setdefault(posting["posting_id"], posting["skills"])
+            warehouse.record(BENCH_SERVICE, search_term, location, batch, scraped_at=timestamp)
+            postings += len(batch)
+        warehouse.flush()
+    return postings
+
+
+def raw_frequency(warehouse, search_term, location, skills, since):
+    rows = warehouse._query(
+        "SELECT day, skill, COUNT(*) FROM job_skills WHERE service = ? AND search_term = ? AND location = ? AND day >= ? "
+        f"AND skill IN ({','.join('?' * len(skills))}) GROUP BY day, skill", (BENCH_SERVICE, search_term, location, since, *skills)
+    )
+    return {(day, skill): count for day, skill, count in rows}
+
+
+def raw_cooccurrence(warehouse, skill, search_term, location, since):
+    rows = warehouse._query(
+        "SELECT posting_id, day, skill FROM job_skills WHERE service = ? AND search_term = ? AND location = ? AND day >= ?",
+        (BENCH_SERVICE, search_term, location, since)
+    )
+    postings = {}
+    for posting_id, day, other in rows:
+        postings.setdefault((posting_id, day), set()).add(other)
+    together = Counter()
+    for posting_skills in postings.values():
+        if skill in posting_skills:
+            together.update(other for first, other in permutations(sorted(posting_skills), 2) if first == skill)
+    return together
+
+
+def main(days=90, per_day=200):
+    skills = sorted(set(load_literal(SERVICE, "sales_skills") + load_literal(SERVICE, "computer_science_skills")))[:60]
+    with tempfile.TemporaryDirectory() as directory:
+        warehouse = SkillWarehouse(os.path.join(directory, "warehouse.sqlite3"))
+        postings, ingest_s = timed(ingest, warehouse, skills, days, per_day)
+        stats = warehouse.stats()
+        print(f"ingested {postings} postings ({stats['jobs']} distinct per day) in {ingest_s:.1f}s: {postings / ingest_s:.0f} postings/s")
+
+        search_term, location = SEARCHES[0]
+        since = (utc_today() - timedelta(days=29)).isoformat()
+        frequency = warehouse.frequency(BENCH_SERVICE, search_term, location, days=30)
+        rollup = {(row["period"], skill): count for row in frequency["series"] for skill, count in row["counts"].items() if count}
+        assert rollup == raw_frequency(warehouse, search_term, location, frequency["skills"], since)
+        skill = frequency["skills"][0]
+        cooccurrence = warehouse.co_occurrence(BENCH_SERVICE, skill, search_term, location, days=30, limit=len(skills))
+        raw = raw_cooccurrence(warehouse, skill, search_term, location, since)
+        assert {row["skill"]: row["postings"] for row in cooccurrence["co_occurring"]} == dict(raw)
+        growth = warehouse.growth(BENCH_SERVICE, search_term, location, period_days=7)
+        print(f"rollups match raw scans; fastest growing for {search_term} in {location}: "
+              f"{[(row['skill'], row['growth']) for row in growth['skills'][:3]]}")
+
+        def median_ms(fn, *args, **kwargs):
+            return statistics.median(timed(fn, *args, **kwargs)[1] * 1000 for _ in range(20))
+
+        print("query latency (median ms)        rollup     raw scan")
+        print(f"  frequency, 30 days, top 10 {median_ms(warehouse.frequency, BENCH_SERVICE, search_term, location, days=30):10.2f} "
+              f"{median_ms(raw_frequency, warehouse, search_term, location, frequency['skills'], since):12.2f}")
+        print(f"  co-occurrence, 30 days     {median_ms(warehouse.co_occurrence, BENCH_SERVICE, skill, search_term, location, days=30):10.2f} "
+              f"{median_ms(raw_cooccurrence, warehouse, skill, search_term, location, since):12.2f}")
+        print(f"  growth, week over week     {median_ms(warehouse.growth, BENCH_SERVICE, search_term, location, period_days=7):10.2f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
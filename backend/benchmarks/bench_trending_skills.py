@@ -0,0 +1,93 @@
+"""
+skill_analysis.trending_skills: rolling window counts and read latency.
+
+1. Two weeks of hourly scrapes are simulated, with postings that stay
+   live for several days and get re-scraped. After every refresh the
+   incremental 24h/7d counts must equal a recount from scratch of the
+   distinct postings last seen within each window.
+2. Request latency: the old endpoints scraped and ran NER inline on
+   every call (the fetch is simulated here with a sleep). The view
+   answers from memory, a new search with the default view until its
+   first scrape is done.
+
+    python benchmarks/bench_trending_skills.py [fetch_seconds]
+"""
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+
+from _helpers import BACKEND_DIR, load_literal, timed
+
+sys.path.append(os.path.join(BACKEND_DIR, "skill_analysis"))
+from trending_skills import SkillWindows, TrendingSkills, parse_windows  # noqa: E402
+
+SERVICE = "skill_analysis/skill_analysis_api.py"
+
+
+def simulate(skills, hours=24 * 14, per_scrape=30, seed=5):
+    """Hourly batches of (posting_id, skills): mostly postings still live, some new ones each hour."""
+    rng = random.Random(seed)
+    live, next_id = {}, 0
+    for hour in range(hours):
+        for posting_id in [p for p, (_, ends) in live.items() if ends <= hour]:
+            del live[posting_id]
+        for _ in range(rng.randint(3, 10)):
+            live[next_id] = (rng.sample(skills, rng.randint(2, 8)), hour + rng.randint(6, 24 * 10))
+            next_id += 1
+        batch = rng.sample(sorted(live), min(per_scrape, len(live)))
+        yield hour * 3600.0, [(posting_id, live[posting_id][0]) for posting_id in batch]
+
+
+def check_counts(skills, windows):
+    rolling = SkillWindows(windows)
+    last_seen, posting_skills = {}, {}
+    checks = 0
+    for now, batch in simulate(skills):
+        for posting_id, posting in batch:
+            rolling.add(posting_id, posting, now)
+            last_seen[posting_id] = now
+            posting_skills.setdefault(posting_id, posting)
+        rolling.expire(now)
+        for name, length in windows.items():
+            expected = Counter()
+            for posting_id, seen_at in last_seen.items():
+                if seen_at >= now - length:
+                    expected.update(posting_skills[posting_id])
+            top, _ = rolling.top(name, None)
+            assert dict(top) == dict(expected), (now, name)
+            checks += 1
+    return checks
+
+
+def main(fetch_seconds=2.0):
+    skills = sorted(set(load_literal(SERVICE, "sales_skills") + load_literal(SERVICE, "computer_science_skills")))
+    windows = parse_windows("24h,7d")
+    checks, elapsed = timed(check_counts, skills, windows)
+    print(f"rolling counts match a full recount: {checks} window checks over 14 simulated days ({elapsed:.1f}s)")
+
+    rng = random.Random(1)
+    batch = [(f"posting-{i}", rng.sample(skills, 5)) for i in range(30)]
+
+    def fetch(search_term, location):
+        time.sleep(fetch_seconds)  # stands in for scrape_jobs + NER over 30 descriptions
+        return batch
+
+    inline_ms = [timed(fetch, "software engineer", "remote")[1] * 1000 for _ in range(3)]
+    view = TrendingSkills(fetch, windows, seed=[("software engineer", "remote")]).start()
+    while view.view("software engineer", "remote", "24h") is None:
+        time.sleep(0.05)
+    first, first_s = timed(view.view, "data engineer", "remote", "24h")
+    reads_ms = [timed(view.view, "software engineer", "remote", "24h")[1] * 1000 for _ in range(10000)]
+    view.stop()
+    print("per request (median):")
+    print(f"  inline scrape + NER        {statistics.median(inline_ms):10.1f} ms")
+    print(f"  view, first request of key {first_s * 1000:10.4f} ms (default view while its first scrape runs)")
+    print(f"  view, refreshed key        {statistics.median(reads_ms):10.4f} ms")
+    assert first["pending"] and first["trending_skills"] and first_s < fetch_seconds / 10
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 2.0)
@@ -0,0 +1 @@
+"""Helpers shared by the CareerZenith Python services."""
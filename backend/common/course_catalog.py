@@ -0,0 +1,232 @@
+"""
+Compact binary form of the Coursera course catalog.
+
+The build step reads the CSV once and writes one file: a JSON header
+followed by 64-byte aligned numpy arrays. The arrays hold:
+- names and URLs as UTF-8 blobs plus offsets
+- ratings and difficulty codes
+- tag lists as ids into a tag dictionary
+- the course ranking
+- a tag index: normalized tag -> course ids, best first
+
+Services open it with mmap and read the arrays in place, so every
+worker on the machine shares the same page-cache pages instead of each
+parsing its own DataFrame.
+
+    python -m common.course_catalog build [csv_path] [catalog_path]
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CSV_PATH = os.path.join(BACKEND_DIR, "data", "coursera_courses.csv")
+DEFAULT_CATALOG_PATH = os.path.join(BACKEND_DIR, "data", "coursera_courses.catalog")
+
+MAGIC = b"CZCATLG1"
+# Bumped when the arrays change; catalogs of another format are rebuilt
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+# Easier courses first among equally rated ones; unknown difficulty last
+DIFFICULTY_ORDER = ["Beginner Level", "Intermediate Level", "Advanced Level"]
+
+
+def parse_tags(value):
+    """Tag list of a "['Business', 'Business Essentials']" cell."""
+    return [tag.strip(" '[]") for tag in value.split(',')] if isinstance(value, str) else []
+
+
+def source_stamp(csv_path, with_hash=True):
+    stat = os.stat(csv_path)
+    stamp = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if with_hash:
+        with open(csv_path, "rb") as source:
+            stamp["sha1"] = hashlib.sha1(source.read()).hexdigest()
+    return stamp
+
+
+def _strings(values):
+    """UTF-8 blob, offsets, and a mask of the values that are present (not None/NaN)."""
+    present = np.array([isinstance(value, str) for value in values], dtype=np.bool_)
+    encoded = [value.encode("utf-8") if isinstance(value, str) else b"" for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(value) for value in encoded])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets, present
+
+
+def _csr(lists, dtype=np.int32):
+    offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(values) for values in lists])
+    flat = np.fromiter((value for values in lists for value in values), dtype=dtype, count=int(offsets[-1]))
+    return flat, offsets
+
+
+def build_catalog(csv_path=DEFAULT_CSV_PATH, catalog_path=DEFAULT_CATALOG_PATH):
+    """Writes the catalog for `csv_path` to `catalog_path` atomically; open mappings keep the old file."""
+    import pandas as pd
+
+    started = time.time()
+    stamp = source_stamp(csv_path)
+    courses = pd.read_csv(csv_path)
+    course_tags = courses["Tags"].apply(parse_tags).tolist()
+
+    tags = sorted({tag for values in course_tags for tag in values})
+    tag_ids = {tag: tag_id for tag_id, tag in enumerate(tags)}
+    difficulty_codes = {difficulty: code for code, difficulty in enumerate(DIFFICULTY_ORDER)}
+    difficulties = [difficulty if isinstance(difficulty, str) else None for difficulty in courses["Difficulty"]]
+    difficulty = np.array([difficulty_codes.get(value, len(DIFFICULTY_ORDER)) for value in difficulties], dtype=np.int8)
+    # Difficulties outside the known order keep their text
+    extra_difficulties = sorted({value for value in difficulties if value and value not in difficulty_codes})
+    labels = DIFFICULTY_ORDER + extra_difficulties
+    difficulty_label = np.array(
+        [labels.index(value) if value else -1 for value in difficulties], dtype=np.int8
+    )
+
+    rating = courses["Rating"].to_numpy(dtype=np.float64)
+    # np.lexsort sorts by the last key first: missing ratings last, then rating desc, difficulty, position
+    order = np.lexsort((np.arange(len(courses)), difficulty, -np.nan_to_num(rating, nan=0.0), np.isnan(rating)))
+    rank = np.empty(len(courses), dtype=np.int32)
+    rank[order] = np.arange(len(courses), dtype=np.int32)
+
+    index = {}
+    for course_id, values in enumerate(course_tags):
+        for tag in values:
+            index.setdefault(tag.lower(), set()).add(course_id)
+    index_tags = sorted(index)
+    tag_courses, tag_offsets = _csr([sorted(index[tag], key=rank.__getitem__) for tag in index_tags])
+    course_tag_ids, course_tag_offsets = _csr([[tag_ids[tag] for tag in values] for values in course_tags])
+    names, name_offsets, name_present = _strings(courses["Name"].tolist())
+    urls, url_offsets, url_present = _strings(courses["Url"].tolist())
+
+    arrays = {
+        "names": names, "name_offsets": name_offsets, "name_present": name_present,
+        "urls": urls, "url_offsets": url_offsets, "url_present": url_present,
+        "rating": rating, "difficulty": difficulty_label, "rank": rank,
+        "course_tag_ids": course_tag_ids, "course_tag_offsets": course_tag_offsets,
+        "tag_courses": tag_courses, "tag_offsets": tag_offsets
+    }
+    header = {
+        "format": FORMAT_VERSION,
+        "source": dict(stamp, path=os.path.abspath(csv_path)),
+        "courses": len(courses),
+        "tags": tags,
+        "index_tags": index_tags,
+        "difficulties": labels,
+        "arrays": {}
+    }
+    # Offsets are relative to the end of the header, so they do not depend on its length
+    offset = 0
+    for name, array in arrays.items():
+        offset += -offset % ALIGNMENT
+        header["arrays"][name] = [array.dtype.str, offset, len(array)]
+        offset += array.nbytes
+    header_bytes = json.dumps(header).encode("utf-8")
+    data_start = len(MAGIC) + 8 + len(header_bytes)
+    data_start += -data_start % ALIGNMENT
+
+    temporary = f"{catalog_path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as out:
+        out.write(MAGIC + struct.pack("<Q", len(header_bytes)) + header_bytes)
+        for name, array in arrays.items():
+            out.seek(data_start + header["arrays"][name][1])
+            out.write(array.tobytes())
+    os.replace(temporary, catalog_path)
+    print(f"📦 Built course catalog {catalog_path}: {len(courses)} courses, {len(index_tags)} tags in {time.time() - started:.2f}s")
+    return catalog_path
+
+
+class CourseCatalog:
+    """Read-only view of a catalog file; arrays are zero-copy views of a shared mmap."""
+
+    def __init__(self, catalog_path):
+        self.path = catalog_path
+        with open(catalog_path, "rb") as source:
+            self._map = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{catalog_path} is not a course catalog")
+        (header_length,) = struct.unpack_from("<Q", self._map, len(MAGIC))
+        header_start = len(MAGIC) + 8
+        self.header = json.loads(self._map[header_start:header_start + header_length])
+        if self.header.get("format") != FORMAT_VERSION:
+            raise ValueError(f"{catalog_path} has format {self.header.get('format')}, expected {FORMAT_VERSION}")
+        data_start = header_start + header_length
+        data_start += -data_start % ALIGNMENT
+        for name, (dtype, offset, length) in self.header["arrays"].items():
+            dtype = np.dtype(dtype)
+            array = np.frombuffer(self._map, dtype=dtype, count=length, offset=data_start + offset) if length else np.empty(0, dtype)
+            setattr(self, name, array)
+        self.tags = self.header["tags"]
+        self.difficulties = self.header["difficulties"]
+        self.index = {tag: position for position, tag in enumerate(self.header["index_tags"])}
+
+    def __len__(self):
+        return self.header["courses"]
+
+    def is_fresh(self, csv_path):
+        """
+        Whether the catalog was built from the current `csv_path`. The CSV
+        is hashed only when its size matches but its mtime does not, e.g.
+        after a fresh checkout.
+        """
+        source = self.header["source"]
+        try:
+            stamp = source_stamp(csv_path, with_hash=False)
+            if stamp["size"] != source["size"]:
+                return False
+            return stamp["mtime_ns"] == source["mtime_ns"] or source_stamp(csv_path)["sha1"] == source["sha1"]
+        except OSError:
+            return False
+
+    def tag_course_ids(self, tag):
+        """Ids of courses tagged with normalized `tag`, best first."""
+        position = self.index.get(tag)
+        if position is None:
+            return self.tag_courses[:0]
+        return self.tag_courses[self.tag_offsets[position]:self.tag_offsets[position + 1]]
+
+    @staticmethod
+    def _string(blob, offsets, present, position):
+        if not present[position]:
+            return None
+        return bytes(blob[offsets[position]:offsets[position + 1]]).decode("utf-8")
+
+    def record(self, course_id):
+        """The course as returned by the API: name, url, rating, difficulty, tags (missing values as None)."""
+        rating = float(self.rating[course_id])
+        difficulty = int(self.difficulty[course_id])
+        tag_ids = self.course_tag_ids[self.course_tag_offsets[course_id]:self.course_tag_offsets[course_id + 1]]
+        return {
+            "name": self._string(self.names, self.name_offsets, self.name_present, course_id),
+            "url": self._string(self.urls, self.url_offsets, self.url_present, course_id),
+            "rating": None if np.isnan(rating) else rating,
+            "difficulty": self.difficulties[difficulty] if difficulty >= 0 else None,
+            "tags": [self.tags[tag_id] for tag_id in tag_ids]
+        }
+
+
+def open_catalog(csv_path=DEFAULT_CSV_PATH, catalog_path=DEFAULT_CATALOG_PATH):
+    """
+    The catalog for `csv_path`, rebuilt first if it is missing or was
+    built from another version of the CSV.
+    """
+    try:
+        catalog = CourseCatalog(catalog_path)
+        if catalog.is_fresh(csv_path):
+            return catalog
+        print(f"⚠️ Course catalog {catalog_path} is stale, rebuilding")
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Course catalog unavailable ({e}), building it")
+    build_catalog(csv_path, catalog_path)
+    return CourseCatalog(catalog_path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "build":
+        sys.exit("usage: python -m common.course_catalog build [csv_path] [catalog_path]")
+    build_catalog(*sys.argv[2:4])
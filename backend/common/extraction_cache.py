@@ -0,0 +1,93 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+def content_key(text, version):
+    """Hash of the extractor version plus the text, so a new extractor never reads stale entries."""
+    digest = hashlib.sha256()
+    digest.update(str(version).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update((text or "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    Two-tier cache for skill extraction results keyed by `content_key`.
+
+    Lookups hit a bounded in-memory LRU first, then a SQLite file that
+    survives restarts; a miss runs the extractor and fills both tiers.
+    Identical descriptions (e.g. the same posting scraped twice) share
+    one entry regardless of where they came from.
+    """
+
+    def __init__(self, path, version, capacity=10000):
+        self.version = version
+        self.capacity = capacity
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS extractions (key TEXT PRIMARY KEY, skills TEXT NOT NULL)"
+        )
+        self._db.commit()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _remember(self, key, skills):
+        self._memory[key] = skills
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def get(self, text):
+        """Returns the cached skills for `text`, or None on a miss."""
+        key = content_key(text, self.version)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return list(self._memory[key])
+            row = self._db.execute("SELECT skills FROM extractions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            skills = json.loads(row[0])
+            self._remember(key, skills)
+            self.disk_hits += 1
+            return list(skills)
+
+    def put(self, text, skills):
+        key = content_key(text, self.version)
+        with self._lock:
+            self._remember(key, list(skills))
+            self._db.execute(
+                "INSERT OR REPLACE INTO extractions (key, skills) VALUES (?, ?)",
+                (key, json.dumps(list(skills)))
+            )
+            self._db.commit()
+
+    def get_or_extract(self, text, extract):
+        """Returns cached skills for `text`, running `extract(text)` only on a miss."""
+        skills = self.get(text)
+        if skills is None:
+            skills = extract(text)
+            self.put(text, skills)
+        return skills
+
+    def stats(self):
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "version": self.version,
+                "memory_entries": len(self._memory),
+                "memory_capacity": self.capacity,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,122 @@
+import os
+import threading
+import time
+
+
+class ModelManager:
+    """
+    Loads a model on a background thread so a service can bind its port
+    right away.
+
+    `load()` builds the model and `warmup(model)` runs one inference so the
+    first real request does not pay for lazy initialisation. Callers use
+    `get(timeout)`: it returns the model once ready, waits at most
+    `timeout` seconds while it is loading (None waits until loading ends)
+    and returns None if it is still loading or failed to load, so the
+    caller can fall back to a cheaper path.
+    """
+
+    def __init__(self, name, load, warmup=None, started=None):
+        self.name = name
+        self.load = load
+        self.warmup = warmup
+        # Reference point for time-to-ready, normally when the service started importing
+        self.started = started or time.time()
+        self.model = None
+        self.error = None
+        self.load_seconds = None
+        self.warmup_seconds = None
+        self.ready_seconds = None
+        self._done = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        try:
+            load_start = time.time()
+            model = self.load()
+            self.load_seconds = time.time() - load_start
+            if self.warmup is not None:
+                warmup_start = time.time()
+                self.warmup(model)
+                self.warmup_seconds = time.time() - warmup_start
+            self.model = model
+            self.ready_seconds = time.time() - self.started
+            print(f"✅ {self.name} ready in {self.ready_seconds:.1f}s since startup "
+                  f"(load {self.load_seconds:.1f}s, warmup {self.warmup_seconds or 0:.1f}s)")
+        except Exception as e:
+            self.error = str(e)
+            print(f"❌ {self.name} failed to load: {e}")
+        finally:
+            self._done.set()
+
+    def start(self):
+        """Starts loading in the background (idempotent)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=f"load-{self.name}", daemon=True)
+            self._thread.start()
+        return self
+
+    @property
+    def ready(self):
+        return self.model is not None
+
+    def get(self, timeout=0):
+        """The model, or None when it is not ready within `timeout` seconds."""
+        if not self._done.is_set():
+            self.start()
+            self._done.wait(timeout)
+        return self.model
+
+    def status(self):
+        if self.ready:
+            state = "ready"
+        elif self._done.is_set():
+            state = "failed"
+        else:
+            state = "loading"
+        return {
+            "model": self.name,
+            "state": state,
+            "error": self.error,
+            "load_seconds": round(self.load_seconds, 2) if self.load_seconds is not None else None,
+            "warmup_seconds": round(self.warmup_seconds, 2) if self.warmup_seconds is not None else None,
+            "ready_seconds": round(self.ready_seconds, 2) if self.ready_seconds is not None else None
+        }
+
+
+def load_batched_ner(model_name="dslim/bert-base-NER", **pipeline_options):
+    """
+    Builds a BatchedNER over `model_name` on the configured inference backend
+    (NER_BACKEND, see common.ner_backends). Importing transformers/torch
+    alone takes seconds, so it happens here, on the loading thread, rather
+    than at service import time.
+    """
+    from common.ner_backends import load_ner_pipeline
+    from common.ner_batcher import BatchedNER
+
+    return BatchedNER(load_ner_pipeline(model_name, **pipeline_options))
+
+
+def load_ner(model_name="dslim/bert-base-NER", **pipeline_options):
+    """
+    The NER extractor for a service: a client of the shared NER server when
+    NER_SERVER_URL is set (falling back to an in-process model if the
+    server is unreachable, loaded in the background and waited for up to
+    MODEL_WAIT_TIMEOUT seconds like the services' own), else an in-process
+    BatchedNER.
+    """
+    server_url = os.environ.get("NER_SERVER_URL")
+    if not server_url:
+        return load_batched_ner(model_name, **pipeline_options)
+    from common.ner_client import NERClient
+    return NERClient(
+        server_url,
+        aggregation=pipeline_options.get("aggregation_strategy") or "none",
+        load_fallback=lambda: load_batched_ner(model_name, **pipeline_options),
+        fallback_wait=float(os.environ.get("MODEL_WAIT_TIMEOUT", "2"))
+    )
+
+
+def warmup_ner(batched_ner):
+    batched_ner(["Warmup: senior Python developer with React, AWS and Docker experience in Bangalore."])
+
@@ -0,0 +1,82 @@
+import os
+
+# Inference backends for the NER pipeline, chosen with NER_BACKEND:
+#   pytorch - the full-precision model (default)
+#   int8    - dynamic INT8 quantization of the Linear layers (torch only, no extra packages)
+#   onnx    - exported ONNX graph run by onnxruntime (needs optimum[onnxruntime])
+# Speed, memory and entity parity of int8 and onnx against pytorch have not
+# been measured here; run benchmarks/bench_ner_backends.py on the target
+# machine before switching the default.
+BACKENDS = ("pytorch", "int8", "onnx")
+
+
+def _set_torch_threads(threads):
+    import torch
+    if threads:
+        torch.set_num_threads(threads)
+
+
+def _pytorch_model(model_name, threads):
+    from transformers import AutoModelForTokenClassification
+    _set_torch_threads(threads)
+    return AutoModelForTokenClassification.from_pretrained(model_name)
+
+
+def _int8_model(model_name, threads):
+    import torch
+    model = _pytorch_model(model_name, threads)
+    return torch.ao.quantization.quantize_dynamic(model.eval(), {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _onnx_model(model_name, threads):
+    import onnxruntime
+    from optimum.onnxruntime import ORTModelForTokenClassification
+
+    options = onnxruntime.SessionOptions()
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if threads:
+        options.intra_op_num_threads = threads
+    # Export once, then reuse the saved graph on later starts
+    export_dir = os.environ.get("NER_ONNX_DIR") or os.path.join("onnx", model_name.replace("/", "__"))
+    if os.path.exists(os.path.join(export_dir, "model.onnx")):
+        return ORTModelForTokenClassification.from_pretrained(export_dir, session_options=options)
+    model = ORTModelForTokenClassification.from_pretrained(model_name, export=True, session_options=options)
+    model.save_pretrained(export_dir)
+    return model
+
+
+_LOADERS = {"pytorch": _pytorch_model, "int8": _int8_model, "onnx": _onnx_model}
+
+
+def load_ner_model(model_name, backend=None, threads=None):
+    """
+    (model, tokenizer, backend used) for `model_name` on the given backend
+    (default NER_BACKEND, else pytorch) with `threads` CPU threads (default
+    NER_THREADS, else the runtime's default). Falls back to the pytorch
+    backend when the selected one cannot be loaded.
+    """
+    from transformers import AutoTokenizer
+
+    backend = (backend or os.environ.get("NER_BACKEND") or "pytorch").lower()
+    threads = threads or int(os.environ.get("NER_THREADS", "0")) or None
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    try:
+        model = _LOADERS[backend](model_name, threads)
+    except Exception as e:
+        if backend == "pytorch":
+            raise
+        print(f"⚠️ NER backend {backend} unavailable ({e}), using pytorch")
+        backend = "pytorch"
+        model = _pytorch_model(model_name, threads)
+    return model, tokenizer, backend
+
+
+def load_ner_pipeline(model_name, backend=None, threads=None, **pipeline_options):
+    """A Hugging Face "ner" pipeline over the model returned by load_ner_model."""
+    from transformers import pipeline
+
+    model, tokenizer, backend = load_ner_model(model_name, backend, threads)
+    ner_pipeline = pipeline("ner", model=model, tokenizer=tokenizer, **pipeline_options)
+    ner_pipeline.backend = backend
+    print(f"✅ NER pipeline {model_name} on {backend} backend")
+    return ner_pipeline
@@ -0,0 +1,87 @@
+import os
+
+
+class BatchedNER:
+    """
+    Runs a Hugging Face NER pipeline over many texts at once.
+
+    Texts longer than the model window are split into overlapping token
+    windows instead of being cut off. All windows are sorted by token
+    length so each batch pads to roughly the same size, run `batch_size`
+    at a time, and their entities are mapped back to the text they came
+    from with character offsets relative to that text.
+
+    How much batching gains over one call per text, and the best batch
+    size, depend on the CPU and have not been measured for this repo:
+    NER_BATCH_SIZE (8) is a starting point, not a tuned value.
+    benchmarks/bench_ner_batching.py measures both.
+    """
+
+    def __init__(self, ner_pipeline, batch_size=None, max_tokens=None, stride=64):
+        self.pipeline = ner_pipeline
+        self.tokenizer = ner_pipeline.tokenizer
+        self.batch_size = batch_size or int(os.environ.get("NER_BATCH_SIZE", "8"))
+        # Room for [CLS] and [SEP] inside the model's 512-token limit
+        self.max_tokens = max_tokens or min(self.tokenizer.model_max_length, 512) - 2
+        self.stride = min(stride, self.max_tokens // 2)
+
+    def _windows(self, text):
+        """Yields (char_start, char_end, owned_start, owned_end, n_tokens) windows covering `text`."""
+        offsets = self.tokenizer(
+            text, add_special_tokens=False, return_offsets_mapping=True, truncation=False
+        )["offset_mapping"]
+        if not offsets:
+            return []
+
+        spans = []
+        step = self.max_tokens - self.stride
+        start = 0
+        while True:
+            end = min(start + self.max_tokens, len(offsets))
+            spans.append((start, end))
+            if end == len(offsets):
+                break
+            start += step
+
+        windows = []
+        owned_start = 0
+        for index, (start, end) in enumerate(spans):
+            if index + 1 < len(spans):
+                # Entities in an overlap belong to the window they are further inside of
+                middle = (spans[index + 1][0] + end) // 2
+                owned_end = offsets[middle][0]
+            else:
+                owned_end = len(text)
+            windows.append((offsets[start][0], offsets[end - 1][1], owned_start, owned_end, end - start))
+            owned_start = owned_end
+        return windows
+
+    def __call__(self, texts):
+        """Returns one list of entities per text, in the order given."""
+        results = [[] for _ in texts]
+        jobs = []
+        for text_index, text in enumerate(texts):
+            if not text or not isinstance(text, str):
+                continue
+            for window in self._windows(text):
+                jobs.append((text_index, window))
+
+        # Length buckets: neighbouring windows in this order need little padding
+        jobs.sort(key=lambda job: job[1][4])
+        for batch_start in range(0, len(jobs), self.batch_size):
+            batch = jobs[batch_start:batch_start + self.batch_size]
+            inputs = [texts[text_index][window[0]:window[1]] for text_index, window in batch]
+            outputs = self.pipeline(inputs, batch_size=len(inputs))
+            for (text_index, (char_start, _, owned_start, owned_end, _)), entities in zip(batch, outputs):
+                for entity in entities:
+                    entity = dict(entity)
+                    if entity.get("start") is not None:
+                        entity["start"] += char_start
+                        entity["end"] += char_start
+                        if not owned_start <= entity["start"] < owned_end:
+                            continue
+                    results[text_index].append(entity)
+
+        for entities in results:
+            entities.sort(key=lambda entity: entity.get("start") or 0)
+        return results
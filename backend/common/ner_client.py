@@ -0,0 +1,78 @@
+import threading
+import time
+
+import requests
+
+from common.model_manager import ModelManager
+
+
+class NERClient:
+    """
+    Drop-in replacement for BatchedNER that sends texts to the shared NER
+    inference server (ner_service/ner_server.py) instead of running a model
+    in this process.
+
+    `aggregation` picks the server pipeline ("none" or "simple", matching
+    the pipeline's aggregation_strategy). When the server cannot be
+    reached, a ModelManager starts building the in-process BatchedNER with
+    `load_fallback()` in the background, and it serves calls until the
+    server is retried `retry_after` seconds later. Calls wait at most
+    `fallback_wait` seconds for it and get no entities meanwhile, like
+    the services do while their own model loads.
+    """
+
+    def __init__(self, url, aggregation="none", load_fallback=None, timeout=60, retry_after=30, fallback_wait=2):
+        self.url = url.rstrip("/")
+        self.aggregation = aggregation
+        self.load_fallback = load_fallback
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.fallback_wait = fallback_wait
+        # requests.Session is not thread-safe, and the services call from many request threads
+        self._local_session = threading.local()
+        self._fallback = None
+        self._fallback_lock = threading.Lock()
+        self._server_down_until = 0
+        self.remote_calls = 0
+        self.fallback_calls = 0
+
+    @property
+    def session(self):
+        """This thread's requests.Session."""
+        session = getattr(self._local_session, "session", None)
+        if session is None:
+            session = self._local_session.session = requests.Session()
+        return session
+
+    def _remote(self, texts):
+        response = self.session.post(
+            f"{self.url}/ner", json={"texts": texts, "aggregation": self.aggregation}, timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()["entities"]
+
+    def _local(self, texts):
+        if self.load_fallback is None:
+            raise RuntimeError("NER server unavailable and no in-process fallback configured")
+        with self._fallback_lock:
+            if self._fallback is None:
+                print("⚠️ NER server unreachable, loading the model in-process")
+                self._fallback = ModelManager("NER fallback", self.load_fallback).start()
+        fallback = self._fallback.get(self.fallback_wait)
+        if fallback is None:
+            return [[] for _ in texts]
+        self.fallback_calls += 1
+        return fallback(texts)
+
+    def __call__(self, texts):
+        """Returns one list of entities per text, in the order given."""
+        texts = list(texts)
+        if time.time() >= self._server_down_until:
+            try:
+                entities = self._remote(texts)
+                self.remote_calls += 1
+                return entities
+            except requests.RequestException as e:
+                print(f"❌ NER server request failed: {e}")
+                self._server_down_until = time.time() + self.retry_after
+        return self._local(texts)
@@ -0,0 +1,191 @@
+import os
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+# Merged jobs of every site that answered in time, and one status dict per site
+ScrapeResult = namedtuple("ScrapeResult", ["jobs", "sites"])
+
+
+def parse_site_timeouts(spec):
+    """{"linkedin": 45.0} for "linkedin=45"; empty entries are ignored."""
+    timeouts = {}
+    for entry in (spec or "").split(","):
+        if entry.strip():
+            site, _, seconds = entry.partition("=")
+            timeouts[site.strip().lower()] = float(seconds)
+    return timeouts
+
+
+class ScrapeFailed(RuntimeError):
+    """No site answered: every one timed out or failed."""
+
+
+def is_partial(result):
+    return any(site["status"] != "ok" for site in result.sites)
+
+
+def all_failed(result):
+    """True when no site came back "ok": an empty frame then means an outage, not "no jobs"."""
+    return not any(site["status"] == "ok" for site in result.sites)
+
+
+def status_header(result):
+    """Compact per-site summary for a response header: "indeed=ok:812ms,linkedin=timeout:30000ms"."""
+    return ",".join(f"{site['site']}={site['status']}:{site['latency_ms']:.0f}ms" for site in result.sites)
+
+
+class ScrapeOrchestrator:
+    """
+    Runs one `scrape(site_name=[site], **params)` call per site on a
+    bounded thread pool instead of one call over all sites, so a slow or
+    blocked job board only costs its own results.
+
+    Each site has its own deadline (`timeout`, or `site_timeouts[site]`)
+    and up to `retries` retries with exponential backoff, as long as the
+    deadline allows. Frames are merged as sites finish. A site that
+    misses its deadline is reported as "timeout" and the others are
+    returned as they are. Python threads cannot be killed, so a hung
+    call keeps its worker until it returns; its result is dropped.
+    Per-site latencies are kept for stats().
+    """
+
+    def __init__(self, scrape, workers=8, timeout=30, retries=1, backoff=1.0, site_timeouts=None, history=200):
+        self.scrape_fn = scrape
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.site_timeouts = site_timeouts or {}
+        self.history = history
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape-site")
+        self._lock = threading.Lock()
+        self._sites = {}
+
+    def site_timeout(self, site):
+        return self.site_timeouts.get(site, self.timeout)
+
+    def _scrape_site(self, site, deadline, params):
+        """Scrapes one site, retrying failures while the deadline allows; returns (frame, attempts)."""
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return self.scrape_fn(site_name=[site], **params), attempt
+            except Exception as e:
+                delay = self.backoff * 2 ** (attempt - 1)
+                if attempt > self.retries or time.time() + delay >= deadline:
+                    raise RuntimeError(f"{type(e).__name__}: {e} (after {attempt} attempts)") from e
+                print(f"⚠️ Scrape of {site} failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def _record(self, status):
+        with self._lock:
+            stats = self._sites.setdefault(status["site"], {
+                "calls": 0, "ok": 0, "timeout": 0, "error": 0, "latencies_ms": deque(maxlen=self.history)
+            })
+            stats["calls"] += 1
+            stats[status["status"]] += 1
+            stats["latencies_ms"].append(status["latency_ms"])
+
+    @staticmethod
+    def _normalize(site, frame):
+        frame = frame if frame is not None else pd.DataFrame()
+        if "site" not in frame.columns or frame["site"].isna().all():
+            frame = frame.assign(site=site)
+        return frame
+
+    def scrape(self, sites, on_site=None, **params):
+        """
+        Scrapes `sites` concurrently with the shared `params` (search_term,
+        location, results_wanted, ...). `on_site(site, frame)` is called as
+        each site's jobs arrive. Returns a ScrapeResult; sites keep their
+        order in `result.sites`.
+        """
+        started = time.time()
+        deadlines = {site: started + self.site_timeout(site) for site in sites}
+        futures = {self._executor.submit(self._scrape_site, site, deadlines[site], params): site for site in sites}
+        statuses, frames = {}, []
+        pending = set(futures)
+        while pending:
+            now = time.time()
+            expired = {future for future in pending if deadlines[futures[future]] <= now}
+            for future in expired:
+                future.cancel()
+                statuses[futures[future]] = {"site": futures[future], "status": "timeout", "jobs": 0, "attempts": None,
+                                             "latency_ms": round((now - started) * 1000, 1),
+                                             "error": f"no answer within {self.site_timeout(futures[future]):g}s"}
+            pending -= expired
+            if not pending:
+                break
+            done, pending = wait(pending, timeout=max(0, min(deadlines[futures[f]] for f in pending) - now),
+                                 return_when=FIRST_COMPLETED)
+            for future in done:
+                site = futures[future]
+                latency_ms = round((time.time() - started) * 1000, 1)
+                try:
+                    frame, attempts = future.result()
+                    frame = self._normalize(site, frame)
+                    statuses[site] = {"site": site, "status": "ok", "jobs": len(frame), "attempts": attempts,
+                                      "latency_ms": latency_ms, "error": None}
+                    if len(frame):
+                        frames.append(frame)
+                        if on_site is not None:
+                            on_site(site, frame)
+                except Exception as e:
+                    statuses[site] = {"site": site, "status": "error", "jobs": 0, "attempts": None,
+                                      "latency_ms": latency_ms, "error": str(e)}
+
+        ordered = [statuses[site] for site in sites]
+        for status in ordered:
+            self._record(status)
+        jobs = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        if "job_url" in jobs.columns:
+            # The same posting can be listed by several boards under one URL
+            jobs = jobs[~(jobs["job_url"].notna() & jobs["job_url"].duplicated())].reset_index(drop=True)
+        summary = ", ".join(f"{s['site']} {s['status']} {s['jobs']} in {s['latency_ms'] / 1000:.1f}s" for s in ordered)
+        print(f"🕸️ Scraped {len(jobs)} jobs for {params.get('search_term')!r}: {summary}")
+        return ScrapeResult(jobs, ordered)
+
+    def scrape_answered(self, sites, **params):
+        """
+        scrape() for background refreshes: raises ScrapeFailed when no site
+        answered, so an outage never replaces the last good data with an
+        empty result.
+        """
+        result = self.scrape(sites, **params)
+        if all_failed(result):
+            raise ScrapeFailed(f"no job board answered ({status_header(result)})")
+        return result
+
+    def stats(self):
+        with self._lock:
+            sites = {}
+            for site, stats in sorted(self._sites.items()):
+                latencies = sorted(stats["latencies_ms"])
+                sites[site] = {
+                    key: value for key, value in stats.items() if key != "latencies_ms"
+                }
+                sites[site].update({
+                    "timeout_seconds": self.site_timeout(site),
+                    "p50_ms": latencies[len(latencies) // 2] if latencies else None,
+                    "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None
+                })
+            return {"sites": sites}
+
+
+def create_orchestrator(scrape, workers=8):
+    """
+    ScrapeOrchestrator configured from SCRAPE_* environment variables, shared by all
+    services; `workers` is the pool size unless SCRAPE_WORKERS overrides it.
+    """
+    return ScrapeOrchestrator(
+        scrape,
+        workers=int(os.environ.get("SCRAPE_WORKERS", workers)),
+        timeout=float(os.environ.get("SCRAPE_SITE_TIMEOUT", "30")),
+        retries=int(os.environ.get("SCRAPE_SITE_RETRIES", "1")),
+        backoff=float(os.environ.get("SCRAPE_RETRY_BACKOFF", "1")),
+        site_timeouts=parse_site_timeouts(os.environ.get("SCRAPE_SITE_TIMEOUTS"))
+    )
@@ -0,0 +1,101 @@
+import re
+from collections import namedtuple
+
+# A single hit: the canonical skill, the spelling that matched and its offsets
+SkillMatch = namedtuple("SkillMatch", ["skill", "variant", "start", "end"])
+
+_WORD_BOUNDARY = re.compile(r"\b")
+
+
+def skill_variants(skill):
+    """Spellings accepted for a skill, e.g. "react.js", "node js", "nodejs"."""
+    return [
+        skill.replace(".", " "),
+        skill.replace(" ", "."),
+        skill.replace(".", ""),
+        skill + ".js" if not skill.endswith(".js") and not skill.endswith(" js") else skill
+    ]
+
+
+def _trie_pattern(words):
+    """
+    Builds a prefix-factored alternation so the regex engine walks a trie
+    instead of trying every word at every position. Longer continuations
+    are tried before shorter ones, so the first match is the longest one.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if "" in node:
+            return "(?:" + "|".join(branches) + ")?"
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return build(trie)
+
+
+class SkillMatcher:
+    """
+    Finds every skill of a vocabulary in a text with one regex scan.
+
+    Every skill (and, with `expand_variants`, each of its `skill_variants`)
+    is compiled into one alternation, wrapped in a lookahead so matches may
+    overlap the same way independent `re.search(r'\\bskill\\b')` calls would.
+    Build it once at import and reuse it for every description.
+    """
+
+    def __init__(self, skills, expand_variants=True):
+        self.skills = list(dict.fromkeys(skills))
+        # spelling -> canonical skills it stands for
+        self._owners = {skill: [skill] for skill in self.skills}
+        if expand_variants:
+            for skill in self.skills:
+                for variant in skill_variants(skill):
+                    owners = self._owners.setdefault(variant, [])
+                    if skill not in owners:
+                        owners.append(skill)
+
+        spellings = sorted(self._owners)
+        # Shorter spellings that are a prefix of a longer one match at the same offset
+        self._prefixes = {
+            spelling: [other for other in spellings if other != spelling and spelling.startswith(other)]
+            for spelling in spellings
+        }
+        self._order = {skill: index for index, skill in enumerate(self.skills)}
+        self._pattern = re.compile(r"(?=\b(" + _trie_pattern(spellings) + r")\b)")
+
+    def finditer(self, text):
+        """Yields a SkillMatch for every occurrence of every skill spelling in `text`."""
+        for match in self._pattern.finditer(text):
+            start = match.start()
+            longest = match.group(1)
+            for spelling in [longest] + self._prefixes[longest]:
+                end = start + len(spelling)
+                if spelling is not longest and not _WORD_BOUNDARY.match(text, end):
+                    continue
+                for skill in self._owners[spelling]:
+                    yield SkillMatch(skill, spelling, start, end)
+
+    def find_skills(self, text):
+        """
+        Returns the canonical skills present in `text`: skills spelled exactly
+        first, then the ones only found through a variant, each group in
+        vocabulary order.
+        """
+        exact, variant_only = set(), set()
+        for hit in self.finditer(text):
+            if hit.variant == hit.skill:
+                exact.add(hit.skill)
+            else:
+                variant_only.add(hit.skill)
+        variant_only -= exact
+        return sorted(exact, key=self._order.get) + sorted(variant_only, key=self._order.get)
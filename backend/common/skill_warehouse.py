@@ -0,0 +1,387 @@
+"""
+Append-only local store of scraped jobs and their extracted skills, with
+daily rollups for trend queries.
+
+Raw tables (`jobs`, `job_skills`) are clustered by day, so old days can
+be pruned as whole ranges. Every posting is stored once per day, service
+and search. The rollups are updated in the same transaction as the raw
+rows:
+- postings per service, search and day
+- postings per skill, service, search and day
+- postings per skill pair, service, search and day
+Services are kept apart because each extracts skills its own way (the
+skill analysis service validates them, the recommendation service does
+not) and identifies postings its own way. Queries read one service's
+rollups only. Services hand batches to a background writer thread and
+never wait on SQLite inside a request.
+"""
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import permutations
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_WAREHOUSE_PATH = os.path.join(BACKEND_DIR, "data", "skill_warehouse.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    day TEXT NOT NULL, service TEXT NOT NULL, search_term TEXT NOT NULL, location TEXT NOT NULL,
+    posting_id TEXT NOT NULL, scraped_at REAL NOT NULL, site TEXT, title TEXT, company TEXT, job_location TEXT, url TEXT,
+    PRIMARY KEY (day, service, search_term, location, posting_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS job_skills (
+    day TEXT NOT NULL, service TEXT NOT NULL, search_term TEXT NOT NULL, location TEXT NOT NULL,
+    posting_id TEXT NOT NULL, skill TEXT NOT NULL,
+    PRIMARY KEY (day, service, search_term, location, posting_id, skill)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS search_daily (
+    service TEXT NOT NULL, search_term TEXT NOT NULL, location TEXT NOT NULL, day TEXT NOT NULL, postings INTEGER NOT NULL,
+    PRIMARY KEY (service, search_term, location, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS skill_daily (
+    service TEXT NOT NULL, search_term TEXT NOT NULL, location TEXT NOT NULL, skill TEXT NOT NULL, day TEXT NOT NULL,
+    postings INTEGER NOT NULL,
+    PRIMARY KEY (service, search_term, location, skill, day)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS skill_daily_by_day ON skill_daily (service, search_term, location, day);
+CREATE TABLE IF NOT EXISTS skill_pairs_daily (
+    service TEXT NOT NULL, search_term TEXT NOT NULL, location TEXT NOT NULL, skill TEXT NOT NULL, other_skill TEXT NOT NULL,
+    day TEXT NOT NULL, postings INTEGER NOT NULL,
+    PRIMARY KEY (service, search_term, location, skill, day, other_skill)
+) WITHOUT ROWID;
+"""
+TABLES = ("jobs", "job_skills", "search_daily", "skill_daily", "skill_pairs_daily")
+# Raw rows of a file written before rollups were kept per service, rebuilt into the new tables
+MIGRATE_V1 = """
+INSERT INTO jobs SELECT day, COALESCE(service, ''), search_term, location, posting_id, scraped_at,
+    site, title, company, job_location, url FROM jobs_v1;
+INSERT INTO job_skills SELECT s.day, COALESCE(j.service, ''), s.search_term, s.location, s.posting_id, s.skill
+    FROM job_skills_v1 s JOIN jobs_v1 j USING (day, search_term, location, posting_id);
+INSERT INTO search_daily SELECT service, search_term, location, day, COUNT(*) FROM jobs
+    GROUP BY service, search_term, location, day;
+INSERT INTO skill_daily SELECT service, search_term, location, skill, day, COUNT(*) FROM job_skills
+    GROUP BY service, search_term, location, skill, day;
+INSERT INTO skill_pairs_daily SELECT a.service, a.search_term, a.location, a.skill, b.skill, a.day, COUNT(*)
+    FROM job_skills a JOIN job_skills b USING (day, service, search_term, location, posting_id)
+    WHERE a.skill != b.skill GROUP BY a.service, a.search_term, a.location, a.skill, b.skill, a.day;
+"""
+GRANULARITIES = {"day": "day", "week": "strftime('%Y-W%W', day)", "month": "strftime('%Y-%m', day)"}
+
+
+def normalize_search(search_term, location):
+    return (search_term or "").strip().lower(), (location or "").strip().lower()
+
+
+def day_of(timestamp):
+    """UTC day of a timestamp; days in the warehouse are UTC."""
+    return time.strftime("%Y-%m-%d", time.gmtime(timestamp))
+
+
+def utc_today():
+    return datetime.now(timezone.utc).date()
+
+
+class SkillWarehouse:
+    """
+    `record()` queues postings and returns at once. A writer thread commits
+    them in batches every `flush_interval` seconds, or as soon as
+    `batch_size` postings are waiting. When more than `max_pending`
+    batches are queued, new ones are dropped and counted rather than
+    blocking the caller. Both services may share one file: it uses WAL
+    mode and a busy timeout.
+    """
+
+    def __init__(self, path=DEFAULT_WAREHOUSE_PATH, flush_interval=5, batch_size=500, max_pending=1000):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+        self._db.executescript(SCHEMA)
+        self._db.commit()
+        self._lock = threading.Lock()
+        self._pending = queue.Queue(maxsize=max_pending)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pending_postings = 0
+        self.written = 0
+        self.duplicates = 0
+        self.dropped = 0
+
+    def _migrate(self):
+        """
+        Moves a file from before rollups were kept per service to the current
+        layout. The old rollups mixed the services, so they are rebuilt from
+        the raw rows; days already pruned from those are not carried over.
+        """
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(search_daily)")]
+        if not columns or "service" in columns:
+            return
+        print("🗄️ Skill warehouse: rebuilding rollups per service")
+        self._db.executescript(
+            "BEGIN; DROP INDEX IF EXISTS skill_daily_by_day; "
+            + "".join(f"ALTER TABLE {table} RENAME TO {table}_v1; " for table in TABLES)
+            + SCHEMA + MIGRATE_V1
+            + "".join(f"DROP TABLE {table}_v1; " for table in TABLES) + "COMMIT;"
+        )
+
+    def record(self, service, search_term, location, postings, scraped_at=None):
+        """
+        Queues one scrape's postings: dicts with posting_id and skills, plus
+        optional site, title, company, location and url.
+        """
+        if not postings:
+            return
+        batch = (service, *normalize_search(search_term, location), scraped_at or time.time(), list(postings))
+        try:
+            self._pending.put_nowait(batch)
+        except queue.Full:
+            with self._lock:
+                self.dropped += len(batch[-1])
+            return
+        with self._lock:
+            self._pending_postings += len(batch[-1])
+            full = self._pending_postings >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def _write(self, batches):
+        written = duplicates = 0
+        with self._lock, self._db:
+            for service, search_term, location, scraped_at, postings in batches:
+                day = day_of(scraped_at)
+                for posting in postings:
+                    inserted = self._db.execute(
+                        "INSERT OR IGNORE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (day, service, search_term, location, str(posting["posting_id"]), scraped_at,
+                         posting.get("site"), posting.get("title"), posting.get("company"),
+                         posting.get("location"), posting.get("url"))
+                    ).rowcount
+                    if not inserted:
+                        # Already stored for this day, service and search: rollups count distinct postings
+                        duplicates += 1
+                        continue
+                    written += 1
+                    skills = sorted({skill.strip().lower() for skill in posting.get("skills") or [] if skill and skill.strip()})
+                    key = (service, search_term, location)
+                    self._db.executemany(
+                        "INSERT INTO job_skills VALUES (?, ?, ?, ?, ?, ?)",
+                        [(day, *key, str(posting["posting_id"]), skill) for skill in skills]
+                    )
+                    self._db.execute(
+                        "INSERT INTO search_daily VALUES (?, ?, ?, ?, 1) "
+                        "ON CONFLICT (service, search_term, location, day) DO UPDATE SET postings = postings + 1",
+                        (*key, day)
+                    )
+                    self._db.executemany(
+                        "INSERT INTO skill_daily VALUES (?, ?, ?, ?, ?, 1) "
+                        "ON CONFLICT (service, search_term, location, skill, day) DO UPDATE SET postings = postings + 1",
+                        [(*key, skill, day) for skill in skills]
+                    )
+                    self._db.executemany(
+                        "INSERT INTO skill_pairs_daily VALUES (?, ?, ?, ?, ?, ?, 1) "
+                        "ON CONFLICT (service, search_term, location, skill, day, other_skill) "
+                        "DO UPDATE SET postings = postings + 1",
+                        [(*key, skill, other, day) for skill, other in permutations(skills, 2)]
+                    )
+            self.written += written
+            self.duplicates += duplicates
+
+    def flush(self):
+        """Writes everything queued so far; called by the writer thread, or directly before queries in scripts."""
+        batches = []
+        while True:
+            try:
+                batches.append(self._pending.get_nowait())
+            except queue.Empty:
+                break
+        with self._lock:
+            self._pending_postings -= sum(len(batch[-1]) for batch in batches)
+        if batches:
+            try:
+                self._write(batches)
+            except Exception as e:
+                with self._lock:
+                    self.dropped += sum(len(batch[-1]) for batch in batches)
+                print(f"❌ Skill warehouse write failed: {e}")
+        return sum(len(batch[-1]) for batch in batches)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+        self.flush()
+
+    def start(self):
+        """Starts the writer thread (idempotent)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="skill-warehouse-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def prune(self, keep_days):
+        """Deletes raw jobs older than `keep_days` days; rollups are kept."""
+        cutoff = (utc_today() - timedelta(days=keep_days)).isoformat()
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM jobs WHERE day < ?", (cutoff,))
+            self._db.execute("DELETE FROM job_skills WHERE day < ?", (cutoff,))
+
+    # --- Queries (rollups only) ---
+
+    def _query(self, sql, params):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    @staticmethod
+    def _search_filter(service, search_term, location):
+        """SQL condition and parameters for one service; a missing search term or location means all of them."""
+        search_term, location = normalize_search(search_term, location)
+        conditions, params = ["service = ?"], [service]
+        if search_term:
+            conditions.append("search_term = ?")
+            params.append(search_term)
+        if location:
+            conditions.append("location = ?")
+            params.append(location)
+        return " AND ".join(conditions), params
+
+    def frequency(self, service, search_term=None, location=None, skills=None, days=30, granularity="day", limit=10,
+                  today=None):
+        """
+        Postings of `service` per period and, for `skills` (default: the
+        `limit` most frequent in the range), how many of them mention each
+        skill.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity {granularity!r}, expected one of {sorted(GRANULARITIES)}")
+        period = GRANULARITIES[granularity]
+        since = ((today or utc_today()) - timedelta(days=days - 1)).isoformat()
+        condition, params = self._search_filter(service, search_term, location)
+        if not skills:
+            skills = [skill for skill, _ in self._query(
+                f"SELECT skill, SUM(postings) AS total FROM skill_daily WHERE {condition} AND day >= ? "
+                "GROUP BY skill ORDER BY total DESC, skill LIMIT ?", (*params, since, limit)
+            )]
+        skills = [skill.strip().lower() for skill in skills]
+        totals = self._query(
+            f"SELECT {period} AS period, SUM(postings) FROM search_daily WHERE {condition} AND day >= ? "
+            "GROUP BY period ORDER BY period", (*params, since)
+        )
+        counts = {}
+        if skills:
+            placeholders = ",".join("?" * len(skills))
+            for period_name, skill, postings in self._query(
+                    f"SELECT {period} AS period, skill, SUM(postings) FROM skill_daily "
+                    f"WHERE {condition} AND day >= ? AND skill IN ({placeholders}) GROUP BY period, skill",
+                    (*params, since, *skills)):
+                counts.setdefault(period_name, {})[skill] = postings
+        return {
+            "skills": skills,
+            "series": [
+                {
+                    "period": period_name,
+                    "postings": postings,
+                    "counts": {skill: counts.get(period_name, {}).get(skill, 0) for skill in skills},
+                    "share": {skill: round(counts.get(period_name, {}).get(skill, 0) / postings, 4) for skill in skills}
+                }
+                for period_name, postings in totals
+            ]
+        }
+
+    def _period_counts(self, condition, params, start, end):
+        postings = self._query(
+            f"SELECT COALESCE(SUM(postings), 0) FROM search_daily WHERE {condition} AND day BETWEEN ? AND ?",
+            (*params, start, end)
+        )[0][0]
+        counts = dict(self._query(
+            f"SELECT skill, SUM(postings) FROM skill_daily WHERE {condition} AND day BETWEEN ? AND ? GROUP BY skill",
+            (*params, start, end)
+        ))
+        return postings, counts
+
+    def growth(self, service, search_term=None, location=None, period_days=7, limit=20, min_postings=3, today=None):
+        """
+        Skills whose share of `service`'s postings grew most between the
+        previous and the last `period_days` days (e.g. week over week).
+        `growth` is the relative change in share, None for skills absent in
+        the previous period.
+        """
+        today = today or utc_today()
+        current_start = today - timedelta(days=period_days - 1)
+        previous_end = current_start - timedelta(days=1)
+        previous_start = previous_end - timedelta(days=period_days - 1)
+        condition, params = self._search_filter(service, search_term, location)
+        current_total, current = self._period_counts(condition, params, current_start.isoformat(), today.isoformat())
+        previous_total, previous = self._period_counts(condition, params, previous_start.isoformat(), previous_end.isoformat())
+
+        skills = []
+        for skill, count in current.items():
+            if count < min_postings:
+                continue
+            share = count / current_total
+            previous_share = previous.get(skill, 0) / previous_total if previous_total else 0
+            skills.append({
+                "skill": skill,
+                "postings": count,
+                "previous_postings": previous.get(skill, 0),
+                "share": round(share, 4),
+                "previous_share": round(previous_share, 4),
+                "growth": round((share - previous_share) / previous_share, 4) if previous_share else None
+            })
+        # New skills first, then the largest relative growth
+        skills.sort(key=lambda row: (row["growth"] is not None, -(row["growth"] or 0), -row["postings"], row["skill"]))
+        return {
+            "period_days": period_days,
+            "current": {"from": current_start.isoformat(), "to": today.isoformat(), "postings": current_total},
+            "previous": {"from": previous_start.isoformat(), "to": previous_end.isoformat(), "postings": previous_total},
+            "skills": skills[:limit]
+        }
+
+    def co_occurrence(self, service, skill, search_term=None, location=None, days=30, limit=20, today=None):
+        """Skills most often listed together with `skill` by `service`, with the share of its postings that list them."""
+        skill = skill.strip().lower()
+        since = ((today or utc_today()) - timedelta(days=days - 1)).isoformat()
+        condition, params = self._search_filter(service, search_term, location)
+        total = self._query(
+            f"SELECT COALESCE(SUM(postings), 0) FROM skill_daily WHERE {condition} AND skill = ? AND day >= ?",
+            (*params, skill, since)
+        )[0][0]
+        rows = self._query(
+            f"SELECT other_skill, SUM(postings) AS together FROM skill_pairs_daily "
+            f"WHERE {condition} AND skill = ? AND day >= ? GROUP BY other_skill ORDER BY together DESC, other_skill LIMIT ?",
+            (*params, skill, since, limit)
+        )
+        return {
+            "skill": skill,
+            "postings": total,
+            "co_occurring": [
+                {"skill": other, "postings": together, "share": round(together / total, 4) if total else 0.0}
+                for other, together in rows
+            ]
+        }
+
+    def stats(self):
+        with self._lock:
+            jobs, days = self._db.execute("SELECT COALESCE(SUM(postings), 0), COUNT(DISTINCT day) FROM search_daily").fetchone()
+            return {
+                "path": self.path,
+                "jobs": jobs,
+                "days": days,
+                "pending_batches": self._pending.qsize(),
+                "written": self.written,
+                "duplicates": self.duplicates,
+                "dropped": self.dropped
+            }
@@ -0,0 +1,35 @@
+"""
+Nightly digest entry point: recommendations for many users in one run.
+
+    python batch_recommend.py --all --out recommendations.jsonl
+    python batch_recommend.py --uids UID1 UID2 --firestore --workers 8
+"""
+import argparse
+
+import recommendation_api
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch job recommendations for many users")
+    users = parser.add_mutually_exclusive_group(required=True)
+    users.add_argument("--uids", nargs="+", help="user ids to recommend for")
+    users.add_argument("--uids-file", help="file with one user id per line")
+    users.add_argument("--all", action="store_true", help="every user in Firestore")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--out", default="recommendations.jsonl", help="JSONL file to write (default)")
+    output.add_argument("--firestore", action="store_true", help="write to the recommendations collection instead")
+    parser.add_argument("--workers", type=int, default=4, help="scoring worker threads")
+    args = parser.parse_args()
+
+    uids = args.uids
+    if args.uids_file:
+        with open(args.uids_file, encoding="utf-8") as uid_file:
+            uids = [line.strip() for line in uid_file if line.strip()]
+
+    writer = recommendation_api.FirestoreWriter() if args.firestore else recommendation_api.JsonlWriter(args.out)
+    summary = recommendation_api.recommend_for_users(writer, uids=None if args.all else uids, workers=args.workers)
+    print(f"✅ {summary['users']} users in {summary['seconds']}s ({summary['users_per_second']} users/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+import hashlib
+import re
+import threading
+from collections import ChainMap, OrderedDict
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+import pandas as pd
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    "gclid", "fbclid", "msclkid", "trk", "trkinfo", "refid", "trackingid", "tracking_id", "ref", "src",
+    "source", "from", "vjs", "tk", "advn", "adid", "sjdu", "acatk", "pub", "campaignid", "lipi", "origin",
+    "position", "pagenum", "currentjobid", "alternatechannel", "eid", "originalsubdomain"
+}
+_WORD = re.compile(r"[a-z0-9+#]+")
+
+
+@lru_cache(maxsize=200000)
+def canonical_url(url):
+    """URL without tracking parameters, fragment, "www." or trailing slash, lowercased host."""
+    if not url or not isinstance(url, str):
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=False)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    )
+    return urlunsplit(("https", host, parts.path.rstrip("/"), urlencode(query), ""))
+
+
+def normalize(text):
+    return " ".join(_WORD.findall(str(text or "").lower()))
+
+
+def posting_key(title, company, location, description):
+    """
+    Hash of the normalized title, company, location and description; None
+    if title or company is missing. One company often lists several
+    openings under the same title and location, so the description must
+    match too (near-identical descriptions are caught by MinHash instead).
+    """
+    title, company = normalize(title), normalize(company)
+    if not title or not company:
+        return None
+    return hashlib.sha1(f"{title}|{company}|{normalize(location)}|{normalize(description)}".encode("utf-8")).hexdigest()
+
+
+class MinHasher:
+    """
+    MinHash signatures over word 3-gram shingles with `bands` x `rows`
+    multiply-add hash functions in wrapping 32-bit arithmetic.
+    """
+
+    def __init__(self, bands=16, rows=4, seed=7):
+        self.bands = bands
+        self.rows = rows
+        rng = np.random.default_rng(seed)
+        self._a = (rng.integers(0, 1 << 31, size=(bands * rows, 1), dtype=np.uint32) << 1) | 1
+        self._b = rng.integers(0, 1 << 32, size=(bands * rows, 1), dtype=np.uint32)
+
+    def signature(self, text, min_shingles=5):
+        words = _WORD.findall(str(text or "").lower())
+        shingles = set(zip(words, words[1:], words[2:]))
+        if len(shingles) < min_shingles:
+            return None
+        # Built-in hash is salted per process, which is fine: signatures never leave it
+        hashes = np.fromiter((hash(shingle) & 0xFFFFFFFF for shingle in shingles), dtype=np.uint32, count=len(shingles))
+        return (self._a * hashes + self._b).min(axis=1)
+
+    def band_hashes(self, signatures):
+        """(n, bands) array: one 64-bit hash per band of each signature row."""
+        blocks = signatures.astype(np.uint64).reshape(len(signatures), self.bands, self.rows)
+        hashes = np.zeros((len(signatures), self.bands), dtype=np.uint64)
+        for row in range(self.rows):
+            hashes = hashes * np.uint64(0x9E3779B97F4A7C15) + blocks[:, :, row]
+        return hashes
+
+
+def title_similarity(first, second):
+    """Jaccard similarity of two title word sets ("senior software engineer" vs "software engineer iii": 0.5)."""
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def richness(jobs):
+    """How much each record tells the user: filled fields first, then number of skills and description length."""
+    fields = ("title", "company", "location", "description", "url")
+    return pd.DataFrame({
+        "filled": sum((jobs[field].fillna("").astype(str) != "").to_numpy(dtype=int) for field in fields),
+        "skills": [len(skills) if isinstance(skills, list) else 0 for skills in jobs["skills"]],
+        "length": jobs["description"].fillna("").astype(str).str.len().to_numpy()
+    })
+
+
+class DisjointSets:
+    """Union-find over row positions; the smallest position of a set is its label."""
+
+    def __init__(self, size):
+        self.parent = list(range(size))
+        # positions that were attached under another one
+        self.merged = set()
+
+    def find(self, position):
+        parent = self.parent
+        while parent[position] != position:
+            parent[position] = parent[parent[position]]
+            position = parent[position]
+        return position
+
+    def union(self, first, second):
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            self.parent[max(first, second)] = min(first, second)
+            self.merged.add(max(first, second))
+
+
+class JobDeduplicator:
+    """
+    Collapses copies of the same posting across sources before scoring.
+
+    Jobs are duplicates when they share a canonical URL, the same
+    normalized title + company + location + description, or a
+    near-identical description (MinHash/LSH, estimated Jaccard >=
+    `threshold`) under a similar title, so one company's postings for
+    different roles that share boilerplate stay apart. Each cluster keeps
+    its richest record. Signatures are cached per description. `merge`
+    deduplicates a large, rarely changing corpus plus a small addition:
+    the deduplicated corpus and its lookup tables are kept for the
+    current corpus version only, and each result is a corpus-sized frame,
+    so only the last `cache_size` results are kept (enough for a request
+    to reuse what the previous one computed).
+    """
+
+    def __init__(self, threshold=0.8, cache_size=2, signature_cache_size=200000):
+        self.threshold = threshold
+        self.minhash = MinHasher()
+        self.cache_size = cache_size
+        self.signature_cache_size = signature_cache_size
+        self._results = OrderedDict()
+        # (base version, deduplicated base, its stats) for merge()
+        self._base = None
+        self._signatures = OrderedDict()
+        # (base version, lookup tables of that deduplicated base) for merge()
+        self._base_lookup = None
+        self._lock = threading.Lock()
+        self.jobs_seen = 0
+        self.duplicates_removed = 0
+
+    def _signature(self, description):
+        key = hashlib.sha1(description.encode("utf-8")).digest()
+        with self._lock:
+            if key in self._signatures:
+                self._signatures.move_to_end(key)
+                return self._signatures[key]
+        signature = self.minhash.signature(description)
+        with self._lock:
+            self._signatures[key] = signature
+            while len(self._signatures) > self.signature_cache_size:
+                self._signatures.popitem(last=False)
+        return signature
+
+    def _signature_matrix(self, descriptions):
+        """(positions with a signature, their signatures stacked)."""
+        signatures = [self._signature(d) if d else None for d in descriptions]
+        rows = np.array([position for position, signature in enumerate(signatures) if signature is not None], dtype=np.int64)
+        if not len(rows):
+            return rows, np.empty((0, self.minhash.bands * self.minhash.rows), dtype=np.uint32)
+        return rows, np.stack([signatures[position] for position in rows])
+
+    def _union_similar(self, sets, pairs, titles, title_words):
+        """Unions the (position, position) pairs whose titles are similar too."""
+        for a, b in pairs:
+            for position in (a, b):
+                if position not in title_words:
+                    title_words[position] = set(normalize(titles[position]).split())
+            if title_similarity(title_words[a], title_words[b]) >= 0.5:
+                sets.union(a, b)
+
+    def _union_exact(self, sets, jobs, offset=0, seen_urls=None, seen_postings=None):
+        """Unions rows sharing a canonical URL or posting key, with each other and with `seen_*` rows."""
+        seen_urls = {} if seen_urls is None else seen_urls
+        seen_postings = {} if seen_postings is None else seen_postings
+        for position, (url, title, company, location, description) in enumerate(
+                zip(jobs["url"].tolist(), jobs["title"].tolist(), jobs["company"].tolist(), jobs["location"].tolist(),
+                    jobs["description"].tolist()),
+                start=offset):
+            url = canonical_url(url)
+            if url:
+                sets.union(seen_urls.setdefault(url, position), position)
+            key = posting_key(title, company, location, description)
+            if key:
+                sets.union(seen_postings.setdefault(key, position), position)
+
+    def _similar_pairs(self, rows, matrix):
+        """
+        LSH: rows sharing any band hash are candidates; neighbours in each
+        band's sort order are compared. Returns the similar (position, position) pairs.
+        """
+        if len(rows) < 2:
+            return []
+        band_hashes = self.minhash.band_hashes(matrix)
+        first, second = [], []
+        for band in range(self.minhash.bands):
+            order = np.argsort(band_hashes[:, band], kind="stable")
+            same = band_hashes[order[1:], band] == band_hashes[order[:-1], band]
+            first.append(order[:-1][same])
+            second.append(order[1:][same])
+        first, second = np.concatenate(first), np.concatenate(second)
+        codes = np.unique(np.minimum(first, second) * len(rows) + np.maximum(first, second))
+        pairs = np.stack([codes // len(rows), codes % len(rows)], axis=1)
+        if not len(pairs):
+            return []
+        similar = (matrix[pairs[:, 0]] == matrix[pairs[:, 1]]).mean(axis=1) >= self.threshold
+        return [(int(rows[a]), int(rows[b])) for a, b in pairs[similar]]
+
+    def clusters(self, jobs):
+        """Cluster label (a row position) for every row of `jobs`."""
+        sets = DisjointSets(len(jobs))
+        self._union_exact(sets, jobs)
+        rows, matrix = self._signature_matrix(jobs["description"].tolist())
+        self._union_similar(sets, self._similar_pairs(rows, matrix), jobs["title"].tolist(), {})
+        return [sets.find(position) for position in range(len(jobs))]
+
+    def dedup(self, jobs, version=None):
+        """`jobs` with one row per cluster (the richest), and {"jobs", "unique", "dedup_rate"}."""
+        if version is not None:
+            with self._lock:
+                if version in self._results:
+                    self._results.move_to_end(version)
+                    return self._results[version]
+        ranked = richness(jobs)
+        ranked["label"] = self.clusters(jobs)
+        ranked = ranked.sort_values(
+            ["label", "filled", "skills", "length"], ascending=[True, False, False, False], kind="stable"
+        )
+        deduped = jobs.iloc[np.sort(ranked.drop_duplicates("label").index.to_numpy())]
+        stats = {
+            "jobs": len(jobs),
+            "unique": len(deduped),
+            "dedup_rate": round(1 - len(deduped) / len(jobs), 4) if len(jobs) else 0.0
+        }
+        with self._lock:
+            self.jobs_seen += len(jobs)
+            self.duplicates_removed += len(jobs) - len(deduped)
+            if version is not None:
+                self._results[version] = (deduped, stats)
+                while len(self._results) > self.cache_size:
+                    self._results.popitem(last=False)
+        return deduped, stats
+
+    def _lookup(self, base, base_version):
+        """URL, posting key and sorted band-hash tables of a deduplicated base, built once per version."""
+        with self._lock:
+            if self._base_lookup is not None and self._base_lookup[0] == base_version:
+                return self._base_lookup[1]
+        urls, postings = {}, {}
+        self._union_exact(DisjointSets(len(base)), base, seen_urls=urls, seen_postings=postings)
+        rows, matrix = self._signature_matrix(base["description"].tolist())
+        band_hashes = self.minhash.band_hashes(matrix)
+        order = np.argsort(band_hashes, axis=0, kind="stable")
+        lookup = {
+            "urls": urls, "postings": postings, "rows": rows, "matrix": matrix,
+            "order": order, "sorted": np.take_along_axis(band_hashes, order, axis=0)
+        }
+        with self._lock:
+            self._base_lookup = (base_version, lookup)
+        return lookup
+
+    def dedup_base(self, base, base_version):
+        """The deduplicated `base` of merge(), computed once per base version."""
+        with self._lock:
+            if self._base is not None and self._base[0] == base_version:
+                return self._base[1:]
+        deduped, stats = self.dedup(base)
+        with self._lock:
+            self._base = (base_version, deduped, stats)
+        return deduped, stats
+
+    def merge(self, base, extra, base_version, version=None, keep_base=False):
+        """
+        Same result as dedup(concat([base, extra])) up to which copy of a
+        posting spread over both is kept, for a large `base` identified by
+        `base_version` and a small `extra`. The base is deduplicated and
+        indexed once per base version; after that only `extra` is compared
+        against it (and against itself), so a new `version` costs in
+        proportion to len(extra). With `keep_base` a posting in both keeps
+        its dedup_base() record even when an `extra` copy is richer.
+        """
+        if version is not None:
+            with self._lock:
+                if version in self._results:
+                    self._results.move_to_end(version)
+                    return self._results[version]
+        base, base_stats = self.dedup_base(base, base_version)
+        lookup = self._lookup(base, base_version)
+        offset = len(base)
+        combined = pd.concat([base, extra])
+        sets = DisjointSets(len(combined))
+        self._union_exact(sets, extra, offset, ChainMap({}, lookup["urls"]), ChainMap({}, lookup["postings"]))
+
+        rows, matrix = self._signature_matrix(extra["description"].tolist())
+        pairs = [(a + offset, b + offset) for a, b in self._similar_pairs(rows, matrix)]
+        if len(rows) and len(lookup["rows"]):
+            band_hashes = self.minhash.band_hashes(matrix)
+            for position, signature, hashes in zip(rows, matrix, band_hashes):
+                matches = set()
+                for band, value in enumerate(hashes):
+                    column = lookup["sorted"][:, band]
+                    start, end = np.searchsorted(column, value, "left"), np.searchsorted(column, value, "right")
+                    matches.update(lookup["order"][start:end, band].tolist())
+                if matches:
+                    matches = np.fromiter(matches, dtype=np.int64, count=len(matches))
+                    similar = (lookup["matrix"][matches] == signature).mean(axis=1) >= self.threshold
+                    pairs.extend((int(lookup["rows"][match]), int(position) + offset) for match in matches[similar])
+        self._union_similar(sets, pairs, combined["title"].tolist(), {})
+
+        # Base rows only get merged through extra rows, so only clusters holding one change:
+        # keep their richest record
+        touched = set(range(offset, len(combined))) | sets.merged
+        touched = sorted(touched | {sets.find(position) for position in touched})
+        ranked = richness(combined.iloc[touched])
+        ranked["position"] = touched
+        ranked["label"] = [sets.find(position) for position in touched]
+        ranked["extra"] = [keep_base and position >= offset for position in touched]
+        ranked = ranked.sort_values(["label", "extra", "filled", "skills", "length", "position"],
+                                    ascending=[True, True, False, False, False, True], kind="stable")
+        keep = np.ones(len(combined), dtype=bool)
+        keep[touched] = False
+        keep[ranked.drop_duplicates("label")["position"].to_numpy(dtype=np.int64)] = True
+        deduped = combined[keep]
+        jobs = base_stats["jobs"] + len(extra)
+        stats = {
+            "jobs": jobs,
+            "unique": len(deduped),
+            "dedup_rate": round(1 - len(deduped) / jobs, 4) if jobs else 0.0
+        }
+        with self._lock:
+            self.jobs_seen += len(extra)
+            self.duplicates_removed += len(combined) - len(deduped)
+            if version is not None:
+                self._results[version] = (deduped, stats)
+                while len(self._results) > self.cache_size:
+                    self._results.popitem(last=False)
+        return deduped, stats
+
+    def stats(self):
+        with self._lock:
+            return {
+                "jobs_seen": self.jobs_seen,
+                "duplicates_removed": self.duplicates_removed,
+                "dedup_rate": round(self.duplicates_removed / self.jobs_seen, 4) if self.jobs_seen else None,
+                "cached_signatures": len(self._signatures)
+            }
@@ -0,0 +1,254 @@
+import threading
+from collections import Counter, OrderedDict
+
+from fuzzywuzzy import fuzz
+
+# score_jobs lists jobs whose title is this close to the role as fallback recommendations
+TITLE_FALLBACK_THRESHOLD = 60
+# score_jobs counts a user skill as present at this partial ratio
+SKILL_MATCH_THRESHOLD = 70
+# A job whose title scores 50 (no role, or untitled) has 25 of the 60 points it needs, and
+# 0.3 * location + 0.2 * skills must make up 35. With user skills it must match one of them
+# and score >= 50 on location (50 + 100% of skills); without, skills give 10 and location
+# must score >= 84
+SKILLED_LOCATION_THRESHOLD = 50
+LOCATION_ONLY_THRESHOLD = 84
+
+
+def _text(value):
+    """A field as score_jobs compares it: lowercased, missing values (None, NaN) empty."""
+    if value is None or value != value:
+        return ""
+    return str(value).lower()
+
+
+class _Postings:
+    """
+    Job ids per distinct term (title, skill or location), with the terms
+    matching a query memoized per query and kept up to date as terms come
+    and go.
+    """
+
+    def __init__(self, matches, cache_size):
+        self.matches = matches
+        self.cache_size = cache_size
+        self.ids = {}
+        self._queries = OrderedDict()
+
+    def add(self, term, job_id):
+        if term in self.ids:
+            self.ids[term].add(job_id)
+            return
+        self.ids[term] = {job_id}
+        for query, terms in self._queries.items():
+            if self.matches(query, term):
+                terms.add(term)
+
+    def discard(self, term, job_id):
+        ids = self.ids.get(term)
+        if ids is None:
+            return
+        ids.discard(job_id)
+        if not ids:
+            del self.ids[term]
+            for terms in self._queries.values():
+                terms.discard(term)
+
+    def matching(self, query):
+        """Distinct terms matching `query`, scanned once per query and then maintained by add/discard."""
+        terms = self._queries.get(query)
+        if terms is None:
+            terms = {term for term in self.ids if self.matches(query, term)}
+            self._queries[query] = terms
+            while len(self._queries) > self.cache_size:
+                self._queries.popitem(last=False)
+        self._queries.move_to_end(query)
+        return terms
+
+    def lookup(self, terms):
+        found = set()
+        for term in terms:
+            found |= self.ids.get(term, set())
+        return found
+
+
+class JobIndex:
+    """
+    In-process inverted index over job titles, skills and locations, used to
+    pick the jobs worth scoring for a user.
+
+    Queries are matched against the distinct terms with the scorer's own
+    rules, so the candidates are exactly the jobs the full scan could
+    recommend: with a role, the jobs with a matching title (at the fallback
+    threshold) plus untitled jobs that can still reach the threshold
+    through their skills and location; without a role, the jobs that can
+    reach it that way. Jobs are added, updated and removed one at a time
+    (or per source with `sync`), so the index never needs a rebuild as the
+    corpus changes.
+    """
+
+    def __init__(self, query_cache_size=256):
+        self._titles = _Postings(self._title_matches, query_cache_size)
+        self._skills = _Postings(self._skill_matches, query_cache_size)
+        self._locations = _Postings(self._location_matches, query_cache_size)
+        self._documents = {}
+        self._untitled = set()
+        # Jobs without extracted skills get skills inferred at scoring time, so any may match
+        self._skillless = set()
+        self._sources = {}
+        self._source_versions = {}
+        # Number of sources holding each synced id: a job scraped for two searches stays
+        # indexed until both have dropped it
+        self._holders = Counter()
+        self._lock = threading.RLock()
+        self.recall_checks = 0
+        self.recall_total = 0.0
+        self.recall_min = None
+
+    def __len__(self):
+        return len(self._documents)
+
+    def __contains__(self, job_id):
+        return job_id in self._documents
+
+    @staticmethod
+    def _title_matches(role, title):
+        """score_jobs' title rule, at the lower fallback threshold: the role is in the title or close to it."""
+        return role in title or fuzz.partial_ratio(role, title) >= TITLE_FALLBACK_THRESHOLD
+
+    @staticmethod
+    def _skill_matches(user_skill, skill):
+        return fuzz.partial_ratio(user_skill, skill) >= SKILL_MATCH_THRESHOLD
+
+    @staticmethod
+    def _location_matches(location, job_location):
+        return fuzz.partial_ratio(location, job_location) >= SKILLED_LOCATION_THRESHOLD
+
+    def add(self, job_id, title, skills, location):
+        """Indexes a job, replacing any previous version with the same id."""
+        skills = skills if isinstance(skills, (list, tuple)) else []
+        fields = (_text(title), tuple(dict.fromkeys(str(skill).lower() for skill in skills)), _text(location))
+        with self._lock:
+            if job_id in self._documents:
+                if self._documents[job_id] == fields:
+                    return
+                self.remove(job_id)
+            title_key, skill_keys, location_key = fields
+            if title_key:
+                self._titles.add(title_key, job_id)
+            else:
+                self._untitled.add(job_id)
+            for skill in skill_keys:
+                self._skills.add(skill, job_id)
+            if not skill_keys:
+                self._skillless.add(job_id)
+            self._locations.add(location_key, job_id)
+            self._documents[job_id] = fields
+
+    def remove(self, job_id):
+        with self._lock:
+            fields = self._documents.pop(job_id, None)
+            if fields is None:
+                return
+            title_key, skill_keys, location_key = fields
+            self._titles.discard(title_key, job_id)
+            for skill in skill_keys:
+                self._skills.discard(skill, job_id)
+            self._locations.discard(location_key, job_id)
+            self._untitled.discard(job_id)
+            self._skillless.discard(job_id)
+
+    def sync(self, source, jobs, version=None):
+        """
+        Makes the index hold exactly `jobs` ({job_id: (title, skills, location)})
+        for `source`: new and changed jobs are (re)indexed, jobs that
+        disappeared from the source are removed unless another source still
+        holds them. Unchanged jobs cost a lookup, and a source synced again
+        at the same `version` costs nothing.
+        """
+        with self._lock:
+            if version is not None and self._source_versions.get(source) == version:
+                return
+            self._source_versions[source] = version
+            previous = self._sources.get(source, set())
+            current = set(jobs)
+            for job_id in previous - current:
+                self._holders[job_id] -= 1
+                if self._holders[job_id] <= 0:
+                    del self._holders[job_id]
+                    self.remove(job_id)
+            for job_id in current - previous:
+                self._holders[job_id] += 1
+            for job_id, (title, skills, location) in jobs.items():
+                self.add(job_id, title, skills, location)
+            if current:
+                self._sources[source] = current
+            else:
+                self._sources.pop(source, None)
+                self._source_versions.pop(source, None)
+
+    def _profile_matches(self, user_skills, location):
+        """Ids of the jobs that reach the threshold with a neutral title score (see the thresholds above)."""
+        if user_skills:
+            found = set(self._skillless)
+            for user_skill in dict.fromkeys(user_skills):
+                if user_skill:
+                    found |= self._skills.lookup(self._skills.matching(user_skill))
+            if location:
+                found &= self._locations.lookup(self._locations.matching(location)) | self._locations.ids.get("", set())
+            return found
+        if location:
+            return self._locations.lookup(
+                job_location for job_location in self._locations.matching(location)
+                if job_location and fuzz.partial_ratio(location, job_location) >= LOCATION_ONLY_THRESHOLD
+            )
+        return set()
+
+    def candidates(self, preferred_role, skills, location):
+        """
+        Ids of the jobs that can reach the recommendation threshold.
+
+        With a role, a titled job needs a matching title to score >= 60
+        (the title carries half the weight), so those jobs are candidates,
+        and they are also the whole fallback list. Untitled jobs, and every
+        job without a role, score a neutral 50 on the title and are
+        candidates when their skills and location can make up the rest.
+        Without a role every job is also a fallback candidate, in corpus
+        order; the index does not know that order, so callers add the
+        leading jobs themselves (scoring.fallback_prefix).
+        """
+        role = (preferred_role or "").lower()
+        location = (location or "").lower()
+        with self._lock:
+            neutral = self._profile_matches(skills, location)
+            if not role:
+                return neutral
+            found = self._titles.lookup(self._titles.matching(role))
+            found |= neutral & self._untitled
+            return found
+
+    def record_recall(self, full_scan_ids, candidate_ids):
+        """
+        Records the share of the full-scan recommendations the candidate
+        path also returned. Returns that recall for this request.
+        """
+        full_scan_ids = set(full_scan_ids)
+        recall = len(full_scan_ids & set(candidate_ids)) / len(full_scan_ids) if full_scan_ids else 1.0
+        with self._lock:
+            self.recall_checks += 1
+            self.recall_total += recall
+            self.recall_min = recall if self.recall_min is None else min(self.recall_min, recall)
+        return recall
+
+    def stats(self):
+        with self._lock:
+            return {
+                "jobs": len(self._documents),
+                "titles": len(self._titles.ids),
+                "skills": len(self._skills.ids),
+                "locations": len(self._locations.ids),
+                "sources": len(self._sources),
+                "recall_checks": self.recall_checks,
+                "mean_recall": round(self.recall_total / self.recall_checks, 4) if self.recall_checks else None,
+                "min_recall": self.recall_min
+            }
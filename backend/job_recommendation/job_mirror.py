@@ -0,0 +1,295 @@
+import threading
+import time
+
+import pandas as pd
+
+
+def _timestamp(value):
+    """Seconds since the epoch for Firestore timestamps, datetimes or numbers."""
+    if value is None:
+        return None
+    if hasattr(value, "timestamp"):
+        return value.timestamp()
+    return float(value)
+
+
+class JobCorpusMirror:
+    """
+    In-memory copy of the Firestore `jobs` collection for the recommendation
+    service, with skills extracted once per description.
+
+    `start()` bulk-loads the collection, then follows it incrementally:
+    with mode="listener" through `collection.on_snapshot`, with
+    mode="watermark" by polling documents whose `updated_at` is at or after
+    the last one seen (deletes are not visible in that mode). A listener
+    that errors or stops is re-subscribed with exponential backoff, up to
+    `max_backoff` seconds between attempts; its first snapshot is compared
+    with the mirror, so documents deleted meanwhile are dropped. Only the
+    collection methods `stream`, `on_snapshot`, `where` and `order_by` are
+    used, so it runs unchanged against the Firestore emulator
+    (FIRESTORE_EMULATOR_HOST) or an in-memory fake with those methods.
+
+    Every applied change bumps `version`; `on_change(upserted, removed)`
+    callbacks let indexes and caches follow along without a rebuild.
+
+    `extract_batch` must not wait for a model that is still loading. When
+    `extractor_ready()` is false at extraction time the skills are taken
+    as provisional, and they are extracted again (a new version) by the
+    sync thread once it turns true.
+    """
+
+    def __init__(self, collection, to_job, extract_batch, columns, mode="listener",
+                 poll_interval=30, watermark_field="updated_at", max_backoff=300, extractor_ready=None):
+        self.collection = collection
+        self.to_job = to_job
+        self.extract_batch = extract_batch
+        self.extractor_ready = extractor_ready or (lambda: True)
+        self.columns = columns
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self.watermark_field = watermark_field
+        self.max_backoff = max_backoff
+        self.version = 0
+        self._jobs = {}
+        self._frame = None
+        self._frame_version = -1
+        self._callbacks = []
+        # ids of jobs whose skills were extracted before the extractor was ready
+        self._provisional = set()
+        self._lock = threading.RLock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._watch = None
+        self._listener_failed = False
+        self._restarts = 0
+        # (timestamp, raw field value, ids of the documents seen at that timestamp)
+        self._watermark = None
+        self._last_sync = None
+        self._last_lag = None
+        self._errors = 0
+
+    def on_change(self, callback):
+        """Registers `callback(upserted: {job_id: job}, removed: set)` for every applied change."""
+        self._callbacks.append(callback)
+        return callback
+
+    def apply(self, upserts, removals=(), read_time=None):
+        """
+        Applies changed documents ({doc_id: data}) and deleted doc ids.
+        Skills are only re-extracted for documents whose description changed.
+        """
+        jobs = {f"firestore:{doc_id}": self.to_job(doc_id, data) for doc_id, data in upserts.items()}
+        with self._lock:
+            to_extract = []
+            for job_id, job in jobs.items():
+                if job_id in self._jobs and self._jobs[job_id]["description"] == job["description"]:
+                    job["skills"] = self._jobs[job_id]["skills"]
+                else:
+                    to_extract.append(job_id)
+        provisional = bool(to_extract) and not self.extractor_ready()
+        extracted = self.extract_batch([jobs[job_id]["description"] for job_id in to_extract]) if to_extract else []
+        for job_id, skills in zip(to_extract, extracted):
+            jobs[job_id]["skills"] = skills
+
+        with self._lock:
+            # Replayed or re-polled documents that did not change are not a new version
+            jobs = {job_id: job for job_id, job in jobs.items() if self._jobs.get(job_id) != job}
+            removed = {f"firestore:{doc_id}" for doc_id in removals} & set(self._jobs)
+            for job_id in removed:
+                del self._jobs[job_id]
+            self._provisional -= removed
+            if provisional:
+                self._provisional.update(to_extract)
+            else:
+                self._provisional.difference_update(to_extract)
+            self._jobs.update(jobs)
+            if jobs or removed:
+                self.version += 1
+            self._last_sync = time.time()
+            read_time = _timestamp(read_time)
+            if read_time is not None:
+                self._last_lag = max(0.0, self._last_sync - read_time)
+        if jobs or removed:
+            for callback in self._callbacks:
+                callback(jobs, removed)
+
+    def reextract(self):
+        """Extracts the provisional skills again, now that the extractor is ready."""
+        with self._lock:
+            pending = {job_id: self._jobs[job_id]["description"] for job_id in self._provisional if job_id in self._jobs}
+        extracted = self.extract_batch(list(pending.values())) if pending else []
+        with self._lock:
+            changed = {}
+            for (job_id, description), skills in zip(pending.items(), extracted):
+                job = self._jobs.get(job_id)
+                if job is None or job["description"] != description:
+                    continue  # changed meanwhile; apply() already decided about it
+                self._provisional.discard(job_id)
+                if job["skills"] != skills:
+                    changed[job_id] = dict(job, skills=skills)
+            self._jobs.update(changed)
+            if changed:
+                self.version += 1
+        if changed:
+            print(f"🪞 Job mirror re-extracted skills of {len(pending)} jobs with the model (v{self.version})")
+            for callback in self._callbacks:
+                callback(changed, set())
+
+    def _track_watermark(self, documents):
+        for doc_id, data in documents.items():
+            stamp = _timestamp(data.get(self.watermark_field))
+            if stamp is None:
+                continue
+            if self._watermark is None or stamp > self._watermark[0]:
+                self._watermark = (stamp, data.get(self.watermark_field), {doc_id})
+            elif stamp == self._watermark[0]:
+                self._watermark[2].add(doc_id)
+
+    def load(self):
+        """Bulk-loads the whole collection."""
+        documents = {doc.id: doc.to_dict() for doc in self.collection.stream()}
+        self._track_watermark(documents)
+        self.apply(documents)
+        print(f"🪞 Job mirror loaded {len(documents)} jobs (v{self.version})")
+
+    def _on_snapshot(self, snapshot, changes, read_time, initial=False):
+        """
+        Applies a listener snapshot. The initial one of a subscription lists
+        the whole collection, so mirrored jobs missing from it were deleted
+        while no listener was running and are removed.
+        """
+        try:
+            upserts, removals = {}, []
+            for change in changes:
+                if change.type.name == "REMOVED":
+                    removals.append(change.document.id)
+                else:
+                    upserts[change.document.id] = change.document.to_dict()
+            if initial:
+                present = {document.id for document in snapshot} if snapshot is not None else set(upserts)
+                with self._lock:
+                    removals.extend(job_id.split(":", 1)[1] for job_id in self._jobs
+                                    if job_id.split(":", 1)[1] not in present)
+            self.apply(upserts, removals, read_time=read_time)
+        except Exception as e:
+            self._errors += 1
+            self._listener_failed = True
+            print(f"❌ Job mirror snapshot error: {e}")
+
+    def _subscription_callback(self):
+        """on_snapshot callback of one subscription; only its first snapshot is the initial one."""
+        first = threading.Event()
+
+        def callback(snapshot, changes, read_time):
+            initial = not first.is_set()
+            first.set()
+            self._on_snapshot(snapshot, changes, read_time, initial=initial)
+        return callback
+
+    def poll(self):
+        """
+        Fetches documents updated at or after the watermark (watermark mode).
+        `>=` catches documents written later with the watermark's own
+        timestamp; the ones already seen at that timestamp are skipped.
+        """
+        query = self.collection
+        if self._watermark is not None:
+            query = query.where(self.watermark_field, ">=", self._watermark[1])
+        documents = {doc.id: doc.to_dict() for doc in query.order_by(self.watermark_field).stream()}
+        if self._watermark is not None:
+            stamp, _, seen = self._watermark
+            documents = {
+                doc_id: data for doc_id, data in documents.items()
+                if not (doc_id in seen and _timestamp(data.get(self.watermark_field)) == stamp)
+            }
+        self._track_watermark(documents)
+        self.apply(documents)
+
+    def _listen(self):
+        """
+        (Re)subscribes the listener; it replays every document first, unchanged
+        ones are not re-extracted and ones no longer there are removed.
+        """
+        if self._watch is not None:
+            try:
+                self._watch.unsubscribe()
+            except Exception as e:
+                print(f"⚠️ Job mirror listener unsubscribe failed: {e}")
+        self._listener_failed = False
+        self._watch = self.collection.on_snapshot(self._subscription_callback())
+
+    def listener_healthy(self):
+        # Firestore's Watch reports is_active; a callback error marks it failed here
+        return (self._watch is not None and not self._listener_failed
+                and getattr(self._watch, "is_active", True) is not False)
+
+    def _run(self):
+        backoff = 1
+        while not self._stop.is_set():
+            delay = self.poll_interval
+            try:
+                if not self._ready.is_set():
+                    self.load()
+                    self._ready.set()
+                    if self.mode == "listener":
+                        self._listen()
+                elif self.mode == "listener":
+                    if self.listener_healthy():
+                        backoff = 1
+                    else:
+                        # Restarts that keep failing are spaced out 1, 2, 4, ... max_backoff seconds
+                        self._restarts += 1
+                        print(f"🔁 Job mirror listener stopped, re-subscribing (restart {self._restarts})")
+                        self._listen()
+                        delay = backoff
+                        backoff = min(backoff * 2, self.max_backoff)
+                else:
+                    self.poll()
+                    backoff = 1
+                if self._provisional and self.extractor_ready():
+                    self.reextract()
+            except Exception as e:
+                self._errors += 1
+                print(f"❌ Job mirror sync error: {e}, retrying in {backoff}s")
+                delay = backoff
+                backoff = min(backoff * 2, self.max_backoff)
+            self._stop.wait(delay)
+
+    def start(self):
+        threading.Thread(target=self._run, name="job-mirror", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._watch is not None:
+            self._watch.unsubscribe()
+
+    def wait_until_ready(self, timeout):
+        return self._ready.wait(timeout)
+
+    def frame(self):
+        """The mirrored jobs as a DataFrame indexed by job id, rebuilt only when the version changes."""
+        with self._lock:
+            if self._frame_version != self.version:
+                self._frame = pd.DataFrame(list(self._jobs.values()), columns=self.columns, index=list(self._jobs))
+                self._frame_version = self.version
+            return self._frame
+
+    def versioned_frame(self):
+        """(version, frame()) read together, so the version names exactly those jobs."""
+        with self._lock:
+            return self.version, self.frame()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "ready": self._ready.is_set(),
+                "version": self.version,
+                "jobs": len(self._jobs),
+                "sync_lag_seconds": round(self._last_lag, 3) if self._last_lag is not None else None,
+                "last_sync_age_seconds": round(time.time() - self._last_sync, 1) if self._last_sync else None,
+                "errors": self._errors,
+                "listener_restarts": self._restarts,
+                "provisional_skills": len(self._provisional)
+            }
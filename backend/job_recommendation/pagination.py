@@ -0,0 +1,110 @@
+import base64
+import secrets
+
+import numpy as np
+
+from result_cache import MemoryBackend
+from scoring import rank_positions
+
+# Fields of a job in paginated responses unless the description is asked for
+COMPACT_FIELDS = ("title", "company", "location", "url", "source", "skills")
+
+
+def project(jobs, job_ids, match_scores, include_description=False):
+    """
+    Records of the given job ids (rows of `jobs`, indexed by job id) with
+    their match scores, compact unless `include_description`. Ids no longer
+    in `jobs` are left out.
+    """
+    fields = list(COMPACT_FIELDS) + (["description"] if include_description else [])
+    if not jobs.index.is_unique:
+        jobs = jobs[~jobs.index.duplicated()]
+    found = [(job_id, match_score) for job_id, match_score in zip(job_ids, match_scores) if job_id in jobs.index]
+    page = jobs.loc[[job_id for job_id, _ in found]]
+    records = page[[field for field in fields if field in page.columns]].to_dict(orient="records")
+    for (job_id, match_score), record in zip(found, records):
+        record["id"] = job_id
+        record["match_score"] = match_score
+    return records
+
+
+def encode_cursor(ranking_id, offset):
+    return base64.urlsafe_b64encode(f"{ranking_id}:{offset}".encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """(ranking_id, offset) of a cursor; raises ValueError for a malformed one."""
+    try:
+        ranking_id, offset = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8").split(":")
+        offset = int(offset)
+    except Exception:
+        raise ValueError(f"Malformed cursor {cursor!r}")
+    if offset < 0:
+        raise ValueError(f"Malformed cursor {cursor!r}")
+    return ranking_id, offset
+
+
+class RankingPages:
+    """
+    Scored rankings kept for `ttl` seconds so later pages are cut from the
+    same scores: no new scrape, no rescoring, and the order cannot shift
+    under the user while they page. A ranking only keeps the ranked job
+    ids and match scores; `lookup(job_ids, context)` returns the current
+    rows of those jobs (a DataFrame indexed by job id) when a page is
+    served, with `context` as given to first_page. Pages hold 1 to
+    `max_limit` jobs and cover the best `window` jobs of a ranking, which
+    are all that is ranked.
+    """
+
+    def __init__(self, lookup, ttl=900, capacity=1000, max_limit=100, window=1000):
+        self.lookup = lookup
+        self.ttl = ttl
+        self.max_limit = max_limit
+        self.window = max(window, max_limit)
+        self._rankings = MemoryBackend(capacity)
+
+    def _check_limit(self, limit):
+        if not 1 <= limit <= self.max_limit:
+            raise ValueError(f"limit must be from 1 to {self.max_limit}")
+
+    def _page(self, ranking_id, ranking, offset, limit, include_description, jobs=None):
+        job_ids = ranking["job_ids"][offset:offset + limit]
+        match_scores = ranking["match_scores"][offset:offset + limit].tolist()
+        if jobs is None:
+            jobs = self.lookup(job_ids, ranking["context"])
+        total = len(ranking["job_ids"])
+        next_offset = offset + limit
+        return {
+            "jobs": project(jobs, job_ids, match_scores, include_description),
+            "total": total,
+            "fallback": ranking["fallback"],
+            "next_cursor": encode_cursor(ranking_id, next_offset) if next_offset < total else None
+        }
+
+    def first_page(self, uid, jobs, scores, limit, include_description=False, context=None, **rank_options):
+        """Ranks the best `window` of `jobs` by `scores` (score_jobs output), stores the ranking and returns its first page."""
+        self._check_limit(limit)
+        positions, match_scores, used_fallback = rank_positions(jobs, scores, limit=self.window, **rank_options)
+        ranking_id = secrets.token_urlsafe(9)
+        ranking = {
+            "uid": uid,
+            "job_ids": jobs.index[positions].to_numpy(dtype=object),
+            "match_scores": np.asarray(match_scores, dtype=float),
+            "fallback": used_fallback,
+            "context": context
+        }
+        self._rankings.set(ranking_id, ranking, self.ttl)
+        return self._page(ranking_id, ranking, 0, limit, include_description, jobs=jobs.iloc[positions[:limit]])
+
+    def next_page(self, uid, cursor, limit, include_description=False):
+        """
+        The page a cursor points to, or None when its ranking expired or
+        belongs to another user. Raises ValueError for a malformed cursor
+        or a limit out of range.
+        """
+        self._check_limit(limit)
+        ranking_id, offset = decode_cursor(cursor)
+        ranking = self._rankings.get(ranking_id)
+        if ranking is None or ranking["uid"] != uid:
+            return None
+        return self._page(ranking_id, ranking, offset, limit, include_description)
@@ -1,13 +1,36 @@
+import time
+_import_started = time.time()
+
 import os
-from flask import Flask, jsonify
+import sys
+import random
+import hashlib
+import json
+import threading
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
 from google.cloud import firestore
 from jobspy import scrape_jobs
 import pandas as pd
-from transformers import AutoTokenizer, AutoModelForTokenClassification
-from transformers import pipeline
 from fuzzywuzzy import fuzz
-import re
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.skill_matcher import SkillMatcher
+from common.extraction_cache import ExtractionCache
+from common.model_manager import ModelManager, load_ner, warmup_ner
+from common.skill_warehouse import DEFAULT_WAREHOUSE_PATH, SkillWarehouse
+from common.scrape_orchestrator import create_orchestrator
+from scrape_refresher import ScrapeRefresher, search_key
+from scoring import fallback_prefix, score_jobs, rank_jobs, location_scores, LOCATION_WEIGHT
+from job_index import JobIndex
+from job_mirror import JobCorpusMirror
+from semantic_index import SemanticJobIndex
+from result_cache import create_result_cache
+from dedup import JobDeduplicator
+from pagination import RankingPages
 
 app = Flask(__name__)
 CORS(app)
@@ -20,12 +43,11 @@ print("✅ Google credentials set")
 db = firestore.Client()
 print("✅ Firestore initialized")
 
-# Load Named Entity Recognition (NER) model for extracting skills
-model_name = "dslim/bert-base-NER"
-tokenizer = AutoTokenizer.from_pretrained(model_name)
-model = AutoModelForTokenClassification.from_pretrained(model_name)
-ner_pipeline = pipeline("ner", model=model, tokenizer=tokenizer)
-print("✅ Hugging Face modules imported")
+# Named Entity Recognition (NER) model for extracting skills, loaded and warmed up
+# in the background; a BatchedNER batches it over all descriptions of a request
+ner_model = ModelManager("dslim/bert-base-NER", load_ner, warmup_ner, started=_import_started).start()
+# Seconds a request waits for the NER model before extracting with patterns only
+MODEL_WAIT_TIMEOUT = float(os.environ.get("MODEL_WAIT_TIMEOUT", "2"))
 
 # Define common technical skills for better extraction
 COMMON_SKILLS = [
@@ -57,38 +79,22 @@ COMMON_SKILLS = [
     "security", "oauth", "jwt", "websockets", "testing", "ui/ux"
 ]
 
-def extract_skills_from_text(description):
+# Compiled once: one scan finds every skill and its ".js", dotted and spaced spellings
+skill_matcher = SkillMatcher(COMMON_SKILLS)
+
+def extract_skills_from_text(description, ner_results=None):
     """
     Enhanced function to extract skills from job descriptions.
+    `ner_results` can carry entities already computed by the batched NER model for this description.
     """
     if not description or not isinstance(description, str):
         return []
     
     description = description.lower()
-    found_skills = []
-    
-    # First pass: Check for exact matches with word boundaries
-    for skill in COMMON_SKILLS:
-        pattern = r'\b' + re.escape(skill) + r'\b'
-        if re.search(pattern, description):
-            found_skills.append(skill)
     
-    # Second pass: Check for skills with variations (e.g., "React.js" vs "React")
-    for skill in COMMON_SKILLS:
-        if skill not in found_skills:
-            # Handle cases like "react.js", "react js", etc.
-            variations = [
-                skill.replace(".", " "),
-                skill.replace(" ", "."),
-                skill.replace(".", ""),
-                skill + ".js" if not skill.endswith(".js") and not skill.endswith(" js") else skill
-            ]
-            
-            for variation in variations:
-                pattern = r'\b' + re.escape(variation) + r'\b'
-                if re.search(pattern, description):
-                    found_skills.append(skill)  # Add the standardized version
-                    break
+    # First and second pass: exact matches with word boundaries, then variations
+    # (e.g., "React.js" vs "React") mapped back to the standardized skill
+    found_skills = skill_matcher.find_skills(description)
     
     # Third pass: Check for skills mentioned in context
     skill_contexts = {
@@ -105,9 +111,11 @@ def extract_skills_from_text(description):
                     found_skills.append(context_skill)
                     break
     
-    # Use NER as a backup for any remaining skills
+    # Use NER as a backup for any remaining skills (skipped while the model is loading)
     try:
-        ner_results = ner_pipeline(description[:512])  # Limit text length to avoid errors
+        if ner_results is None:
+            batched_ner = ner_model.get(MODEL_WAIT_TIMEOUT)
+            ner_results = batched_ner([description])[0] if batched_ner else []
         for entity in ner_results:
             if entity["entity"].startswith("B-") or entity["entity"].startswith("I-"):
                 skill = entity["word"].replace("##", "").lower()  # Clean word tokens
@@ -121,6 +129,52 @@ def extract_skills_from_text(description):
     
     return found_skills
 
+# Bump whenever extract_skills_from_text changes so cached results are not reused
+EXTRACTOR_VERSION = "2"
+
+# Extraction results keyed by description hash: LRU in memory, SQLite on disk
+extraction_cache = ExtractionCache(
+    os.environ.get("EXTRACTION_CACHE_PATH", "extraction_cache.sqlite3"),
+    EXTRACTOR_VERSION,
+    capacity=int(os.environ.get("EXTRACTION_CACHE_SIZE", "10000"))
+)
+
+def extract_skills_batch(descriptions, wait=None):
+    """
+    extract_skills_from_text for all descriptions of a request, served from
+    the extraction cache when a description was seen before. Cache misses
+    share one batched NER pass instead of running the model job by job.
+    Waits up to `wait` seconds for the NER model (None: until it has loaded);
+    without it, misses are extracted with patterns only and not cached.
+    """
+    skills_by_description = {}
+    misses = []
+    for description in dict.fromkeys(d for d in descriptions if d and isinstance(d, str)):
+        skills = extraction_cache.get(description)
+        if skills is None:
+            misses.append(description)
+        else:
+            skills_by_description[description] = skills
+
+    if misses:
+        batched_ner = ner_model.get(wait)
+        try:
+            ner_batches = batched_ner([description.lower() for description in misses]) if batched_ner else None
+        except Exception as e:
+            print(f"NER extraction error: {e}")
+            ner_batches = None
+        for position, description in enumerate(misses):
+            ner_results = ner_batches[position] if ner_batches is not None else []
+            skills = extract_skills_from_text(description, ner_results=ner_results)
+            if ner_batches is not None:
+                extraction_cache.put(description, skills)
+            skills_by_description[description] = skills
+
+    return [
+        list(skills_by_description.get(description, [])) if isinstance(description, str) else []
+        for description in descriptions
+    ]
+
 def extract_skills_from_title(title):
     """Extract likely skills from job title"""
     if not title or not isinstance(title, str):
@@ -158,116 +212,263 @@ def fuzzy_match(text1, text2, threshold=60):
         return False
     return fuzz.partial_ratio(str(text1).lower(), str(text2).lower()) >= threshold
 
-@app.route('/api/recommend_jobs/<uid>', methods=['GET'])
-def recommend_jobs(uid):
+JOB_COLUMNS = ["title", "company", "location", "description", "url", "skills", "source"]
+
+def scraped_job_ids(jobs):
+    """Stable ids for scraped jobs: the URL, else a hash of title, company and location."""
+    ids, seen = [], {}
+    for title, company, location, url in zip(jobs["title"], jobs["company"], jobs["location"], jobs["url"]):
+        job_id = "scraped:" + (url or hashlib.sha1(f"{title}|{company}|{location}".encode("utf-8")).hexdigest())
+        seen[job_id] = seen.get(job_id, 0) + 1
+        ids.append(job_id if seen[job_id] == 1 else f"{job_id}#{seen[job_id]}")
+    return ids
+
+def scrape_and_process_jobs(search_term, location, orchestrator=None):
     """
-    Fetches jobs from Firestore and scraped data, extracts skills dynamically,
-    then filters jobs based on user's preferences and skills using fuzzy matching.
+    Scrapes jobs for a role and location with `jobspy` (one concurrent call per site,
+    each with its own deadline) and extracts their skills.
+    Runs on the scrape refresher's background threads, never inside a request.
+    Raises ScrapeFailed when no job board answered, so the refresher keeps
+    serving the previous snapshot instead of an empty one.
     """
-    print(f"Received UID: {uid}")
-    # Fetch user preferences from Firestore
+    results_wanted = 20  # Fetch 20 jobs
+
+    result = (orchestrator or scrape_orchestrator).scrape_answered(
+        ["indeed", "linkedin"],
+        search_term=search_term,
+        location=location,
+        results_wanted=results_wanted,
+        hours_old=72,
+        country_indeed="India",
+        delay=1.5,  # Slightly longer delay to avoid rate limiting
+        detailed=True,  # Request detailed information
+        proxy=None,     # Set to a proxy if needed
+        return_as="dataframe"
+    )
+    scraped_jobs = result.jobs
+    print(f"🕵️ Scraped Jobs Fetched: {len(scraped_jobs)}")
+    
+    # Clean and prepare scraped jobs - improved handling
+    # Replace NaN values with empty strings but preserve lists
+    for col in scraped_jobs.columns:
+        if col != "skills":  # Don't convert skills column if it's already a list
+            scraped_jobs[col] = scraped_jobs[col].apply(
+                lambda x: "" if pd.isna(x) else str(x)
+            )
+    
+    # Extract skills from job descriptions (one batched NER pass for uncached ones)
+    scraped_skills = extract_skills_batch(
+        scraped_jobs["description"].tolist() if "description" in scraped_jobs.columns else [""] * len(scraped_jobs)
+    )
+    
+    # Process each job to extract skills and create a consistent format
+    processed_jobs = []
+    for (_, job), job_skills in zip(scraped_jobs.iterrows(), scraped_skills):
+        job_description = job.get("description", "")
+        job_title = job.get("title", "")
+        
+        # Ensure URL is properly extracted and not empty
+        job_url = job.get("url", "")
+        if pd.isna(job_url) or job_url == "":
+            # Try to extract from other fields if available
+            job_url = job.get("job_url", job.get("link", job.get("apply_link", "")))
+        
+        # If job has no skills extracted, try to extract from title
+        if not job_skills:
+            job_skills = extract_skills_from_title(job_title)
+        
+        processed_jobs.append({
+            "title": job_title,
+            "company": job.get("company", ""),
+            "location": job.get("location", ""),
+            "description": job_description,
+            "url": job_url,
+            "skills": job_skills,
+            "source": "scraped"
+        })
+    
+    processed_jobs_df = pd.DataFrame(processed_jobs, columns=JOB_COLUMNS)
+    processed_jobs_df.index = scraped_job_ids(processed_jobs_df)
+    sites = scraped_jobs["site"].tolist() if "site" in scraped_jobs.columns else [None] * len(processed_jobs_df)
+    skill_warehouse.record("job_recommendation", search_term, location, [
+        {
+            "posting_id": job_id,
+            "skills": job["skills"],
+            "site": site or None,
+            "title": job["title"],
+            "company": job["company"],
+            "location": job["location"],
+            "url": job["url"]
+        }
+        for (job_id, job), site in zip(processed_jobs_df.iterrows(), sites)
+    ])
+    return processed_jobs_df
+
+def tracked_search_keys():
+    """(preferred_role, location) pairs of all users, to keep their scrapes warm."""
+    for user_doc in db.collection('users').select(["preferred_role", "location"]).stream():
+        user_data = user_doc.to_dict()
+        yield user_data.get("preferred_role", ""), user_data.get("location", "")
+
+# Scrapes each job board on its own thread with its own deadline and retries, so a slow
+# board only costs its own results
+scrape_orchestrator = create_orchestrator(scrape_jobs)
+
+# Scraped jobs and their skills, kept for historical trend queries (served by the skill
+# analysis service); written in batches by a background thread
+skill_warehouse = SkillWarehouse(
+    os.environ.get("SKILL_WAREHOUSE_PATH", DEFAULT_WAREHOUSE_PATH),
+    flush_interval=float(os.environ.get("SKILL_WAREHOUSE_FLUSH_INTERVAL", "5"))
+).start()
+
+# Scrapes every role/location pair in the background; requests only read snapshots
+scrape_refresher = ScrapeRefresher(
+    scrape_and_process_jobs,
+    interval=int(os.environ.get("SCRAPE_REFRESH_INTERVAL", "3600")),
+    max_age=int(os.environ.get("SCRAPE_MAX_AGE", "21600")),
+    track_ttl=int(os.environ.get("SCRAPE_TRACK_TTL", "604800")),
+    seed=tracked_search_keys
+).start()
+
+# Title/skill/location postings of every known job, to score only plausible candidates
+job_index = JobIndex()
+JOB_INDEX_RECALL_SAMPLE = float(os.environ.get("JOB_INDEX_RECALL_SAMPLE", "0.05"))
+
+# Dense title/description vectors for the semantic ranking mode (?mode=semantic), kept
+# up to date from the mirror and scrape refresh threads; SEMANTIC_MODE=off skips all of it
+SEMANTIC_MODE_ENABLED = os.environ.get("SEMANTIC_MODE", "on").lower() != "off"
+SEMANTIC_MAX_K = int(os.environ.get("SEMANTIC_MAX_K", "200"))
+semantic_index = SemanticJobIndex(
+    os.environ.get("SEMANTIC_INDEX_PATH", "semantic_index.pkl"),
+    model_name=os.environ.get("SEMANTIC_MODEL", "all-MiniLM-L6-v2")
+).autosave(int(os.environ.get("SEMANTIC_INDEX_SAVE_INTERVAL", "60"))) if SEMANTIC_MODE_ENABLED else None
+
+@scrape_refresher.on_refresh
+def index_snapshot_semantically(key, snapshot):
+    if semantic_index is None:
+        return
+    jobs = snapshot.jobs if snapshot is not None else pd.DataFrame(columns=JOB_COLUMNS)
+    semantic_index.sync(("scraped",) + key, {
+        job_id: (title, description)
+        for job_id, title, description in zip(jobs.index, jobs["title"], jobs["description"])
+    }, version=snapshot.version if snapshot is not None else None)
+
+def firestore_job(doc_id, job_data):
+    """A Firestore job document in the shape used for scoring (skills are filled in by the mirror)."""
+    return {
+        "title": job_data.get("job_title", ""),
+        "company": job_data.get("company", ""),
+        "location": job_data.get("location", ""),
+        "description": job_data.get("description", ""),
+        "url": job_data.get("url", ""),
+        "skills": [],
+        "source": "firestore"
+    }
+
+# Local copy of the `jobs` collection with extracted skills, updated incrementally. It does
+# not wait for the NER model: skills are pattern-only until the model is up, then re-extracted
+job_mirror = JobCorpusMirror(
+    db.collection('jobs'),
+    firestore_job,
+    lambda descriptions: extract_skills_batch(descriptions, wait=0),
+    JOB_COLUMNS,
+    mode=os.environ.get("JOB_MIRROR_MODE", "listener"),
+    poll_interval=int(os.environ.get("JOB_MIRROR_POLL_INTERVAL", "30")),
+    max_backoff=int(os.environ.get("JOB_MIRROR_MAX_BACKOFF", "300")),
+    extractor_ready=lambda: ner_model.ready
+)
+JOB_MIRROR_READY_TIMEOUT = float(os.environ.get("JOB_MIRROR_READY_TIMEOUT", "5"))
+
+@job_mirror.on_change
+def index_mirrored_jobs(upserted, removed):
+    for job_id in removed:
+        job_index.remove(job_id)
+    for job_id, job in upserted.items():
+        job_index.add(job_id, job["title"], job["skills"], job["location"])
+    if semantic_index is None:
+        return
+    semantic_index.remove(removed)
+    semantic_index.add({job_id: (job["title"], job["description"]) for job_id, job in upserted.items()})
+
+job_mirror.start()
+
+def index_jobs(source, jobs, version=None):
+    """Brings the job index in line with `jobs` (indexed by job id) for one source."""
+    job_index.sync(source, {
+        job_id: (title, skills, location)
+        for job_id, title, skills, location in zip(jobs.index, jobs["title"], jobs["skills"], jobs["location"])
+    }, version=version)
+
+def scoring_skills_for(jobs):
+    """Skills used for scoring each job: extracted ones, else a retry on title + description, else title-inferred."""
+    # Jobs with no skills extracted are retried on title + description, in one batch
+    retry_positions = [position for position, skills in enumerate(jobs["skills"]) if not skills]
+    retry_skills = dict(zip(retry_positions, extract_skills_batch([
+        str(jobs["title"].iloc[position]).lower() + " " + str(jobs["description"].iloc[position])
+        for position in retry_positions
+    ], wait=MODEL_WAIT_TIMEOUT)))
+
+    scoring_skills = []
+    for position, (title, skills) in enumerate(zip(jobs["title"], jobs["skills"])):
+        job_skills = [str(s).lower() for s in skills]
+        if not job_skills:
+            job_skills = retry_skills[position] or extract_skills_from_title(str(title).lower())
+        scoring_skills.append(job_skills)
+    return scoring_skills
+
+def score_for_user(jobs, preferred_role, user_skills, location, job_skills=None):
+    """score_jobs output for `jobs` and one user (title 50%, location 30%, skills 20%)."""
+    scoring_skills = job_skills if job_skills is not None else scoring_skills_for(jobs)
+    return score_jobs(jobs, preferred_role, user_skills, location, job_skills=scoring_skills)
+
+def rank_for_user(jobs, preferred_role, user_skills, location, job_skills=None, **rank_options):
+    """Scores `jobs` for a user and returns (recommendations, used_fallback)."""
+    # Keep jobs scoring >= 60, falling back to jobs that at least match the role when fewer than 5 qualify
+    scores = score_for_user(jobs, preferred_role, user_skills, location, job_skills=job_skills)
+    return rank_jobs(jobs, scores, **rank_options)
+
+def recommendation_keys(recommendations):
+    return {(job.get("url", ""), job.get("title", ""), job.get("company", "")) for job in recommendations}
+
+def user_profile(uid):
+    """(preferred_role, skills, location) of a user, lowercased, or None if the user does not exist."""
     user_ref = db.collection('users').document(uid)
     user_doc = user_ref.get()
 
     if not user_doc.exists:
         print(f"❌ User {uid} not found in Firestore")
-        return jsonify({"error": "User not found"}), 404
+        return None
 
     user_data = user_doc.to_dict()
     print(f"🔍 User Data: {user_data}")
+    return profile_from_user_data(user_data)
 
+def profile_from_user_data(user_data):
     preferred_role = user_data.get("preferred_role", "").lower()
     user_skills = [skill.lower() for skill in user_data.get("skills", [])]
     location = user_data.get("location", "").lower()
+    return preferred_role, user_skills, location
 
-    # ✅ Fetch jobs from Firestore
-    jobs_ref = db.collection('jobs')
-    job_docs = jobs_ref.stream()
-    
-    firestore_jobs = []
-    for job_doc in job_docs:
-        job_data = job_doc.to_dict()
-        
-        # Extract skills from job description
-        job_skills = extract_skills_from_text(job_data.get("description", ""))
-        
-        firestore_jobs.append({
-            "title": job_data.get("job_title", ""),
-            "company": job_data.get("company", ""),
-            "location": job_data.get("location", ""),
-            "description": job_data.get("description", ""),
-            "url": job_data.get("url", ""),
-            "skills": job_skills,
-            "source": "firestore"
-        })
-    
-    firestore_jobs_df = pd.DataFrame(firestore_jobs)
-    print(f"🔥 Firestore Jobs Fetched: {len(firestore_jobs_df)}")
-
-    # ✅ Fetch jobs dynamically using `jobspy`
-    search_term = preferred_role if preferred_role else "software engineer"
-    results_wanted = 20  # Fetch 20 jobs
-
-    try:
-        scraped_jobs = scrape_jobs(
-            site_name=["indeed", "linkedin"],
-            search_term=search_term,
-            location=location if location else "India",
-            results_wanted=results_wanted,
-            hours_old=72,
-            country_indeed="India",
-            delay=1.5,  # Slightly longer delay to avoid rate limiting
-            detailed=True,  # Request detailed information
-            proxy=None,     # Set to a proxy if needed
-            return_as="dataframe"
-        )
-        print(f"🕵️ Scraped Jobs Fetched: {len(scraped_jobs)}")
-        
-        # Clean and prepare scraped jobs - improved handling
-        # Replace NaN values with empty strings but preserve lists
-        for col in scraped_jobs.columns:
-            if col != "skills":  # Don't convert skills column if it's already a list
-                scraped_jobs[col] = scraped_jobs[col].apply(
-                    lambda x: "" if pd.isna(x) else str(x)
-                )
-        
-        # Process each job to extract skills and create a consistent format
-        processed_jobs = []
-        for _, job in scraped_jobs.iterrows():
-            job_description = job.get("description", "")
-            job_title = job.get("title", "")
-            
-            # Ensure URL is properly extracted and not empty
-            job_url = job.get("url", "")
-            if pd.isna(job_url) or job_url == "":
-                # Try to extract from other fields if available
-                job_url = job.get("job_url", job.get("link", job.get("apply_link", "")))
-            
-            # Extract skills from job description
-            job_skills = extract_skills_from_text(job_description)
-            
-            # If job has no skills extracted, try to extract from title
-            if not job_skills:
-                job_skills = extract_skills_from_title(job_title)
-            
-            processed_jobs.append({
-                "title": job_title,
-                "company": job.get("company", ""),
-                "location": job.get("location", ""),
-                "description": job_description,
-                "url": job_url,
-                "skills": job_skills,
-                "source": "scraped"
-            })
-        
-        scraped_jobs_df = pd.DataFrame(processed_jobs)
+def mirrored_firestore_jobs(wait=JOB_MIRROR_READY_TIMEOUT):
+    """(mirror version, Firestore jobs) from the local mirror, kept in sync in the background."""
+    if not job_mirror.wait_until_ready(wait):
+        print("⏳ Job mirror still loading, using the jobs mirrored so far")
+    mirror_version, firestore_jobs_df = job_mirror.versioned_frame()
+    print(f"🔥 Firestore Jobs from mirror v{mirror_version}: {len(firestore_jobs_df)}")
+    return mirror_version, firestore_jobs_df
 
-    except Exception as e:
-        print(f"❌ Error while scraping jobs: {e}")
-        scraped_jobs_df = pd.DataFrame(columns=["title", "company", "location", "description", "url", "skills", "source"])
+def snapshot_jobs(snapshot):
+    """Scraped jobs of a background snapshot, indexed for candidate retrieval."""
+    if snapshot is None:
+        print("⏳ No scrape snapshot yet for this role and location, refresh queued")
+        return pd.DataFrame(columns=JOB_COLUMNS)
+    print(f"🕵️ Scraped Jobs from snapshot v{snapshot.version}: {len(snapshot.jobs)}")
+    index_jobs(("scraped",) + snapshot.key, snapshot.jobs, version=snapshot.version)
+    return snapshot.jobs
 
-    # ✅ Combine Firestore and Scraped Jobs
-    all_jobs = pd.concat([firestore_jobs_df, scraped_jobs_df], ignore_index=True)
+def combine_jobs(frames):
+    """Concatenates job frames (indexed by job id) and fills missing values."""
+    all_jobs = pd.concat(frames)
     
     # Fill missing values
     all_jobs["skills"] = all_jobs["skills"].apply(lambda x: x if isinstance(x, list) else [])
@@ -276,97 +477,515 @@ def recommend_jobs(uid):
     all_jobs["company"] = all_jobs["company"].fillna("")
     all_jobs["description"] = all_jobs["description"].fillna("")
     all_jobs["url"] = all_jobs["url"].fillna("")
+    return all_jobs
 
-    print(f"📊 Total Jobs Available: {len(all_jobs)}")
+# Collapses the same posting listed on several boards and in Firestore
+job_deduplicator = JobDeduplicator()
 
-    # ✅ Scoring and filtering jobs based on user preferences
-    scored_jobs = []
-    for _, job in all_jobs.iterrows():
-        job_title = str(job.get("title", "")).lower()
-        job_location = str(job.get("location", "")).lower()
-        job_skills = [str(s).lower() for s in job.get("skills", [])]
-        
-        # If job has no skills extracted, try to extract from title and description
-        if not job_skills:
-            job_skills = extract_skills_from_text(job_title + " " + str(job.get("description", "")))
-            
-            # If still no skills, try to infer from job title
-            if not job_skills:
-                job_skills = extract_skills_from_title(job_title)
-        
-        print(f"🔎 Checking Job: {job.get('title', 'Unknown')} | Location: {job_location} | Skills: {job_skills}")
-        
-        # Calculate match scores (0-100 for each category)
-        title_score = 0
-        location_score = 0
-        skills_score = 0
-        
-        # Title matching (0-100)
-        if preferred_role and job_title:
-            title_match = fuzzy_match(preferred_role, job_title, 70)
-            title_score = 100 if title_match else 0
-            
-            # Special case: if job title contains the preferred role exactly, boost score
-            if preferred_role in job_title:
-                title_score = 100
-        else:
-            title_score = 50  # Neutral if no preference
-            
-        # Location matching (0-100)
-        if location and job_location:
-            location_score = fuzz.partial_ratio(location, job_location)
-        else:
-            location_score = 50  # Neutral if no location preference
-            
-        # Skills matching (0-100)
-        if user_skills and job_skills:
-            # Calculate percentage of user skills found in job skills
-            matches = 0
-            for user_skill in user_skills:
-                if any(fuzzy_match(user_skill, job_skill, 70) for job_skill in job_skills):
-                    matches += 1
-            
-            skills_score = int((matches / len(user_skills)) * 100) if user_skills else 50
-        elif not user_skills:
-            skills_score = 50  # Neutral if user has no skills listed
-        
-        # Calculate weighted total score (title is most important)
-        total_score = (title_score * 0.5) + (location_score * 0.3) + (skills_score * 0.2)
-        
-        # Only include jobs with a minimum score
-        if total_score >= 60:  # Adjust threshold as needed
-            job_dict = job.to_dict()
-            job_dict['match_score'] = round(total_score, 1)
-            scored_jobs.append(job_dict)
-        else:
-            print(f"❌ Skipped: Low match score ({round(total_score, 1)})")
-    
-    # Sort by match score (highest first)
-    recommendations = sorted(scored_jobs, key=lambda x: x['match_score'], reverse=True)
-    
-    # Fallback: If no recommendations, include jobs that at least match the role
-    if len(recommendations) < 5:
+def dedup_jobs(firestore_jobs, scraped_jobs, mirror_version, snapshot, keep_firestore=False):
+    """
+    One record per posting (the richest copy, or the Firestore copy with
+    `keep_firestore`). The mirrored Firestore jobs are deduplicated once per
+    mirror version, shared by every search key; the snapshot's scraped jobs
+    are then only merged into them.
+    """
+    snapshot_version = (snapshot.key, snapshot.version) if snapshot is not None else None
+    all_jobs, stats = job_deduplicator.merge(
+        firestore_jobs, scraped_jobs, mirror_version,
+        version=(mirror_version, snapshot_version, keep_firestore), keep_base=keep_firestore
+    )
+    print(f"🧹 Unique Jobs: {stats['unique']} of {stats['jobs']} ({stats['dedup_rate']:.1%} duplicates)")
+    return all_jobs
+
+def candidate_jobs(all_jobs, preferred_role, user_skills, location):
+    """Only jobs whose title, skills or location can reach the threshold get scored."""
+    candidate_ids = job_index.candidates(preferred_role, user_skills, location)
+    if not preferred_role:
+        # Without a role every job is a fallback candidate, taken in corpus order
+        candidate_ids.update(fallback_prefix(all_jobs))
+    candidates = all_jobs[all_jobs.index.isin(candidate_ids)]
+    print(f"🗂️ Candidate Jobs: {len(candidates)} of {len(all_jobs)}")
+    return candidates
+
+# Finished recommendations per user, invalidated by profile and corpus changes
+result_cache = create_result_cache(
+    os.environ.get("RESULT_CACHE_REDIS_URL"),
+    ttl=int(os.environ.get("RESULT_CACHE_TTL", "600")),
+    capacity=int(os.environ.get("RESULT_CACHE_SIZE", "5000"))
+)
+
+def corpus_version(snapshot):
+    """Version of the jobs a user is ranked against: mirror version plus their scrape snapshot version."""
+    return job_mirror.version, snapshot.version if snapshot is not None else 0
+
+def paged_jobs(job_ids, key):
+    """Current rows of a page's job ids: Firestore jobs from the mirror, scraped ones from the key's snapshot."""
+    frames = [job_mirror.frame()]
+    snapshot = scrape_refresher.get(*key)
+    if snapshot is not None:
+        frames.append(snapshot.jobs)
+    return combine_jobs([frame[frame.index.isin(job_ids)] for frame in frames])
+
+# Scored rankings behind ?limit=/&cursor= pages: ranked job ids and scores only, rows are
+# looked up per page. Only the best RANKING_PAGE_WINDOW jobs are ranked and paged
+RANKING_PAGE_MAX_LIMIT = int(os.environ.get("RANKING_PAGE_MAX_LIMIT", "100"))
+ranking_pages = RankingPages(
+    paged_jobs,
+    ttl=int(os.environ.get("RANKING_PAGE_TTL", "900")),
+    capacity=int(os.environ.get("RANKING_PAGE_CACHE_SIZE", "1000")),
+    max_limit=RANKING_PAGE_MAX_LIMIT,
+    window=int(os.environ.get("RANKING_PAGE_WINDOW", "1000"))
+)
+
+SEMANTIC_WEIGHT = 1 - LOCATION_WEIGHT
+
+def semantic_recommendations(all_jobs, preferred_role, user_skills, location, k):
+    """
+    Top-k jobs by vector similarity to the user's role and skills. Role and
+    skills take the title and skills weights together (70%), location keeps
+    its usual 30% so nearby jobs still rank first among similar ones.
+    The index holds every snapshot's jobs, so the search is limited to
+    `all_jobs` before it picks the nearest ones.
+    """
+    hits = semantic_index.search(preferred_role, user_skills, k=k * 4, job_ids=all_jobs.index.unique())
+    if not hits:
+        return []
+    jobs = all_jobs.loc[[job_id for job_id, _ in hits]]
+    jobs = jobs[~jobs.index.duplicated()]
+    similarity = dict(hits)
+    scores = (
+        SEMANTIC_WEIGHT * 100 * jobs.index.map(lambda job_id: max(0.0, similarity[job_id])).to_numpy(dtype=float)
+        + LOCATION_WEIGHT * location_scores(jobs, location)
+    )
+    records = jobs.to_dict(orient="records")
+    for record, score in zip(records, scores):
+        record["match_score"] = round(float(score), 1)
+    return sorted(records, key=lambda x: x["match_score"], reverse=True)[:k]
+
+@app.route('/api/recommend_jobs/<uid>', methods=['GET'])
+def recommend_jobs(uid):
+    """
+    Fetches jobs from Firestore and scraped data, extracts skills dynamically,
+    then filters jobs based on user's preferences and skills using fuzzy matching.
+
+    With ?limit=N the response is one page {"jobs", "total", "fallback",
+    "next_cursor"} of compact records (?include_description=true adds the
+    description); ?cursor= returns the following page of the same ranking.
+    """
+    print(f"Received UID: {uid}")
+    limit = request.args.get("limit")
+    if limit is not None:
+        if not limit.isdigit() or not 1 <= int(limit) <= RANKING_PAGE_MAX_LIMIT:
+            return jsonify({"error": f"limit must be an integer from 1 to {RANKING_PAGE_MAX_LIMIT}"}), 400
+        limit = int(limit)
+    include_description = request.args.get("include_description", "false").lower() == "true"
+
+    # Later pages come from the stored ranking: no Firestore read, scrape or scoring
+    cursor = request.args.get("cursor")
+    if cursor:
+        try:
+            page = ranking_pages.next_page(uid, cursor, limit or 20, include_description)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if page is None:
+            return jsonify({"error": "Cursor expired, request the first page again"}), 410
+        return jsonify(page)
+    semantic = request.args.get("mode") == "semantic"
+    if semantic:
+        if semantic_index is None:
+            return jsonify({"error": "Semantic mode is turned off on this server"}), 400
+        k = request.args.get("k", "20")
+        if not k.isdigit() or not 1 <= int(k) <= SEMANTIC_MAX_K:
+            return jsonify({"error": f"k must be an integer from 1 to {SEMANTIC_MAX_K}"}), 400
+        k = int(k)
+    # Fetch user preferences from Firestore
+    profile = user_profile(uid)
+    if profile is None:
+        return jsonify({"error": "User not found"}), 404
+    preferred_role, user_skills, location = profile
+
+    # Same profile and same jobs as last time: reuse the result
+    snapshot = scrape_refresher.get(preferred_role, location)
+    mirror_ready = job_mirror.wait_until_ready(JOB_MIRROR_READY_TIMEOUT)
+    version = corpus_version(snapshot)
+    cache_key = result_cache.key(
+        uid, profile, version, request.args.get("mode", "fuzzy"), request.args.get("k", "")
+    )
+    cached = result_cache.get(cache_key) if not limit else None
+    if cached is not None:
+        print(f"⚡ Cached Recommendations: {len(cached)} jobs")
+        return jsonify(cached)
+
+    # ✅ Firestore jobs from the mirror, scraped jobs from the latest background snapshot
+    mirror_version, firestore_jobs_df = mirrored_firestore_jobs(wait=0)
+    scraped_jobs_df = snapshot_jobs(snapshot)
+
+    # ✅ Combine Firestore and Scraped Jobs (indexed by job id), one record per posting
+    firestore_jobs_df, scraped_jobs_df = combine_jobs([firestore_jobs_df]), combine_jobs([scraped_jobs_df])
+    print(f"📊 Total Jobs Available: {len(firestore_jobs_df) + len(scraped_jobs_df)}")
+    all_jobs = dedup_jobs(firestore_jobs_df, scraped_jobs_df, mirror_version, snapshot)
+
+    # ?mode=semantic ranks by vector similarity instead of fuzzy title/skill matching
+    if semantic:
+        recommendations = semantic_recommendations(all_jobs, preferred_role, user_skills, location, k=k)
+        print(f"✅ Semantic Recommendations: {len(recommendations)} jobs")
+        if mirror_ready:
+            result_cache.put(cache_key, recommendations)
+        return jsonify(recommendations)
+
+    candidates = candidate_jobs(all_jobs, preferred_role, user_skills, location)
+    if limit:
+        scores = score_for_user(candidates, preferred_role, user_skills, location)
+        page = ranking_pages.first_page(
+            uid, candidates, scores, limit, include_description, context=search_key(preferred_role, location)
+        )
+        print(f"✅ Recommendations page: {len(page['jobs'])} of {page['total']} jobs")
+        return jsonify(page)
+
+    recommendations, used_fallback = rank_for_user(candidates, preferred_role, user_skills, location)
+    if used_fallback:
         print("⚠️ Using fallback recommendations")
-        fallback_jobs = []
-        for _, job in all_jobs.iterrows():
-            job_title = str(job.get("title", "")).lower()
-            
-            # Only check if title contains the role or is similar
-            if preferred_role in job_title or fuzzy_match(preferred_role, job_title, 60):
-                job_dict = job.to_dict()
-                job_dict['match_score'] = 50  # Default fallback score
-                fallback_jobs.append(job_dict)
-        
-        # Add fallback jobs that aren't already in recommendations
-        existing_urls = {job.get('url', '') for job in recommendations}
-        for job in fallback_jobs:
-            if job.get('url', '') not in existing_urls and len(recommendations) < 10:
-                recommendations.append(job)
-                existing_urls.add(job.get('url', ''))
+
+    # Occasionally also score everything to track how much the candidate path misses
+    if len(candidates) < len(all_jobs) and random.random() < JOB_INDEX_RECALL_SAMPLE:
+        full_scan, _ = rank_for_user(all_jobs, preferred_role, user_skills, location)
+        recall = job_index.record_recall(recommendation_keys(full_scan), recommendation_keys(recommendations))
+        print(f"🎯 Job index recall vs full scan: {recall:.2f}")
     
     print(f"✅ Final Recommendations: {len(recommendations)} jobs")
+    # A partly loaded mirror would pin an incomplete result until the TTL expires
+    if mirror_ready:
+        result_cache.put(cache_key, recommendations)
     return jsonify(recommendations)
 
+STREAM_BATCH_SIZE = int(os.environ.get("STREAM_BATCH_SIZE", "10"))
+STREAM_SCRAPE_WAIT = float(os.environ.get("STREAM_SCRAPE_WAIT", "60"))
+# Recent time-to-first-result samples of the streaming endpoint, in milliseconds
+time_to_first_result_ms = deque(maxlen=1000)
+
+def ndjson_line(record):
+    return json.dumps(record, default=str) + "\n"
+
+@app.route('/api/recommend_jobs/<uid>/stream', methods=['GET'])
+def recommend_jobs_stream(uid):
+    """
+    Streaming variant of recommend_jobs as newline-delimited JSON: Firestore
+    matches first, then scraped matches in batches once their snapshot is
+    available, then a summary record with the final ranking. Matches come
+    from the deduplicated jobs, so each posting streams at most once, and
+    the summary carries the full records of ranked jobs that were not
+    streamed (fallback jobs, mostly).
+    """
+    started = time.perf_counter()
+    profile = user_profile(uid)
+    if profile is None:
+        return jsonify({"error": "User not found"}), 404
+    preferred_role, user_skills, location = profile
+
+    def generate():
+        mirror_version, firestore_jobs_df = mirrored_firestore_jobs()
+        firestore_jobs_df = combine_jobs([firestore_jobs_df])
+        firestore_unique, _ = job_deduplicator.dedup_base(firestore_jobs_df, mirror_version)
+        firestore_candidates = candidate_jobs(firestore_unique, preferred_role, user_skills, location)
+        # Only jobs above the threshold stream; fallback jobs depend on the whole ranking
+        matches, _ = rank_for_user(firestore_candidates, preferred_role, user_skills, location, min_results=0)
+        streamed = recommendation_keys(matches)
+        yield ndjson_line({"type": "matches", "source": "firestore", "jobs": matches})
+        first_result_ms = round((time.perf_counter() - started) * 1000, 1)
+        time_to_first_result_ms.append(first_result_ms)
+
+        # A missing or stale snapshot is being refreshed in the background; wait for it (bounded)
+        snapshot = scrape_refresher.get(preferred_role, location)
+        if scrape_refresher.is_stale(snapshot):
+            snapshot = scrape_refresher.wait(preferred_role, location, STREAM_SCRAPE_WAIT)
+        scraped_jobs_df = combine_jobs([snapshot_jobs(snapshot)])
+        # Postings already in Firestore keep the copy scored above
+        all_jobs = dedup_jobs(firestore_jobs_df, scraped_jobs_df, mirror_version, snapshot, keep_firestore=True)
+        candidates = candidate_jobs(all_jobs, preferred_role, user_skills, location)
+        scraped_candidates = candidates[~candidates.index.isin(firestore_unique.index)]
+        for start in range(0, len(scraped_candidates), STREAM_BATCH_SIZE):
+            batch = scraped_candidates.iloc[start:start + STREAM_BATCH_SIZE]
+            matches, _ = rank_for_user(batch, preferred_role, user_skills, location, min_results=0)
+            streamed |= recommendation_keys(matches)
+            yield ndjson_line({"type": "matches", "source": "scraped", "jobs": matches})
+
+        recommendations, used_fallback = rank_for_user(candidates, preferred_role, user_skills, location)
+        yield ndjson_line({
+            "type": "summary",
+            "fallback": used_fallback,
+            "total": len(recommendations),
+            "ranks": [
+                {
+                    "rank": rank,
+                    "url": job.get("url", ""),
+                    "title": job.get("title", ""),
+                    "company": job.get("company", ""),
+                    "source": job.get("source", ""),
+                    "match_score": job["match_score"]
+                }
+                for rank, job in enumerate(recommendations, start=1)
+            ],
+            # Full records of the ranked jobs no "matches" record carried
+            "jobs": [job for job in recommendations if not recommendation_keys([job]) <= streamed],
+            "scrape_snapshot_version": snapshot.version if snapshot is not None else None,
+            "time_to_first_result_ms": first_result_ms
+        })
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+BATCH_READ_SIZE = 100
+BATCH_WRITE_SIZE = 400  # Firestore allows 500 writes per batch
+BATCH_SCRAPE_WAIT = float(os.environ.get("BATCH_SCRAPE_WAIT", "300"))
+# JSONL output of the HTTP batch endpoint only goes to this directory
+BATCH_OUTPUT_DIR = os.path.realpath(os.environ.get("BATCH_OUTPUT_DIR", "batch_output"))
+BATCH_MAX_WORKERS = int(os.environ.get("BATCH_MAX_WORKERS", "8"))
+BATCH_JOB_HISTORY = 100
+
+def fetch_profiles(uids=None):
+    """Profiles of the given users (or of all users), read with batched get_all calls."""
+    users_ref = db.collection('users')
+    if uids is None:
+        user_docs = users_ref.stream()
+    else:
+        user_docs = []
+        for start in range(0, len(uids), BATCH_READ_SIZE):
+            user_docs.extend(db.get_all([users_ref.document(uid) for uid in uids[start:start + BATCH_READ_SIZE]]))
+    return {user_doc.id: profile_from_user_data(user_doc.to_dict()) for user_doc in user_docs if user_doc.exists}
+
+class JsonlWriter:
+    """Writes one {"uid", "recommendations", "fallback"} line per user."""
+
+    def __init__(self, path):
+        self.destination = path
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, uid, recommendations, used_fallback):
+        self._file.write(ndjson_line({"uid": uid, "recommendations": recommendations, "fallback": used_fallback}))
+
+    def close(self):
+        self._file.close()
+
+class FirestoreWriter:
+    """Stores each user's recommendations in the `recommendations` collection with batched writes."""
+
+    def __init__(self, collection="recommendations"):
+        self.destination = f"firestore:{collection}"
+        self._collection = db.collection(collection)
+        self._batch = db.batch()
+        self._pending = 0
+
+    def write(self, uid, recommendations, used_fallback):
+        self._batch.set(self._collection.document(uid), {
+            "recommendations": recommendations,
+            "fallback": used_fallback,
+            "generated_at": firestore.SERVER_TIMESTAMP
+        })
+        self._pending += 1
+        if self._pending >= BATCH_WRITE_SIZE:
+            self.close()
+
+    def close(self):
+        if self._pending:
+            self._batch.commit()
+            self._batch = db.batch()
+            self._pending = 0
+
+def recommend_for_users(writer, uids=None, workers=4):
+    """
+    Recommendations for many users against one shared corpus: profiles are
+    read in batches, users are grouped by (role, location) so each group's
+    scrape happens once, job skills are prepared once, and users are
+    scored on a worker pool. Returns a summary with users per second.
+    """
+    started = time.perf_counter()
+    profiles = fetch_profiles(uids)
+    groups = {}
+    for uid, (preferred_role, _, location) in profiles.items():
+        groups.setdefault(search_key(preferred_role, location), []).append(uid)
+    print(f"👥 Batch: {len(profiles)} users in {len(groups)} role/location groups")
+
+    # One scrape per group, all queued up front
+    for preferred_role, location in groups:
+        scrape_refresher.get(preferred_role, location)
+
+    mirror_version, firestore_jobs = mirrored_firestore_jobs()
+    firestore_jobs = combine_jobs([firestore_jobs])
+    skills_by_id = dict(zip(firestore_jobs.index, scoring_skills_for(firestore_jobs)))
+
+    def score_user(uid, all_jobs):
+        preferred_role, user_skills, location = profiles[uid]
+        candidates = candidate_jobs(all_jobs, preferred_role, user_skills, location)
+        job_skills = [skills_by_id[job_id] for job_id in candidates.index]
+        return uid, rank_for_user(candidates, preferred_role, user_skills, location, job_skills=job_skills)
+
+    fallbacks = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for (preferred_role, location), group_uids in groups.items():
+            snapshot = scrape_refresher.wait(preferred_role, location, BATCH_SCRAPE_WAIT)
+            scraped_jobs = combine_jobs([snapshot_jobs(snapshot)])
+            skills_by_id.update(zip(scraped_jobs.index, scoring_skills_for(scraped_jobs)))
+            all_jobs = dedup_jobs(firestore_jobs, scraped_jobs, mirror_version, snapshot)
+            futures = [pool.submit(score_user, uid, all_jobs) for uid in group_uids]
+            for future in as_completed(futures):
+                uid, (recommendations, used_fallback) = future.result()
+                writer.write(uid, recommendations, used_fallback)
+                fallbacks += used_fallback
+    writer.close()
+
+    elapsed = time.perf_counter() - started
+    summary = {
+        "users": len(profiles),
+        "groups": len(groups),
+        "fallback_users": fallbacks,
+        "seconds": round(elapsed, 2),
+        "users_per_second": round(len(profiles) / elapsed, 2) if elapsed else None,
+        "output": writer.destination
+    }
+    print(f"📬 Batch recommendations: {summary}")
+    return summary
+
+def batch_output_path(name):
+    """`name` resolved inside BATCH_OUTPUT_DIR; raises ValueError if it would escape it."""
+    target = os.path.realpath(os.path.join(BATCH_OUTPUT_DIR, str(name)))
+    if os.path.dirname(target) != BATCH_OUTPUT_DIR:
+        raise ValueError("'path' must be a file name inside the batch output directory")
+    return target
+
+# One batch at a time in the background; finished jobs are kept for status queries
+batch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="batch-recommend")
+batch_jobs = OrderedDict()
+batch_jobs_lock = threading.Lock()
+
+def run_batch_job(job_id, output_path, uids, workers):
+    with batch_jobs_lock:
+        batch_jobs[job_id].update(status="running", started_at=time.time())
+    try:
+        writer = JsonlWriter(output_path) if output_path else FirestoreWriter()
+        summary = recommend_for_users(writer, uids=uids, workers=workers)
+        update = {"status": "done", "summary": summary}
+    except Exception as e:
+        print(f"❌ Batch job {job_id} failed: {e}")
+        update = {"status": "failed", "error": str(e)}
+    with batch_jobs_lock:
+        batch_jobs[job_id].update(update, finished_at=time.time())
+
+@app.route('/api/recommend_jobs_batch', methods=['POST'])
+def recommend_jobs_batch():
+    """
+    Starts recommendations for a list of users (or all users) as a background
+    job and returns its id; poll /api/recommend_jobs_batch/<job_id>. Body:
+    {"uids": [...] | "all": true, "output": "firestore" | "jsonl", "path": "file.jsonl", "workers": 4}
+    JSONL files are written inside BATCH_OUTPUT_DIR.
+    """
+    body = request.get_json(silent=True) or {}
+    uids = None if body.get("all") else body.get("uids")
+    if uids is None and not body.get("all"):
+        return jsonify({"error": "Provide 'uids' or 'all': true"}), 400
+    if uids is not None and not (isinstance(uids, list) and all(isinstance(uid, str) for uid in uids)):
+        return jsonify({"error": "'uids' must be a list of user ids"}), 400
+    try:
+        workers = min(max(int(body.get("workers", 4)), 1), BATCH_MAX_WORKERS)
+    except (TypeError, ValueError):
+        return jsonify({"error": "'workers' must be an integer"}), 400
+
+    output_path = None
+    if body.get("output", "firestore") == "jsonl":
+        try:
+            output_path = batch_output_path(body.get("path", "recommendations.jsonl"))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        os.makedirs(BATCH_OUTPUT_DIR, exist_ok=True)
+
+    job_id = uuid.uuid4().hex
+    with batch_jobs_lock:
+        batch_jobs[job_id] = {
+            "job_id": job_id, "status": "queued", "submitted_at": time.time(),
+            "output": output_path or "firestore:recommendations", "workers": workers
+        }
+        finished = [old_id for old_id, job in batch_jobs.items() if job["status"] in ("done", "failed")]
+        for old_id in finished[:max(0, len(batch_jobs) - BATCH_JOB_HISTORY)]:
+            del batch_jobs[old_id]
+    batch_executor.submit(run_batch_job, job_id, output_path, uids, workers)
+    return jsonify({"job_id": job_id, "status": "queued", "status_url": f"/api/recommend_jobs_batch/{job_id}"}), 202
+
+@app.route('/api/recommend_jobs_batch/<job_id>', methods=['GET'])
+def recommend_jobs_batch_status(job_id):
+    """Status of a batch job, with its summary once done."""
+    with batch_jobs_lock:
+        job = batch_jobs.get(job_id)
+        job = dict(job) if job is not None else None
+    if job is None:
+        return jsonify({"error": "Unknown batch job"}), 404
+    return jsonify(job)
+
+@app.route('/api/stream_metrics', methods=['GET'])
+def stream_metrics():
+    """Time to first result of the streaming recommendations endpoint."""
+    samples = sorted(time_to_first_result_ms)
+    if not samples:
+        return jsonify({"requests": 0})
+    return jsonify({
+        "requests": len(samples),
+        "time_to_first_result_ms": {
+            "p50": samples[len(samples) // 2],
+            "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+            "max": samples[-1]
+        }
+    })
+
+@app.route('/api/scrape/stats', methods=['GET'])
+def scrape_stats():
+    return jsonify(scrape_orchestrator.stats())
+
+@app.route('/api/extraction_cache/stats', methods=['GET'])
+def extraction_cache_stats():
+    """Hit/miss counters of the skill extraction cache."""
+    return jsonify(extraction_cache.stats())
+
+@app.route('/api/result_cache/stats', methods=['GET'])
+def result_cache_stats():
+    """Hit ratio of the per-user recommendation cache."""
+    return jsonify(result_cache.stats())
+
+@app.route('/api/dedup/stats', methods=['GET'])
+def dedup_stats():
+    """Share of jobs dropped as cross-source duplicates before scoring."""
+    return jsonify(job_deduplicator.stats())
+
+@app.route('/api/job_index/stats', methods=['GET'])
+def job_index_stats():
+    """Size of the job index and its sampled recall against full scans."""
+    return jsonify(job_index.stats())
+
+@app.route('/api/job_mirror/stats', methods=['GET'])
+def job_mirror_stats():
+    """Corpus version and sync lag of the Firestore job mirror."""
+    return jsonify(job_mirror.stats())
+
+@app.route('/api/semantic_index/stats', methods=['GET'])
+def semantic_index_stats():
+    """Encoder and size of the semantic job index."""
+    if semantic_index is None:
+        return jsonify({"enabled": False})
+    return jsonify(dict(semantic_index.stats(), enabled=True))
+
+@app.route('/api/scrape_snapshots', methods=['GET'])
+def scrape_snapshots():
+    """Versions and ages of the background scrape snapshots."""
+    return jsonify(scrape_refresher.stats())
+
+@app.route('/api/ready', methods=['GET'])
+def ready():
+    """Readiness probe: 200 once the NER model is loaded and warmed up, 503 before."""
+    status = {
+        "ready": ner_model.ready,
+        "models": [ner_model.status()],
+        "job_mirror_ready": job_mirror.wait_until_ready(0)
+    }
+    return jsonify(status), 200 if ner_model.ready else 503
+
+print(f"⏱️ recommendation_api imported in {time.time() - _import_started:.1f}s, NER model loading in the background")
+
 if __name__ == '__main__':
     print("🚀 recommendation_api is starting...")
     app.run(port=5003, debug=True)
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+def profile_fingerprint(preferred_role, skills, location):
+    """Short hash of the profile fields that affect recommendations; skill order does not matter."""
+    payload = json.dumps([preferred_role or "", sorted(skills or []), location or ""])
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class MemoryBackend:
+    """In-process store with per-entry expiry and LRU eviction beyond `capacity` entries."""
+
+    def __init__(self, capacity=5000):
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisBackend:
+    """
+    Same interface over a Redis-compatible client (anything with `get` and
+    `setex`). Entries expire through their TTL; size is bounded by the
+    server's maxmemory policy (e.g. allkeys-lru).
+    """
+
+    def __init__(self, client, prefix="recommendations:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        value = self.client.get(self.prefix + key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl):
+        self.client.setex(self.prefix + key, int(ttl), json.dumps(value, default=str))
+
+    def __len__(self):
+        return 0
+
+
+class ResultCache:
+    """
+    Recommendation results per user. The key holds the uid, a fingerprint
+    of the user's role/skills/location and the job corpus version, so a
+    profile edit or any corpus change makes the next request miss and
+    recompute; stale entries simply age out through the TTL or LRU.
+    """
+
+    def __init__(self, backend, ttl=600):
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, uid, profile, corpus_version, *variant):
+        """`variant` holds request options that change the result (e.g. mode, page size)."""
+        parts = [uid, profile_fingerprint(*profile), "-".join(str(v) for v in corpus_version)]
+        parts.extend(str(v) for v in variant)
+        return ":".join(parts)
+
+    def get(self, key):
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            print(f"❌ Result cache read failed: {e}")
+            value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def put(self, key, value):
+        try:
+            self.backend.set(key, value, self.ttl)
+        except Exception as e:
+            print(f"❌ Result cache write failed: {e}")
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": type(self.backend).__name__,
+                "entries": len(self.backend),
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None
+            }
+
+
+def create_result_cache(redis_url=None, ttl=600, capacity=5000):
+    """A Redis-backed cache when `redis_url` is set and redis is installed, else an in-memory one."""
+    if redis_url:
+        try:
+            import redis
+            client = redis.Redis.from_url(redis_url)
+            client.ping()
+            return ResultCache(RedisBackend(client), ttl=ttl)
+        except Exception as e:
+            print(f"⚠️ Redis result cache unavailable ({e}), using in-memory cache")
+    return ResultCache(MemoryBackend(capacity), ttl=ttl)
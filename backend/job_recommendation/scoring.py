@@ -0,0 +1,182 @@
+import numpy as np
+import pandas as pd
+from fuzzywuzzy import fuzz
+
+TITLE_WEIGHT, LOCATION_WEIGHT, SKILLS_WEIGHT = 0.5, 0.3, 0.2
+NEUTRAL_SCORE = 50
+
+
+def _similarity(query, values, scorer):
+    """
+    `scorer(query, value)` for every value, computed once per distinct value
+    and broadcast back, as the same titles and locations repeat a lot.
+    """
+    distinct, inverse = np.unique(np.asarray(values, dtype=object).astype(str), return_inverse=True)
+    scores = np.fromiter((scorer(query, str(value)) for value in distinct), dtype=np.int64, count=len(distinct))
+    return scores[inverse.reshape(-1)]
+
+
+def _skill_matches(user_skills, job_skills, scorer, threshold):
+    """
+    Number of user skills fuzzily present in each job's skills.
+
+    A (user skill x distinct job skill) match matrix is built once, then
+    OR-reduced over each job's own skills with one `reduceat`.
+    """
+    matches = np.zeros(len(job_skills), dtype=np.int64)
+    vocabulary = {}
+    flat, starts, owners = [], [], []
+    for index, skills in enumerate(job_skills):
+        if not skills:
+            continue
+        starts.append(len(flat))
+        owners.append(index)
+        flat.extend(vocabulary.setdefault(skill, len(vocabulary)) for skill in skills)
+    if not flat or not user_skills:
+        return matches
+
+    distinct = list(vocabulary)
+    # fuzzy_match treats empty strings as a non-match
+    matrix = np.array([
+        [bool(user_skill) and bool(skill) and scorer(user_skill, skill) >= threshold for skill in distinct]
+        for user_skill in user_skills
+    ], dtype=bool)
+    per_job = np.logical_or.reduceat(matrix[:, flat], starts, axis=1)
+    matches[owners] = per_job.sum(axis=0)
+    return matches
+
+
+def location_scores(all_jobs, location, scorer=fuzz.partial_ratio):
+    """Partial ratio of the user's location against each job's; 50 when either is missing."""
+    locations = all_jobs["location"].astype(str).str.lower().to_numpy(dtype=object)
+    if not location:
+        return np.full(len(locations), NEUTRAL_SCORE)
+    has_location = np.array([bool(job_location) for job_location in locations], dtype=bool)
+    return np.where(has_location, _similarity(location, locations, scorer), NEUTRAL_SCORE)
+
+
+def score_jobs(all_jobs, preferred_role, user_skills, location, job_skills=None, scorer=fuzz.partial_ratio):
+    """
+    Scores every job of `all_jobs` against a user's role, skills and location
+    in bulk. Gives the same numbers as scoring job by job with fuzzy_match:
+
+    - title: 100 if the role is contained in or fuzzily matches (>= 70) the title, else 0; 50 without a role
+    - location: partial ratio of the locations; 50 when either is missing
+    - skills: % of user skills fuzzily (>= 70) found in the job's skills; 50 without user skills
+
+    `job_skills` overrides the skills used per job (lowercased lists).
+    Returns a DataFrame aligned with `all_jobs` holding each score, the
+    weighted total and whether the job qualifies for the fallback list.
+    """
+    titles = all_jobs["title"].astype(str).str.lower().to_numpy(dtype=object)
+    if job_skills is None:
+        job_skills = [[str(s).lower() for s in skills] for skills in all_jobs["skills"]]
+
+    has_title = np.array([bool(title) for title in titles], dtype=bool)
+    contains_role = np.array([preferred_role in title for title in titles], dtype=bool)
+
+    if preferred_role:
+        title_ratio = _similarity(preferred_role, titles, scorer)
+        title_match = has_title & (title_ratio >= 70)
+        title_score = np.where(has_title, np.where(title_match | contains_role, 100, 0), NEUTRAL_SCORE)
+        fallback = contains_role | (has_title & (title_ratio >= 60))
+    else:
+        title_score = np.full(len(titles), NEUTRAL_SCORE)
+        fallback = contains_role
+
+    location_score = location_scores(all_jobs, location, scorer)
+
+    if user_skills:
+        has_skills = np.array([bool(skills) for skills in job_skills], dtype=bool)
+        matches = _skill_matches(user_skills, job_skills, scorer, 70)
+        skills_score = np.where(has_skills, (matches / len(user_skills) * 100).astype(np.int64), 0)
+    else:
+        skills_score = np.full(len(job_skills), NEUTRAL_SCORE)
+
+    total_score = (title_score * TITLE_WEIGHT) + (location_score * LOCATION_WEIGHT) + (skills_score * SKILLS_WEIGHT)
+    return pd.DataFrame({
+        "title_score": title_score,
+        "location_score": location_score,
+        "skills_score": skills_score,
+        "total_score": total_score,
+        "fallback": fallback
+    }, index=all_jobs.index)
+
+
+def _top_order(values, k):
+    """
+    Positions of the `k` largest values, largest first, in the order of a
+    stable descending sort (ties keep their order), without sorting all.
+    """
+    kth = np.partition(values, len(values) - k)[len(values) - k]
+    above = np.flatnonzero(values > kth)
+    ties = np.flatnonzero(values == kth)[:k - len(above)]
+    top = np.sort(np.concatenate([above, ties]))
+    return top[np.argsort(-values[top], kind="stable")]
+
+
+def rank_positions(all_jobs, scores, threshold=60, min_results=5, max_results=10, limit=None):
+    """
+    rank_jobs without building records: (row positions in rank order, their
+    match scores, used_fallback). With `limit` only the best `limit` jobs
+    are selected, with a partition instead of a full sort.
+    """
+    total_scores = scores["total_score"].to_numpy()
+    selected = np.flatnonzero(total_scores >= threshold)
+    # Totals are multiples of 0.1 up to float noise, so this rounds like round(total, 1)
+    rounded = np.round(total_scores[selected], 1)
+    if limit is not None and limit < len(selected):
+        ranked = _top_order(rounded, limit)
+    else:
+        # Stable like sorted(reverse=True): ties keep their corpus order
+        ranked = np.argsort(-rounded, kind="stable")
+    positions = selected[ranked].tolist()
+    ranked_scores = [round(float(total), 1) for total in total_scores[positions]]
+
+    used_fallback = len(selected) < min_results
+    if used_fallback:
+        urls = all_jobs["url"].tolist() if "url" in all_jobs.columns else [""] * len(all_jobs)
+        existing_urls = {urls[position] for position in positions}
+        for position in np.flatnonzero(scores["fallback"].to_numpy()):
+            if len(positions) >= max_results:
+                break
+            if urls[position] not in existing_urls:
+                positions.append(int(position))
+                ranked_scores.append(NEUTRAL_SCORE)
+                existing_urls.add(urls[position])
+        if limit is not None:
+            positions, ranked_scores = positions[:limit], ranked_scores[:limit]
+    return positions, ranked_scores, used_fallback
+
+
+def fallback_prefix(all_jobs, min_results=5, max_results=10):
+    """
+    Index labels of the leading jobs the fallback can pick when every job
+    qualifies for it (no role): it fills up to `max_results` in corpus
+    order, skipping URLs among the fewer than `min_results` scored matches,
+    so it never looks past the first min_results - 1 + max_results URLs.
+    """
+    urls = all_jobs["url"].tolist() if "url" in all_jobs.columns else [""] * len(all_jobs)
+    seen = set()
+    for position, url in enumerate(urls):
+        seen.add(url)
+        if len(seen) >= min_results - 1 + max_results:
+            return all_jobs.index[:position + 1]
+    return all_jobs.index
+
+
+def rank_jobs(all_jobs, scores, threshold=60, min_results=5, max_results=10, limit=None):
+    """
+    Turns `score_jobs` output into the recommendation list: jobs at or above
+    `threshold` by score, topped up with role-matching fallback jobs (score
+    50, deduplicated by URL) when fewer than `min_results` qualify.
+    Records are only built for the returned jobs (the best `limit` if given).
+    Returns (recommendations, used_fallback).
+    """
+    positions, match_scores, used_fallback = rank_positions(
+        all_jobs, scores, threshold, min_results, max_results, limit
+    )
+    recommendations = all_jobs.iloc[positions].to_dict(orient="records")
+    for record, match_score in zip(recommendations, match_scores):
+        record["match_score"] = match_score
+    return recommendations, used_fallback
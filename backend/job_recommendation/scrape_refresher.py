@@ -0,0 +1,188 @@
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# A versioned, already skill-extracted set of scraped jobs for one search key
+Snapshot = namedtuple("Snapshot", ["key", "version", "fetched_at", "jobs"])
+
+
+def search_key(preferred_role, location):
+    """Normalized (role, location) pair used to share scrapes between users."""
+    role = (preferred_role or "").strip().lower() or "software engineer"
+    place = (location or "").strip().lower() or "india"
+    return role, place
+
+
+class ScrapeRefresher:
+    """
+    Keeps scraped jobs for every (preferred_role, location) pair users have,
+    so requests read a snapshot instead of scraping inline.
+
+    `fetch(role, location)` scrapes and extracts skills, returning a
+    DataFrame; it runs on background threads only. A scheduler thread
+    refreshes every tracked key each `interval` seconds; `get()` returns
+    the latest snapshot and queues an async refresh when the key is
+    missing or older than `max_age`. Keys nobody asked for within
+    `track_ttl` seconds stop being refreshed and their snapshot is dropped.
+    `on_refresh(key, snapshot)` callbacks run on the refresh thread for
+    every new snapshot, and with None when a key's snapshot is dropped.
+    """
+
+    def __init__(self, fetch, interval=3600, max_age=6 * 3600, seed=None, workers=2, track_ttl=7 * 24 * 3600):
+        self.fetch = fetch
+        self.interval = interval
+        self.max_age = max_age
+        self.seed = seed
+        self.track_ttl = track_ttl
+        self._snapshots = {}
+        # key -> when it was last asked for
+        self._tracked = {}
+        self._in_flight = set()
+        self._callbacks = []
+        self._lock = threading.Lock()
+        self._updated = threading.Condition(self._lock)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape-refresh")
+        self._stop = threading.Event()
+        self._thread = None
+
+    def on_refresh(self, callback):
+        """Registers `callback(key, snapshot)` for every new or dropped snapshot."""
+        self._callbacks.append(callback)
+        return callback
+
+    def _notify(self, key, snapshot):
+        for callback in self._callbacks:
+            try:
+                callback(key, snapshot)
+            except Exception as e:
+                print(f"❌ Scrape snapshot callback failed for {key}: {e}")
+
+    def track(self, preferred_role, location):
+        key = search_key(preferred_role, location)
+        with self._lock:
+            self._tracked[key] = time.time()
+        return key
+
+    def expire(self, now=None):
+        """Forgets keys not asked for within `track_ttl`; returns them."""
+        cutoff = (now or time.time()) - self.track_ttl
+        with self._lock:
+            expired = [key for key, last_used in self._tracked.items() if last_used < cutoff]
+            for key in expired:
+                del self._tracked[key]
+                self._snapshots.pop(key, None)
+        for key in expired:
+            self._notify(key, None)
+        if expired:
+            print(f"🧹 Stopped refreshing {len(expired)} search keys nobody asked for recently")
+        return expired
+
+    def is_stale(self, snapshot, now=None):
+        return snapshot is None or (now or time.time()) - snapshot.fetched_at > self.max_age
+
+    def get(self, preferred_role, location):
+        """Latest snapshot for the pair (or None), refreshing it in the background if needed."""
+        key = self.track(preferred_role, location)
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+        if self.is_stale(snapshot):
+            self.refresh_async(key)
+        return snapshot
+
+    def wait(self, preferred_role, location, timeout):
+        """
+        Latest snapshot for the pair, waiting up to `timeout` seconds for a
+        running refresh of a missing or stale key to finish.
+        """
+        key = self.track(preferred_role, location)
+        deadline = time.time() + timeout
+        with self._updated:
+            while True:
+                snapshot = self._snapshots.get(key)
+                remaining = deadline - time.time()
+                if not self.is_stale(snapshot) or key not in self._in_flight or remaining <= 0:
+                    return snapshot
+                self._updated.wait(remaining)
+
+    def refresh_async(self, key):
+        """Queues a refresh of `key` unless one is already running; returns the future or None."""
+        with self._lock:
+            if key in self._in_flight:
+                return None
+            self._in_flight.add(key)
+        return self._executor.submit(self.refresh, key)
+
+    def refresh(self, key):
+        """Scrapes `key` now and stores the result as its next snapshot version."""
+        try:
+            jobs = self.fetch(*key)
+            with self._lock:
+                previous = self._snapshots.get(key)
+                snapshot = Snapshot(key, previous.version + 1 if previous else 1, time.time(), jobs)
+                self._snapshots[key] = snapshot
+                self._updated.notify_all()
+            print(f"🔄 Refreshed scrape snapshot {key} v{snapshot.version}: {len(jobs)} jobs")
+        except Exception as e:
+            print(f"❌ Scrape refresh failed for {key}: {e}")
+            return None
+        finally:
+            with self._lock:
+                self._in_flight.discard(key)
+                self._updated.notify_all()
+        self._notify(key, snapshot)
+        return snapshot
+
+    def refresh_all(self):
+        """Refreshes every tracked key, one after another to stay polite to the job boards."""
+        self.expire()
+        with self._lock:
+            keys = sorted(self._tracked)
+        for key in keys:
+            if self._stop.is_set():
+                break
+            with self._lock:
+                if key in self._in_flight:
+                    continue
+                self._in_flight.add(key)
+            self.refresh(key)
+
+    def _run(self):
+        if self.seed is not None:
+            try:
+                for preferred_role, location in self.seed():
+                    self.track(preferred_role, location)
+            except Exception as e:
+                print(f"❌ Could not load search keys to refresh: {e}")
+        while not self._stop.is_set():
+            self.refresh_all()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Starts the scheduler thread (idempotent)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="scrape-scheduler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._executor.shutdown(wait=False)
+
+    def stats(self):
+        now = time.time()
+        with self._lock:
+            return {
+                "tracked_keys": len(self._tracked),
+                "in_flight": len(self._in_flight),
+                "snapshots": [
+                    {
+                        "preferred_role": key[0],
+                        "location": key[1],
+                        "version": snapshot.version,
+                        "age_seconds": round(now - snapshot.fetched_at, 1),
+                        "jobs": len(snapshot.jobs)
+                    }
+                    for key, snapshot in sorted(self._snapshots.items())
+                ]
+            }
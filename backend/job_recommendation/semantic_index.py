@@ -0,0 +1,332 @@
+import os
+import pickle
+import threading
+
+import numpy as np
+
+
+class SentenceEncoder:
+    """Dense vectors from a small sentence-transformers model already in the local cache."""
+
+    def __init__(self, model_name):
+        from sentence_transformers import SentenceTransformer
+        self.name = f"sentence-transformers:{model_name}"
+        self.model = SentenceTransformer(model_name, local_files_only=True)
+        self.fitted = True
+
+    def fit(self, texts):
+        pass
+
+    def encode(self, texts):
+        return np.asarray(self.model.encode(list(texts), normalize_embeddings=True), dtype=np.float32)
+
+
+class TfidfSvdEncoder:
+    """
+    TF-IDF over word 1-2 grams reduced with truncated SVD (LSA), used when
+    no sentence model is available. Terms that co-occur ("sde",
+    "software engineer") end up close in the reduced space.
+    """
+
+    name = "tfidf-svd"
+
+    def __init__(self, dimensions=128):
+        self.dimensions = dimensions
+        self.fitted = False
+        self.fitted_size = 0
+
+    def fit(self, texts):
+        from sklearn.decomposition import TruncatedSVD
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        texts = list(texts)
+        self.vectorizer = TfidfVectorizer(ngram_range=(1, 2), min_df=1, max_features=50000, sublinear_tf=True)
+        matrix = self.vectorizer.fit_transform(texts)
+        components = max(1, min(self.dimensions, matrix.shape[0] - 1, matrix.shape[1] - 1))
+        self.svd = TruncatedSVD(n_components=components, random_state=0).fit(matrix)
+        self.fitted = True
+        self.fitted_size = len(texts)
+
+    def encode(self, texts):
+        vectors = self.svd.transform(self.vectorizer.transform(list(texts))).astype(np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+
+def load_encoder(model_name=None):
+    """The cached sentence model if there is one, else the TF-IDF/SVD encoder."""
+    if model_name:
+        try:
+            return SentenceEncoder(model_name)
+        except Exception as e:
+            print(f"⚠️ Sentence model {model_name} unavailable ({e}), using TF-IDF/SVD vectors")
+    return TfidfSvdEncoder()
+
+
+class VectorIndex:
+    """
+    Approximate nearest-neighbour index over unit vectors (inverted file):
+    vectors are bucketed under k-means centroids and a query only scans
+    the `nprobe` closest buckets. Below `train_size` vectors it is a flat
+    exact scan. Vectors can be added and removed at any time; new ones go
+    to their closest existing bucket.
+    """
+
+    def __init__(self, dimensions, train_size=2048, nprobe=8):
+        self.dimensions = dimensions
+        self.train_size = train_size
+        self.nprobe = nprobe
+        self.ids = []
+        self.vectors = np.empty((0, dimensions), dtype=np.float32)
+        self.alive = np.empty(0, dtype=bool)
+        self.lists = np.empty(0, dtype=np.int32)
+        self.centroids = None
+        self._positions = {}
+
+    def __len__(self):
+        return len(self._positions)
+
+    def _assign(self, vectors):
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def train(self, iterations=10, seed=0):
+        live = self.vectors[self.alive]
+        n_lists = max(1, int(np.sqrt(len(live))))
+        rng = np.random.default_rng(seed)
+        centroids = live[rng.choice(len(live), n_lists, replace=False)]
+        for _ in range(iterations):
+            assignment = np.argmax(live @ centroids.T, axis=1)
+            for index in range(n_lists):
+                members = live[assignment == index]
+                if len(members):
+                    centroid = members.mean(axis=0)
+                    centroids[index] = centroid / (np.linalg.norm(centroid) or 1)
+        self.centroids = centroids
+        self.lists = self._assign(self.vectors)
+
+    def add(self, ids, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dimensions)
+        self.remove(ids)
+        start = len(self.ids)
+        self.ids.extend(ids)
+        self.vectors = np.vstack([self.vectors, vectors])
+        self.alive = np.concatenate([self.alive, np.ones(len(ids), dtype=bool)])
+        lists = self._assign(vectors) if self.centroids is not None else np.zeros(len(ids), dtype=np.int32)
+        self.lists = np.concatenate([self.lists, lists])
+        for offset, job_id in enumerate(ids):
+            self._positions[job_id] = start + offset
+        if self.centroids is None and len(self) >= self.train_size:
+            self.train()
+
+    def remove(self, ids):
+        for job_id in ids:
+            position = self._positions.pop(job_id, None)
+            if position is not None:
+                self.alive[position] = False
+        if len(self.ids) > 1024 and self.alive.sum() < len(self.ids) / 2:
+            self._compact()
+
+    def _compact(self):
+        keep = np.flatnonzero(self.alive)
+        self.ids = [self.ids[position] for position in keep]
+        self.vectors = self.vectors[keep]
+        self.lists = self.lists[keep]
+        self.alive = np.ones(len(keep), dtype=bool)
+        self._positions = {job_id: position for position, job_id in enumerate(self.ids)}
+
+    def search(self, query, k, ids=None):
+        """
+        [(id, cosine similarity)] of the approximate top-k vectors; with
+        `ids`, the exact top-k among those ids only.
+        """
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        mask = self.alive
+        if ids is not None:
+            mask = np.zeros(len(self.ids), dtype=bool)
+            mask[[self._positions[job_id] for job_id in ids if job_id in self._positions]] = True
+        elif self.centroids is not None:
+            probes = np.argsort(-(self.centroids @ query))[:self.nprobe]
+            mask = mask & np.isin(self.lists, probes)
+        rows = np.flatnonzero(mask)
+        if not len(rows):
+            return []
+        similarity = self.vectors[rows] @ query
+        top = np.argpartition(-similarity, min(k, len(rows)) - 1)[:k]
+        top = top[np.argsort(-similarity[top])]
+        return [(self.ids[rows[position]], float(similarity[position])) for position in top]
+
+    def state(self):
+        return {
+            "ids": self.ids, "vectors": self.vectors, "alive": self.alive,
+            "lists": self.lists, "centroids": self.centroids
+        }
+
+    def restore(self, state):
+        self.ids, self.vectors, self.alive = state["ids"], state["vectors"], state["alive"]
+        self.lists, self.centroids = state["lists"], state["centroids"]
+        self._positions = {job_id: position for position, job_id in enumerate(self.ids) if self.alive[position]}
+
+
+def job_text(title, description, max_description=1000):
+    """Text embedded for a job: the title twice (it matters most) plus the start of the description."""
+    title = title or ""
+    return f"{title}. {title}. {(description or '')[:max_description]}"
+
+
+class SemanticJobIndex:
+    """
+    Dense-vector job index for the semantic ranking mode.
+
+    Jobs are encoded once when they are added (title + description) and
+    stored in a VectorIndex; `search` encodes the user's role and skills
+    and returns the nearest jobs. The TF-IDF/SVD encoder is fitted on the
+    first jobs it sees and refitted (re-encoding everything) when the
+    corpus has grown `refit_growth` times; the refit runs without the
+    index lock, so searches keep using the old vectors until it is done.
+    Encoder and vectors are saved to `path` so a restart does not
+    re-encode the corpus.
+    """
+
+    def __init__(self, path, model_name=None, refit_growth=2.0):
+        self.path = path
+        self.model_name = model_name
+        self.refit_growth = refit_growth
+        self.encoder = None
+        self.index = None
+        self._texts = {}
+        self._source_versions = {}
+        self._sources = {}
+        self._lock = threading.RLock()
+        self._refitting = False
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "rb") as state_file:
+                state = pickle.load(state_file)
+            self.encoder, self._texts = state["encoder"], state["texts"]
+            self.index = VectorIndex(state["dimensions"])
+            self.index.restore(state["index"])
+            print(f"✅ Semantic index loaded: {len(self.index)} jobs ({self.encoder.name})")
+        except Exception as e:
+            print(f"⚠️ Could not load semantic index from {self.path}: {e}")
+            self.encoder, self.index, self._texts = None, None, {}
+
+    def save(self):
+        with self._lock:
+            if not self.path or not self._dirty or self.index is None:
+                return
+            state = {
+                "encoder": self.encoder, "texts": self._texts,
+                "dimensions": self.index.dimensions, "index": self.index.state()
+            }
+            temporary = self.path + ".tmp"
+            with open(temporary, "wb") as state_file:
+                pickle.dump(state, state_file)
+            os.replace(temporary, self.path)
+            self._dirty = False
+
+    def _needs_refit(self):
+        fitted_size = getattr(self.encoder, "fitted_size", None)
+        return self.index is None or (fitted_size is not None and len(self._texts) >= fitted_size * self.refit_growth)
+
+    def _refit(self):
+        """
+        Fits a new encoder on every known text and re-encodes all of them
+        outside the index lock, then swaps it in and catches up with the
+        jobs added or removed meanwhile.
+        """
+        with self._lock:
+            if self._refitting or not self._needs_refit():
+                return
+            self._refitting = True
+            encoder, texts = self.encoder, dict(self._texts)
+        try:
+            if encoder is None:
+                encoder = load_encoder(self.model_name)
+            elif isinstance(encoder, TfidfSvdEncoder):
+                encoder = TfidfSvdEncoder(encoder.dimensions)
+            ids = list(texts)
+            encoder.fit([texts[job_id] for job_id in ids])
+            vectors = encoder.encode([texts[job_id] for job_id in ids])
+            index = VectorIndex(vectors.shape[1])
+            index.add(ids, vectors)
+            with self._lock:
+                changed = [job_id for job_id, text in self._texts.items() if texts.get(job_id) != text]
+                index.remove([job_id for job_id in texts if job_id not in self._texts])
+                if changed:
+                    index.add(changed, encoder.encode([self._texts[job_id] for job_id in changed]))
+                self.encoder, self.index = encoder, index
+                self._dirty = True
+        finally:
+            with self._lock:
+                self._refitting = False
+
+    def add(self, jobs):
+        """Encodes and indexes jobs given as {job_id: (title, description)}."""
+        with self._lock:
+            texts = {job_id: job_text(title, description) for job_id, (title, description) in jobs.items()}
+            texts = {job_id: text for job_id, text in texts.items() if self._texts.get(job_id) != text}
+            if not texts:
+                return
+            self._texts.update(texts)
+            # During a refit, new jobs go to the old index (if any); the refit catches up with them
+            refit = self._needs_refit() and not self._refitting
+            if not refit and self.index is not None:
+                ids = list(texts)
+                self.index.add(ids, self.encoder.encode([texts[job_id] for job_id in ids]))
+                self._dirty = True
+        if refit:
+            self._refit()
+
+    def remove(self, job_ids):
+        with self._lock:
+            job_ids = [job_id for job_id in job_ids if job_id in self._texts]
+            for job_id in job_ids:
+                del self._texts[job_id]
+            if self.index is not None and job_ids:
+                self.index.remove(job_ids)
+                self._dirty = True
+
+    def sync(self, source, jobs, version=None):
+        """Same contract as JobIndex.sync, with jobs given as {job_id: (title, description)}."""
+        with self._lock:
+            if version is not None and self._source_versions.get(source) == version:
+                return
+            self._source_versions[source] = version
+            self.remove(self._sources.get(source, set()) - set(jobs))
+            self._sources[source] = set(jobs)
+        self.add(jobs)
+
+    def autosave(self, interval):
+        """Saves the index every `interval` seconds when it changed, on a daemon thread."""
+        def run():
+            while True:
+                threading.Event().wait(interval)
+                try:
+                    self.save()
+                except Exception as e:
+                    print(f"❌ Could not save semantic index: {e}")
+        threading.Thread(target=run, name="semantic-index-autosave", daemon=True).start()
+        return self
+
+    def search(self, preferred_role, skills, k=20, job_ids=None):
+        """
+        [(job_id, similarity)] of the k jobs closest to the role + skills
+        query, among `job_ids` only when given.
+        """
+        with self._lock:
+            if self.index is None or not len(self.index):
+                return []
+            query = " ".join([preferred_role or "", preferred_role or ""] + list(skills or []))
+            return self.index.search(self.encoder.encode([query])[0], k, ids=job_ids)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "encoder": self.encoder.name if self.encoder else None,
+                "jobs": len(self.index) if self.index is not None else 0,
+                "ann_trained": self.index is not None and self.index.centroids is not None
+            }
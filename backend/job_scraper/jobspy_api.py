@@ -1,13 +1,58 @@
-from fastapi import FastAPI
+import asyncio
+import os
+import sys
+import time
+
+from fastapi import FastAPI, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from jobspy import scrape_jobs
 import pandas as pd
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.scrape_orchestrator import all_failed, create_orchestrator, is_partial, status_header
+from response_encoding import RESPONSE_FORMATS, arrow_available, dumps, frame_records
+from scrape_cache import CacheEntry, ScrapeCache
+from scrape_gate import Overloaded, ScrapeGate, scrape_key
+
 app = FastAPI()
 
-@app.get("/scrape_jobs")
-async def get_jobs(search_term: str, location: str, results_wanted: int = 20):
-    jobs = scrape_jobs(
-        site_name=["indeed", "linkedin", "glassdoor", "bayt", "naukri"],
+SITES = ["indeed", "linkedin", "glassdoor", "bayt", "naukri"]
+THREADPOOL_ENCODE_ROWS = 1000
+
+# Scrapes run on a bounded thread pool so the event loop keeps serving; identical
+# concurrent requests share one scrape, and overload is answered with 429/503.
+# Requests reach this service from server.js on 127.0.0.1, so clients are told apart by
+# the X-Client-Id header it forwards; without it the per-client limit does not apply
+scrape_gate = ScrapeGate(
+    workers=int(os.environ.get("SCRAPE_CONCURRENCY", "4")),
+    max_queue=int(os.environ.get("SCRAPE_MAX_QUEUE", "16")),
+    max_per_client=int(os.environ.get("SCRAPE_MAX_PER_CLIENT", "4"))
+)
+
+# One concurrent call per job board, each with its own deadline and retries;
+# boards that miss their deadline are left out and reported in the headers
+scrape_orchestrator = create_orchestrator(scrape_jobs, workers=scrape_gate.workers * len(SITES))
+
+# With hours_old=72 results barely change within minutes: fresh entries are served
+# as they are, stale ones are served while a background scrape replaces them
+scrape_cache = ScrapeCache(
+    os.environ.get("SCRAPE_CACHE_PATH", "scrape_cache.sqlite3"),
+    ttl=int(os.environ.get("SCRAPE_CACHE_TTL", "900")),
+    stale_ttl=int(os.environ.get("SCRAPE_CACHE_STALE_TTL", "3600")),
+    capacity=int(os.environ.get("SCRAPE_CACHE_SIZE", "500")),
+    max_bytes=int(os.environ.get("SCRAPE_CACHE_MAX_MB", "64")) * 1024 * 1024
+)
+# Responses missing some boards are fresh only briefly, so the next request after that
+# refreshes them; responses where no board answered are never stored
+SCRAPE_CACHE_PARTIAL_TTL = int(os.environ.get("SCRAPE_CACHE_PARTIAL_TTL", "60"))
+_revalidating = {}
+revalidation_stats = {"started": 0, "failed": 0, "skipped": 0}
+
+def run_scrape(search_term, location, results_wanted):
+    """Blocking: scrapes every board and returns (typed records, headers, orchestrator result)."""
+    result = scrape_orchestrator.scrape(
+        SITES,
         search_term=search_term,
         google_search_term=f"{search_term} jobs near {location}",
         location=location,
@@ -15,14 +60,107 @@ async def get_jobs(search_term: str, location: str, results_wanted: int = 20):
         hours_old=72,
         country_indeed="USA"
     )
+    # Per-site status, e.g. "indeed=ok:812ms,glassdoor=timeout:30000ms"
+    headers = {
+        "X-Scrape-Sites": status_header(result),
+        "X-Scrape-Partial": "true" if is_partial(result) else "false"
+    }
 
+    jobs = result.jobs
     if jobs.empty:
-        return {"message": "No jobs found"}
+        return {"message": "No jobs found"}, headers, result
+
+    # Numbers and dates keep their types; missing values become null
+    return frame_records(jobs), headers, result
+
+def scrape_and_cache(key, search_term, location, results_wanted):
+    """
+    Blocking: scrapes and returns the response's cache entry. When no board
+    answered nothing is stored and a cached entry is kept; a partial response
+    does not replace a complete one that can still be served.
+    """
+    body, headers, result = run_scrape(search_term, location, results_wanted)
+    if all_failed(result):
+        cached = scrape_cache.peek(key)
+        print(f"⚠️ No job board answered for {key}{', keeping the cached response' if cached else ''}")
+        return cached if cached is not None else CacheEntry(body, headers, time.time(), 0)
+    if is_partial(result):
+        cached = scrape_cache.peek(key)
+        if cached is not None and cached.headers.get("X-Scrape-Partial") != "true":
+            return cached
+        return scrape_cache.put(key, body, headers, ttl=SCRAPE_CACHE_PARTIAL_TTL)
+    return scrape_cache.put(key, body, headers)
 
-    # ✅ Convert NaN values explicitly to empty strings
-    jobs = jobs.astype(str).replace("nan", "")
+async def _revalidate(key, search_term, location, results_wanted):
+    try:
+        await scrape_gate.run(key, lambda: scrape_and_cache(key, search_term, location, results_wanted))
+    except Overloaded:
+        # Busy: the stale entry keeps being served and the next request tries again
+        revalidation_stats["skipped"] += 1
+    except Exception as e:
+        revalidation_stats["failed"] += 1
+        print(f"❌ Background refresh of {key} failed: {e}")
+
+def revalidate(key, search_term, location, results_wanted):
+    """Refreshes `key` in the background unless a refresh is already running."""
+    if key in _revalidating:
+        return
+    revalidation_stats["started"] += 1
+    task = asyncio.create_task(_revalidate(key, search_term, location, results_wanted))
+    _revalidating[key] = task
+    task.add_done_callback(lambda _: _revalidating.pop(key, None))
+
+@app.get("/scrape_jobs")
+async def get_jobs(search_term: str, location: str, request: Request, results_wanted: int = 20,
+                   response_format: str = Query("json", alias="format"), offset: int = 0, limit: int = None):
+    """
+    format=json (records, default), ndjson (streamed, one job per line),
+    columns ({"columns", "rows", "data": {column: values}}) or arrow (IPC
+    stream, needs pyarrow). offset/limit select a page of the jobs.
+    """
+    if response_format not in RESPONSE_FORMATS:
+        return JSONResponse({"error": f"format must be one of {', '.join(RESPONSE_FORMATS)}"}, status_code=400)
+    if response_format == "arrow" and not arrow_available():
+        return JSONResponse({"error": "format=arrow needs pyarrow, which is not installed"}, status_code=501)
+    if offset < 0 or (limit is not None and limit < 0):
+        return JSONResponse({"error": "offset and limit must not be negative"}, status_code=400)
+    key = scrape_key(search_term, location, results_wanted)
+    entry, state = scrape_cache.get(key)
+    if entry is None:
+        try:
+            entry = await scrape_gate.run(
+                key, lambda: scrape_and_cache(key, search_term, location, results_wanted),
+                client=request.headers.get("X-Client-Id")
+            )
+        except Overloaded as e:
+            return JSONResponse({"error": e.reason}, status_code=e.status_code, headers={"Retry-After": str(e.retry_after)})
+    elif state == "STALE":
+        revalidate(key, search_term, location, results_wanted)
+    jobs = entry.body if isinstance(entry.body, list) else []
+    headers = {
+        **entry.headers,
+        "X-Cache": state,
+        "Age": str(int(time.time() - entry.fetched_at)),
+        "X-Total-Count": str(len(jobs))
+    }
+    if response_format == "json" and not jobs:
+        return Response(dumps(entry.body), media_type="application/json", headers=headers)
+    page = jobs[offset:offset + limit if limit is not None else None]
+    encode, media_type = RESPONSE_FORMATS[response_format]
+    if response_format == "ndjson":
+        return StreamingResponse(encode(page), media_type=media_type, headers=headers)
+    # Large pages take tens of milliseconds to encode; keep that off the event loop
+    body = await run_in_threadpool(encode, page) if len(page) > THREADPOOL_ENCODE_ROWS else encode(page)
+    return Response(body, media_type=media_type, headers=headers)
 
-    return jobs.to_dict(orient="records")
+@app.get("/scrape_stats")
+async def scrape_stats():
+    """Calls, outcomes and p50/p95 latency per job board, the request queue and the result cache."""
+    return {
+        **scrape_orchestrator.stats(),
+        "requests": scrape_gate.stats(),
+        "cache": {**scrape_cache.stats(), "revalidating": len(_revalidating), "revalidations": dict(revalidation_stats)}
+    }
 
 if __name__ == "__main__":
     import uvicorn
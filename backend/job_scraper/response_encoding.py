@@ -0,0 +1,122 @@
+import json
+import math
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # stdlib fallback: same output, several times slower
+    orjson = None
+
+NDJSON_CHUNK_ROWS = 500
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+def _default(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "item"):  # numpy scalars
+        return value.item()
+    return str(value)
+
+
+def _finite(value):
+    """`value` with NaN and infinities as None, as orjson writes them (stdlib json writes invalid NaN)."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    return value
+
+
+def dumps(value):
+    """JSON bytes; NaN becomes null, dates ISO strings and numpy scalars plain numbers."""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(_finite(value), default=lambda item: _finite(_default(item)), ensure_ascii=False).encode("utf-8")
+
+
+def loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _column_values(column):
+    """Column as plain Python values with every kind of missing value as None."""
+    if pd.api.types.is_datetime64_any_dtype(column):
+        column = column.map(lambda value: value.isoformat(), na_action="ignore")
+    values = column.tolist()
+    if isinstance(column.dtype, np.dtype) and column.dtype.kind in "iub":
+        return values  # plain numpy ints and bools cannot hold missing values
+    missing = column.isna().to_numpy()
+    if missing.any():
+        values = [None if gone else value for value, gone in zip(values, missing)]
+    return values
+
+
+def frame_records(jobs):
+    """
+    Typed JSON-ready records of a scrape frame: numbers stay numbers,
+    missing values are None and timestamps ISO strings.
+    """
+    columns = [str(name) for name in jobs.columns]
+    values = [_column_values(jobs[name]) for name in jobs.columns]
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+def record_columns(records):
+    """Column names in first-seen order; records from one frame share them."""
+    columns = {}
+    for record in records:
+        columns.update(dict.fromkeys(record))
+    return list(columns)
+
+
+def encode_json(records):
+    return dumps(records)
+
+
+def encode_columns(records):
+    """{"columns": [...], "rows": n, "data": {column: [values]}}: no per-row key repetition."""
+    columns = record_columns(records)
+    return dumps({
+        "columns": columns,
+        "rows": len(records),
+        "data": {column: [record.get(column) for record in records] for column in columns}
+    })
+
+
+def iter_ndjson(records):
+    """NDJSON in chunks of NDJSON_CHUNK_ROWS lines, for a streaming response."""
+    for start in range(0, len(records), NDJSON_CHUNK_ROWS):
+        yield b"".join(dumps(record) + b"\n" for record in records[start:start + NDJSON_CHUNK_ROWS])
+
+
+def encode_arrow(records):
+    """Arrow IPC stream of the records; needs pyarrow, imported on first use."""
+    import pyarrow as pa
+
+    table = pa.Table.from_pylist(records) if records else pa.table({})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def arrow_available():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+# format query value -> (encoder, media type); ndjson's encoder yields chunks for a streaming response
+RESPONSE_FORMATS = {
+    "json": (encode_json, "application/json"),
+    "columns": (encode_columns, "application/json"),
+    "ndjson": (iter_ndjson, "application/x-ndjson"),
+    "arrow": (encode_arrow, ARROW_MEDIA_TYPE)
+}
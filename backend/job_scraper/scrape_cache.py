@@ -0,0 +1,143 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from response_encoding import dumps, loads
+
+# `body` and `headers` as returned by the scrape; `size` is the body's encoded length;
+# `ttl` is how long this entry stays fresh, None for the cache's default
+CacheEntry = namedtuple("CacheEntry", ["body", "headers", "fetched_at", "size", "ttl"], defaults=[None])
+
+
+def entry_key(key):
+    """Text form of a scrape_key tuple for the SQLite tier."""
+    return json.dumps(list(key))
+
+
+class ScrapeCache:
+    """
+    Stale-while-revalidate cache of scrape responses keyed by scrape_key.
+
+    An entry younger than `ttl` is fresh. Up to `stale_ttl` it is still
+    served, but the caller should refresh it in the background; older
+    entries are misses. put() can give an entry a shorter `ttl` of its
+    own, for responses worth replacing sooner. The memory tier is an LRU bounded by `capacity`
+    entries and `max_bytes` of encoded bodies. Every entry is also
+    written to a SQLite file, so a restart starts with a warm cache;
+    memory misses are read from it.
+    """
+
+    def __init__(self, path, ttl=900, stale_ttl=3600, capacity=500, max_bytes=64 * 1024 * 1024):
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self._memory = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS scrape_cache "
+            "(key TEXT PRIMARY KEY, fetched_at REAL NOT NULL, body TEXT NOT NULL, headers TEXT NOT NULL)"
+        )
+        if "ttl" not in {row[1] for row in self._db.execute("PRAGMA table_info(scrape_cache)")}:
+            self._db.execute("ALTER TABLE scrape_cache ADD COLUMN ttl REAL")
+        self._db.execute("DELETE FROM scrape_cache WHERE fetched_at < ?", (time.time() - self.stale_ttl,))
+        self._db.commit()
+        self.hits = 0
+        self.stale_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _remember(self, key, entry):
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.size
+        self._memory[key] = entry
+        self._bytes += entry.size
+        while len(self._memory) > 1 and (len(self._memory) > self.capacity or self._bytes > self.max_bytes):
+            _, evicted = self._memory.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+
+    def _load(self, key):
+        row = self._db.execute(
+            "SELECT fetched_at, body, headers, ttl FROM scrape_cache WHERE key = ?", (entry_key(key),)
+        ).fetchone()
+        if row is None:
+            return None
+        fetched_at, body, headers, ttl = row
+        return CacheEntry(loads(body), json.loads(headers), fetched_at, len(body), ttl)
+
+    def _lookup(self, key):
+        """The entry for `key` while it can still be served, else None. Caller holds the lock."""
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+        else:
+            entry = self._load(key)
+            if entry is not None and time.time() - entry.fetched_at < self.stale_ttl:
+                self._remember(key, entry)
+                self.disk_hits += 1
+        if entry is None or time.time() - entry.fetched_at >= self.stale_ttl:
+            return None
+        return entry
+
+    def get(self, key):
+        """
+        (entry, state) for `key`, where state is "HIT" (fresh), "STALE"
+        (serve it and revalidate) or "MISS" (entry is None).
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                self.misses += 1
+                return None, "MISS"
+            if time.time() - entry.fetched_at >= (self.ttl if entry.ttl is None else entry.ttl):
+                self.stale_hits += 1
+                return entry, "STALE"
+            self.hits += 1
+            return entry, "HIT"
+
+    def peek(self, key):
+        """The servable entry for `key`, fresh or stale, without counting a lookup."""
+        with self._lock:
+            return self._lookup(key)
+
+    def put(self, key, body, headers, ttl=None):
+        """
+        Stores a fresh response in both tiers and returns its entry; `ttl`
+        shortens how long it stays fresh. Blocking (SQLite write).
+        """
+        encoded = dumps(body)
+        entry = CacheEntry(body, dict(headers), time.time(), len(encoded), None if ttl is None else min(ttl, self.ttl))
+        with self._lock:
+            self._remember(key, entry)
+            self._db.execute(
+                "INSERT OR REPLACE INTO scrape_cache (key, fetched_at, body, headers, ttl) VALUES (?, ?, ?, ?, ?)",
+                (entry_key(key), entry.fetched_at, encoded.decode("utf-8"), json.dumps(entry.headers), entry.ttl)
+            )
+            self._db.commit()
+        return entry
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "ttl_seconds": self.ttl,
+                "stale_ttl_seconds": self.stale_ttl,
+                "memory_entries": len(self._memory),
+                "memory_capacity": self.capacity,
+                "memory_bytes": self._bytes,
+                "memory_max_bytes": self.max_bytes,
+                "disk_entries": self._db.execute("SELECT COUNT(*) FROM scrape_cache").fetchone()[0],
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else None
+            }
@@ -0,0 +1,114 @@
+import asyncio
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Overloaded(Exception):
+    """Raised instead of queueing more work; carries the HTTP status and a Retry-After in seconds."""
+
+    def __init__(self, status_code, retry_after, reason):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+def scrape_key(search_term, location, results_wanted):
+    """Normalized request identity: requests with the same key share one scrape."""
+    return " ".join(search_term.lower().split()), " ".join(location.lower().split()), int(results_wanted)
+
+
+class ScrapeGate:
+    """
+    Runs blocking scrapes off the event loop with admission control.
+
+    - Scrapes run on a ThreadPoolExecutor of `workers` threads, so the
+      uvicorn loop keeps serving other requests while they block.
+    - Single flight: a request whose key is already being scraped awaits
+      that scrape instead of starting its own.
+    - At most `workers + max_queue` distinct scrapes may be running or
+      queued. Beyond that, new keys get 503.
+    - One client may have at most `max_per_client` scrapes it started
+      running or queued; more get 429 (0 turns the limit off). Joining
+      a running scrape is always allowed and does not count.
+    - Retry-After is estimated from recent scrape durations and the
+      backlog ahead of the caller.
+    """
+
+    def __init__(self, workers=4, max_queue=16, max_per_client=4, initial_estimate=10.0):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.max_per_client = max_per_client
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape-request")
+        self._in_flight = {}
+        self._clients = {}
+        self._duration = initial_estimate
+        self._lock = threading.Lock()
+        self.started = 0
+        self.coalesced = 0
+        self.rejected = {429: 0, 503: 0}
+
+    def retry_after(self, backlog):
+        """Seconds until a slot is likely free with `backlog` scrapes ahead, at least 1."""
+        waves = max(1, math.ceil((backlog - self.workers + 1) / self.workers))
+        return max(1, min(300, math.ceil(self._duration * waves)))
+
+    def _reject(self, status_code, backlog, reason):
+        self.rejected[status_code] += 1
+        raise Overloaded(status_code, self.retry_after(backlog), reason)
+
+    def _timed(self, fn):
+        started = time.time()
+        try:
+            return fn()
+        finally:
+            with self._lock:
+                # Moving average of scrape durations for Retry-After
+                self._duration = 0.8 * self._duration + 0.2 * (time.time() - started)
+
+    def _finished(self, key, client):
+        self._in_flight.pop(key, None)
+        if client is not None:
+            self._clients[client] -= 1
+            if not self._clients[client]:
+                del self._clients[client]
+
+    async def run(self, key, fn, client=None):
+        """
+        Result of `fn()` for `key`: the running scrape's if there is one,
+        else a new one on the executor, counted against `client` until it
+        finishes. Raises Overloaded when over limits.
+        """
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            if client is not None and self.max_per_client and self._clients.get(client, 0) >= self.max_per_client:
+                self._reject(429, len(self._in_flight), f"More than {self.max_per_client} scrapes in flight for this client")
+            if len(self._in_flight) >= self.workers + self.max_queue:
+                self._reject(503, len(self._in_flight), "Scrape queue is full")
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, self._timed, fn)
+            self._in_flight[key] = future
+            self.started += 1
+            if client is not None:
+                self._clients[client] = self._clients.get(client, 0) + 1
+            future.add_done_callback(lambda _: self._finished(key, client))
+        # shield: one caller disconnecting must not cancel the scrape the others wait on
+        return await asyncio.shield(future)
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "max_per_client": self.max_per_client,
+            "clients_scraping": len(self._clients),
+            "in_flight": len(self._in_flight),
+            "started": self.started,
+            "coalesced": self.coalesced,
+            "rejected_429": self.rejected[429],
+            "rejected_503": self.rejected[503],
+            "avg_scrape_seconds": round(self._duration, 2)
+        }
@@ -30,7 +30,7 @@ const filterJobs = (jobs, { jobType, salary, experience, remote, sortBy, locatio
   }
 
   if (remote) {
-    filteredJobs = filteredJobs.filter((job) => job.is_remote === "yes");
+    filteredJobs = filteredJobs.filter((job) => job.is_remote === true || job.is_remote === "yes");
   }
 
   // ✅ Sorting Logic
@@ -53,6 +53,8 @@ app.get("/api/jobs", async (req, res) => {
     // Fetch jobs from the job scraping API
     const response = await axios.get(`http://127.0.0.1:8000/scrape_jobs`, {
       params: { search_term: keyword, location },
+      // Every request reaches the scraper from this host; tell it who the user is
+      headers: { "X-Client-Id": req.ip },
     });
 
     console.log("Raw API Response: ", response.data);
@@ -0,0 +1,156 @@
+import time
+_import_started = time.time()
+
+import os
+import sys
+import queue
+import threading
+from concurrent.futures import Future
+from flask import Flask, jsonify, request
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.model_manager import ModelManager
+from common.ner_backends import load_ner_model
+from common.ner_batcher import BatchedNER
+
+app = Flask(__name__)
+
+MODEL_NAME = os.environ.get("NER_MODEL", "dslim/bert-base-NER")
+# Texts collected into one model pass, and how long the first of them waits for company
+MAX_BATCH_TEXTS = int(os.environ.get("NER_SERVER_MAX_BATCH", "32"))
+MAX_WAIT_MS = float(os.environ.get("NER_SERVER_MAX_WAIT_MS", "10"))
+
+
+def load_extractors():
+    """One model copy behind a BatchedNER per aggregation strategy the services use."""
+    from transformers import pipeline
+    model, tokenizer, backend = load_ner_model(MODEL_NAME)
+    print(f"✅ NER server model {MODEL_NAME} on {backend} backend")
+    return {
+        "none": BatchedNER(pipeline("ner", model=model, tokenizer=tokenizer)),
+        "simple": BatchedNER(pipeline("ner", model=model, tokenizer=tokenizer, aggregation_strategy="simple"))
+    }
+
+
+def warmup_extractors(extractors):
+    for extractor in extractors.values():
+        extractor(["Warmup: senior Python developer with React, AWS and Docker experience in Bangalore."])
+
+
+ner_model = ModelManager(MODEL_NAME, load_extractors, warmup_extractors, started=_import_started).start()
+
+
+def to_json(entity):
+    """Entity dict with numpy scalars turned into plain numbers."""
+    return {key: value.item() if hasattr(value, "item") else value for key, value in entity.items()}
+
+
+class MicroBatcher:
+    """
+    Collects concurrent /ner calls into shared model passes. The worker
+    takes the oldest call, then keeps taking calls until `max_texts` texts
+    are queued or `max_wait` seconds have passed since it took the first,
+    runs each aggregation group through its BatchedNER once, and hands
+    every caller its own slice of the results.
+    """
+
+    def __init__(self, max_texts, max_wait):
+        self.max_texts = max_texts
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.batches = 0
+        self.texts = 0
+        threading.Thread(target=self._run, name="ner-micro-batcher", daemon=True).start()
+
+    def submit(self, texts, aggregation):
+        future = Future()
+        self._queue.put((aggregation, texts, future))
+        return future.result()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        size = len(batch[0][1])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_texts:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                call = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(call)
+            size += len(call[1])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            extractors = ner_model.get(None)
+            groups = {}
+            for call in batch:
+                groups.setdefault(call[0], []).append(call)
+            for aggregation, calls in groups.items():
+                try:
+                    texts = [text for _, call_texts, _ in calls for text in call_texts]
+                    results = extractors[aggregation](texts)
+                    offset = 0
+                    for _, call_texts, future in calls:
+                        future.set_result([
+                            [to_json(entity) for entity in entities]
+                            for entities in results[offset:offset + len(call_texts)]
+                        ])
+                        offset += len(call_texts)
+                except Exception as e:
+                    for _, _, future in calls:
+                        future.set_exception(e)
+            with self._lock:
+                self.calls += len(batch)
+                self.batches += 1
+                self.texts += sum(len(call[1]) for call in batch)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "batches": self.batches,
+                "texts": self.texts,
+                "calls_per_batch": round(self.calls / self.batches, 2) if self.batches else None,
+                "texts_per_batch": round(self.texts / self.batches, 2) if self.batches else None
+            }
+
+
+batcher = MicroBatcher(MAX_BATCH_TEXTS, MAX_WAIT_MS / 1000)
+
+
+@app.route('/ner', methods=['POST'])
+def ner():
+    """Entities for {"texts": [...], "aggregation": "none" | "simple"}, one list per text."""
+    payload = request.get_json(force=True, silent=True)
+    texts = payload.get("texts") if isinstance(payload, dict) else None
+    if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+        return jsonify({"error": "texts must be a list of strings"}), 400
+    aggregation = payload.get("aggregation") or "none"
+    if aggregation not in ("none", "simple"):
+        return jsonify({"error": f"Unknown aggregation {aggregation}"}), 400
+    if not ner_model.get(None):
+        return jsonify({"error": "NER model failed to load", "model": ner_model.status()}), 503
+    return jsonify({"entities": batcher.submit(texts, aggregation)})
+
+
+@app.route('/ready', methods=['GET'])
+def ready():
+    """Readiness probe: 200 once the model is loaded and warmed up, 503 before."""
+    return jsonify({"ready": ner_model.ready, "models": [ner_model.status()]}), 200 if ner_model.ready else 503
+
+
+@app.route('/stats', methods=['GET'])
+def stats():
+    return jsonify(batcher.stats())
+
+
+if __name__ == '__main__':
+    print("🚀 ner_server is starting...")
+    app.run(host="127.0.0.1", port=int(os.environ.get("NER_SERVER_PORT", "5004")), threaded=True)
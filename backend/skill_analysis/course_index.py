@@ -0,0 +1,103 @@
+import os
+import sys
+import threading
+import time
+
+from fuzzywuzzy import fuzz
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.course_catalog import DEFAULT_CATALOG_PATH, open_catalog  # noqa: E402
+
+# Skills whose resolved course lists are kept per catalog version
+RESOLVED_CACHE_SIZE = 10000
+
+
+class CourseIndex:
+    """
+    Coursera courses indexed by tag, over the shared binary catalog
+    (common.course_catalog).
+
+    The catalog maps each normalized tag to its course ids, pre-sorted by
+    rating (best first), then difficulty (easiest first), then CSV order.
+    A skill is resolved against the distinct tags only (a few dozen,
+    instead of every tag of every course) with the same
+    partial_ratio >= threshold rule as before, and its ordered course
+    list is memoized. A lookup is then a dict hit plus a slice, and
+    records are decoded from the mmap for the returned courses only.
+    The catalog is rebuilt and reopened when the CSV changes, checked at
+    most every `check_interval` seconds.
+    """
+
+    def __init__(self, csv_path, catalog_path=DEFAULT_CATALOG_PATH, check_interval=30):
+        self.csv_path = csv_path
+        self.catalog_path = catalog_path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._checked_at = time.time()
+        self.loaded_at = None
+        self.reloads = 0
+        self._load()
+
+    def _load(self):
+        started = time.time()
+        catalog = open_catalog(self.csv_path, self.catalog_path)
+        # One dict swapped in whole, so a lookup never mixes two versions
+        self._state = {"catalog": catalog, "resolved": {}}
+        self.loaded_at = time.time()
+        print(f"📚 Course index: {len(catalog)} courses, {len(catalog.index)} tags in {self.loaded_at - started:.2f}s")
+
+    def maybe_reload(self):
+        """Reopens the catalog if the CSV changed; a failed reload keeps the current one."""
+        now = time.time()
+        if now - self._checked_at < self.check_interval:
+            return False
+        with self._lock:
+            if now - self._checked_at < self.check_interval:
+                return False
+            self._checked_at = now
+            try:
+                if self._state["catalog"].is_fresh(self.csv_path):
+                    return False
+                self._load()
+                self.reloads += 1
+                return True
+            except Exception as e:
+                print(f"❌ Course index reload failed, keeping the loaded version: {e}")
+                return False
+
+    @staticmethod
+    def _course_ids(state, skill, threshold):
+        key = (skill.lower(), threshold)
+        ids = state["resolved"].get(key)
+        if ids is None:
+            catalog = state["catalog"]
+            matched = set()
+            for tag in catalog.index:
+                if fuzz.partial_ratio(key[0], tag) >= threshold:
+                    matched.update(catalog.tag_course_ids(tag).tolist())
+            ids = sorted(matched, key=catalog.rank.__getitem__)
+            if len(state["resolved"]) >= RESOLVED_CACHE_SIZE:
+                state["resolved"].clear()
+            state["resolved"][key] = ids
+        return ids
+
+    def course_ids(self, skill, threshold=70):
+        """Ids of courses with a tag matching `skill`, best first."""
+        return self._course_ids(self._state, skill, threshold)
+
+    def courses_for(self, skill, k=12, threshold=70):
+        """Top `k` course records for `skill`, tagged with `for_skill`."""
+        state = self._state
+        catalog = state["catalog"]
+        return [dict(catalog.record(course_id), for_skill=skill) for course_id in self._course_ids(state, skill, threshold)[:k]]
+
+    def stats(self):
+        state = self._state
+        return {
+            "courses": len(state["catalog"]),
+            "tags": len(state["catalog"].index),
+            "catalog": state["catalog"].path,
+            "resolved_skills": len(state["resolved"]),
+            "loaded_at": self.loaded_at,
+            "reloads": self.reloads
+        }
@@ -1,15 +1,27 @@
+import time
+_import_started = time.time()
+
 import os
+import sys
 import ast
+import hashlib
 import math
-import pandas as pd
-import re
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from flask_cors import CORS
 from google.cloud import firestore
 from jobspy import scrape_jobs
-from transformers import AutoTokenizer, AutoModelForTokenClassification, pipeline
 from fuzzywuzzy import fuzz
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.skill_matcher import SkillMatcher
+from common.model_manager import ModelManager, load_ner, warmup_ner
+from common.course_catalog import DEFAULT_CATALOG_PATH, DEFAULT_CSV_PATH
+from common.skill_warehouse import DEFAULT_WAREHOUSE_PATH, SkillWarehouse
+from common.scrape_orchestrator import create_orchestrator
+from skill_validator import SkillValidator
+from course_index import CourseIndex
+from trending_skills import TrendingSkills, key_filter, parse_windows
+
 app = Flask(__name__)
 CORS(app)
 
@@ -19,26 +31,25 @@ os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = r"service-account-file.json"
 # Initialize Firestore
 db = firestore.Client()
 
-# Global variable to store the NER pipeline
-_ner_pipeline = None
-
-def get_ner_pipeline():
-    global _ner_pipeline
-    if _ner_pipeline is None:
-        model_name = "dslim/bert-base-NER"
-        tokenizer = AutoTokenizer.from_pretrained(model_name)
-        model = AutoModelForTokenClassification.from_pretrained(model_name)
-        _ner_pipeline = pipeline("ner", model=model, tokenizer=tokenizer, aggregation_strategy="simple")
-    return _ner_pipeline
-
-# Load course dataset
-COURSE_CSV_PATH = "coursera_courses.csv"
-courses_df = pd.read_csv(COURSE_CSV_PATH)
-
-# Clean and normalize tags
-courses_df["Tags"] = courses_df["Tags"].apply(
-    lambda x: [tag.strip(" '[]") for tag in x.split(',')] if isinstance(x, str) else []
+# NER pipeline (batched over many descriptions at once), loaded and warmed up in
+# the background so the first request does not pay for it
+ner_model = ModelManager(
+    "dslim/bert-base-NER",
+    lambda: load_ner("dslim/bert-base-NER", aggregation_strategy="simple"),
+    warmup_ner,
+    started=_import_started
+).start()
+# Seconds a request waits for the NER model before extracting with patterns only
+MODEL_WAIT_TIMEOUT = float(os.environ.get("MODEL_WAIT_TIMEOUT", "2"))
+
+# Course dataset: the shared binary catalog built from the CSV, rebuilt when the CSV changes
+COURSE_CSV_PATH = os.environ.get("COURSE_CSV_PATH", DEFAULT_CSV_PATH)
+COURSE_CATALOG_PATH = os.environ.get("COURSE_CATALOG_PATH", DEFAULT_CATALOG_PATH)
+course_index = CourseIndex(
+    COURSE_CSV_PATH, COURSE_CATALOG_PATH, check_interval=float(os.environ.get("COURSE_RELOAD_INTERVAL", "30"))
 )
+# Course recommendations returned per skill-gap analysis
+MAX_RECOMMENDED_COURSES = 12
 
 # Predefined known skills
 sales_skills = [
@@ -103,6 +114,15 @@ computer_science_skills = [
 
 # Combined known skills list for validation
 known_skills = set(skill.lower() for skill in sales_skills + computer_science_skills)
+# Exact, substring and fuzzy lookups over known_skills, built once
+skill_validator = SkillValidator(known_skills)
+
+# Technical skills picked up by pattern matching alongside NER
+TECH_PATTERN_SKILLS = [
+    "python", "java", "javascript", "react", "angular", "vue", "node.js", "html", "css",
+    "sql", "aws", "azure", "docker", "kubernetes", "machine learning", "data science"
+]
+tech_pattern = SkillMatcher(TECH_PATTERN_SKILLS, expand_variants=False)
 
 # --- Utility Functions ---
 
@@ -132,99 +152,197 @@ def fuzzy_match(text1, text2, threshold=70):
     return fuzz.partial_ratio(text1.lower(), text2.lower()) >= threshold
 
 def is_valid_skill(skill, known_skills, threshold=85):
-    """Improved skill validation with exact matching prioritized."""
-    # Direct match first (case insensitive)
-    if skill.lower() in [ks.lower() for ks in known_skills]:
-        return True
-    
-    # Check for substring matches
-    for known_skill in known_skills:
-        if skill.lower() in known_skill.lower() or known_skill.lower() in skill.lower():
-            # For very short skills, require exact match
-            if len(skill) < 3:
-                continue
-            return True
-    
-    # Finally try fuzzy matching with higher threshold
-    for known_skill in known_skills:
-        if fuzzy_match(skill, known_skill, threshold):
-            return True
-    
-    return False
-
-def extract_skills(text):
-    """Extract skills using NER and additional pattern matching."""
+    """
+    Improved skill validation with exact matching prioritized: exact match,
+    then substring either way (skills of 3+ characters), then fuzzy match.
+    """
+    validator = skill_validator if known_skills is skill_validator.source else SkillValidator(known_skills)
+    return validator.is_valid(skill, threshold)
+
+def extract_skills(text, ner_results=None):
+    """Extract skills using NER and additional pattern matching.
+    `ner_results` can carry entities already computed by the batched NER model for this text."""
     if not text:
         return []
 
-    # Extract skills using NER with aggregation strategy
-    ner_results = get_ner_pipeline()(text)
+    # Extract skills using NER with aggregation strategy (skipped while the model is loading)
+    if ner_results is None:
+        batched_ner = ner_model.get(MODEL_WAIT_TIMEOUT)
+        ner_results = batched_ner([text])[0] if batched_ner else []
     ner_skills = []
     
     for entity in ner_results:
         if entity["entity_group"] in ["ORG", "MISC"]:
             ner_skills.append(entity["word"].lower())
 
-    # Add regex pattern matching for technical skills
-    tech_pattern = r'\b(python|java|javascript|react|angular|vue|node\.js|html|css|sql|aws|azure|docker|kubernetes|machine learning|data science)\b'
-    pattern_skills = [match.lower() for match in re.findall(tech_pattern, text.lower())]
+    # Add pattern matching for technical skills
+    pattern_skills = tech_pattern.find_skills(text.lower())
     
     # Combine skills from both methods
     all_skills = list(set(ner_skills + pattern_skills))
     return list(set(clean_skills(all_skills)))
 
-def get_validated_skills_from_job_descriptions(search_term="software engineer", results_wanted=30):
-    """Extract and validate skills from job descriptions - consolidated function for both endpoints."""
-    try:
-        jobs = scrape_jobs(
-            site_name=["indeed", "linkedin", "glassdoor"],
-            search_term=search_term,
-            location="remote",
-            results_wanted=results_wanted,
-            hours_old=72,
-            country_indeed="USA"
-        )
-
-        descriptions = jobs["description"].dropna().tolist()
-        all_extracted_skills = []
-
-        # Extract skills from job descriptions
-        for desc in descriptions:
-            extracted = extract_skills(desc)
-            # Apply normalization to standardize terms
-            normalized = [normalize_alias(skill) for skill in extracted]
-            all_extracted_skills.extend(normalized)
-
-        # Filter skills against known skills list to eliminate hallucinations
-        valid_skills = [
-            skill for skill in all_extracted_skills
-            if is_valid_skill(skill, known_skills)
-        ]
-
-        # Get trending skills (most frequently occurring valid skills)
-        trending_skills = pd.Series(valid_skills).value_counts().head(10).index.tolist()
-        
-        print(f"Trending skills after validation: {trending_skills}")
-        
-        return {
-            "valid_skills": valid_skills,
-            "trending_skills": trending_skills
-        }
-
-    except Exception as e:
-        print(f"❌ Error scraping jobs: {e}")
-        return {
-            "valid_skills": [],
-            "trending_skills": []
-        }
+def scrape_validated_skills(search_term, location, results_wanted=30):
+    """
+    Scrapes recent postings for the search and returns (posting_id, skills)
+    pairs with each posting's normalized, validated skills. Runs on the
+    trending-skills scheduler threads, so it waits for the NER model.
+    Raises ScrapeFailed when no job board answered, so the trending view
+    keeps its previous counts instead of recording an empty refresh.
+    """
+    jobs = scrape_orchestrator.scrape_answered(
+        ["indeed", "linkedin", "glassdoor"],
+        search_term=search_term,
+        location=location,
+        results_wanted=results_wanted,
+        hours_old=72,
+        country_indeed="USA"
+    ).jobs
+    if "description" not in jobs.columns:
+        return []
+    jobs = jobs[jobs["description"].notna()]
+    descriptions = jobs["description"].tolist()
+    urls = jobs["job_url"].tolist() if "job_url" in jobs.columns else [None] * len(descriptions)
+
+    # Extract skills from job descriptions, running NER over all of them in batches
+    batched_ner = ner_model.get(None)
+    ner_batches = batched_ner(descriptions) if batched_ner else [[] for _ in descriptions]
+    postings = []
+    for (_, job), url, desc, ner_results in zip(jobs.iterrows(), urls, descriptions, ner_batches):
+        extracted = extract_skills(desc, ner_results=ner_results)
+        # Apply normalization to standardize terms, then filter skills against known skills to eliminate hallucinations
+        normalized = {normalize_alias(skill) for skill in extracted}
+        valid = [skill for skill in normalized if is_valid_skill(skill, known_skills)]
+        postings.append({
+            "posting_id": url or hashlib.sha1(desc.encode("utf-8")).hexdigest(),
+            "skills": valid,
+            "site": safe_type(job.get("site")),
+            "title": safe_type(job.get("title")),
+            "company": safe_type(job.get("company")),
+            "location": safe_type(job.get("location")),
+            "url": url
+        })
+    skill_warehouse.record("skill_analysis", search_term, location, postings)
+    return [(posting["posting_id"], posting["skills"]) for posting in postings]
+
+# Scrapes each job board on its own thread with its own deadline and retries
+scrape_orchestrator = create_orchestrator(scrape_jobs)
+
+# Scraped postings and their skills, kept for historical trend queries; written in
+# batches by a background thread (shared with the recommendation service)
+skill_warehouse = SkillWarehouse(
+    os.environ.get("SKILL_WAREHOUSE_PATH", DEFAULT_WAREHOUSE_PATH),
+    flush_interval=float(os.environ.get("SKILL_WAREHOUSE_FLUSH_INTERVAL", "5"))
+).start()
+
+# Rolling counts of validated skills per (search term, location) over sliding windows,
+# refreshed in the background; both endpoints below only read the materialized views.
+# Only the allowlisted search terms and locations ("*" for any) schedule scrapes of their
+# own, any other search gets the default view
+TRENDING_WINDOWS = parse_windows(os.environ.get("TRENDING_WINDOWS", "24h,7d"))
+TRENDING_DEFAULT_WINDOW = os.environ.get("TRENDING_DEFAULT_WINDOW", next(iter(TRENDING_WINDOWS)))
+TRENDING_SEARCH_TERMS = os.environ.get("TRENDING_SEARCH_TERMS", ",".join([
+    "software engineer", "software developer", "frontend developer", "backend developer", "full stack developer",
+    "data scientist", "data analyst", "data engineer", "machine learning engineer", "devops engineer",
+    "product manager", "business analyst", "sales executive", "sales manager"
+]))
+TRENDING_LOCATIONS = os.environ.get("TRENDING_LOCATIONS", ",".join([
+    "remote", "india", "usa", "bangalore", "hyderabad", "pune", "mumbai", "delhi", "chennai"
+]))
+trending_view = TrendingSkills(
+    scrape_validated_skills,
+    TRENDING_WINDOWS,
+    interval=int(os.environ.get("TRENDING_REFRESH_INTERVAL", "3600")),
+    max_keys=int(os.environ.get("TRENDING_MAX_KEYS", "50")),
+    seed=[("software engineer", "remote")],
+    allow=key_filter(TRENDING_SEARCH_TERMS, TRENDING_LOCATIONS)
+).start()
+
+def get_validated_skills_from_job_descriptions(search_term="software engineer", location="remote", window=None):
+    """
+    Trending skills of the search from the materialized view, shared by both endpoints.
+    A search without a view yet gets the default one ("pending" while its first scrape
+    runs); empty until the default view's first scrape finishes.
+    """
+    view = trending_view.view(search_term, location, window or TRENDING_DEFAULT_WINDOW)
+    if view is None:
+        return {"trending_skills": [], "counts": {}, "pending": True}
+    return view
+
+def trending_query_args():
+    return request.args.get("search_term"), request.args.get("location"), request.args.get("window")
 
 # --- API Endpoints ---
 
 @app.route('/api/trending_skills', methods=['GET'])
 def get_trending_skills():
-    """Return trending skills filtered against known skills list."""
-    skills_data = get_validated_skills_from_job_descriptions()
-    return jsonify(skills_data["trending_skills"])
+    """Return trending skills filtered against known skills list (?search_term=&location=&window=)."""
+    try:
+        skills_data = get_validated_skills_from_job_descriptions(*trending_query_args())
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    # 202 while the requested search is still being scraped (the default view is returned meanwhile)
+    return jsonify(skills_data["trending_skills"]), 202 if skills_data.get("pending") else 200
+
+@app.route('/api/trending_skills/stats', methods=['GET'])
+def trending_skills_stats():
+    return jsonify(trending_view.stats())
+
+def int_arg(name, default):
+    return int(request.args.get(name, default))
+
+# Services whose postings the warehouse keeps apart; trends default to this service's validated skills
+TREND_SERVICES = ("skill_analysis", "job_recommendation")
+
+def trend_service():
+    service = request.args.get("service", "skill_analysis")
+    if service not in TREND_SERVICES:
+        raise ValueError(f"Unknown service {service!r}, expected one of {list(TREND_SERVICES)}")
+    return service
+
+@app.route('/api/skill_trends/frequency', methods=['GET'])
+def skill_trend_frequency():
+    """Postings per day/week/month mentioning each skill (?search_term=&location=&skills=a,b&days=30&granularity=day)."""
+    skills = [skill for skill in request.args.get("skills", "").split(",") if skill.strip()]
+    try:
+        return jsonify(skill_warehouse.frequency(
+            trend_service(), request.args.get("search_term"), request.args.get("location"), skills=skills,
+            days=int_arg("days", 30), granularity=request.args.get("granularity", "day"), limit=int_arg("limit", 10)
+        ))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+@app.route('/api/skill_trends/growth', methods=['GET'])
+def skill_trend_growth():
+    """Skills whose share of postings grew most period over period (?search_term=&location=&period_days=7)."""
+    try:
+        return jsonify(skill_warehouse.growth(
+            trend_service(), request.args.get("search_term"), request.args.get("location"),
+            period_days=int_arg("period_days", 7), limit=int_arg("limit", 20), min_postings=int_arg("min_postings", 3)
+        ))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+@app.route('/api/skill_trends/cooccurrence', methods=['GET'])
+def skill_trend_cooccurrence():
+    """Skills most often listed with ?skill= (?search_term=&location=&days=30)."""
+    if not request.args.get("skill", "").strip():
+        return jsonify({"error": "skill is required"}), 400
+    try:
+        return jsonify(skill_warehouse.co_occurrence(
+            trend_service(), request.args["skill"], request.args.get("search_term"), request.args.get("location"),
+            days=int_arg("days", 30), limit=int_arg("limit", 20)
+        ))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+@app.route('/api/scrape/stats', methods=['GET'])
+def scrape_stats():
+    return jsonify(scrape_orchestrator.stats())
+
+@app.route('/api/skill_trends/stats', methods=['GET'])
+def skill_trend_stats():
+    return jsonify(skill_warehouse.stats())
 
 @app.route('/api/skill_gap_analysis/<uid>', methods=['GET'])
 def skill_gap_analysis(uid):
@@ -246,8 +364,11 @@ def skill_gap_analysis(uid):
         if is_valid_skill(normalized, known_skills):
             user_skills.append(normalized)
     
-    # Get validated skills from job descriptions
-    skills_data = get_validated_skills_from_job_descriptions()
+    # Get trending skills of the requested search (?search_term=&location=&window=)
+    try:
+        skills_data = get_validated_skills_from_job_descriptions(*trending_query_args())
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     trending_skills = skills_data["trending_skills"]
     
     # Log for debugging
@@ -263,25 +384,14 @@ def skill_gap_analysis(uid):
     
     print(f"Missing skills after validation: {missing_skills}")
 
-    # Recommend courses for missing skills
+    # Recommend courses for missing skills, best rated first, up to 12 in total
+    course_index.maybe_reload()
     recommended_courses = []
     for missing_skill in missing_skills:
-        for _, row in courses_df.iterrows():
-            course_tags = row["Tags"]
-            for tag in course_tags:
-                if fuzzy_match(missing_skill, tag, 70):
-                    recommended_courses.append({
-                        "name": row["Name"],
-                        "url": row["Url"],
-                        "rating": safe_type(row["Rating"]),
-                        "difficulty": safe_type(row["Difficulty"]),
-                        "tags": course_tags,
-                        "for_skill": missing_skill  # Add this to show which skill this course is for
-                    })
-                    break
-    
-    # Limit to top 12 recommended courses
-    recommended_courses = recommended_courses[:12]
+        remaining = MAX_RECOMMENDED_COURSES - len(recommended_courses)
+        if remaining <= 0:
+            break
+        recommended_courses.extend(course_index.courses_for(missing_skill, k=remaining, threshold=70))
 
     return jsonify({
         "user_skills": user_skills,
@@ -290,5 +400,16 @@ def skill_gap_analysis(uid):
         "recommended_courses": recommended_courses
     })
 
+@app.route('/api/course_index/stats', methods=['GET'])
+def course_index_stats():
+    return jsonify(course_index.stats())
+
+@app.route('/api/ready', methods=['GET'])
+def ready():
+    """Readiness probe: 200 once the NER model is loaded and warmed up, 503 before."""
+    return jsonify({"ready": ner_model.ready, "models": [ner_model.status()]}), 200 if ner_model.ready else 503
+
+print(f"⏱️ skill_analysis_api imported in {time.time() - _import_started:.1f}s, NER model loading in the background")
+
 if __name__ == '__main__':
     app.run(port=5002, debug=True)
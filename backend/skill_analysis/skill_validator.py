@@ -0,0 +1,86 @@
+import re
+import threading
+
+import numpy as np
+from fuzzywuzzy import fuzz
+
+
+class SkillValidator:
+    """
+    Precomputed form of is_valid_skill over a fixed set of known skills,
+    with the same verdicts:
+
+    1. exact (case-insensitive) match: a set lookup
+    2. the skill inside a known skill, or a known skill inside the skill
+       (skills of 3+ characters): a set of every substring of the known
+       skills, plus one regex alternation of them searched in the skill
+    3. partial_ratio >= threshold against any known skill: a character
+       count bound, computed for all known skills at once, rules out
+       those that cannot reach the threshold before partial_ratio runs
+
+    Verdicts are memoized per (skill, threshold).
+    """
+
+    def __init__(self, known_skills, cache_size=100000):
+        self.source = known_skills
+        self.known = sorted({skill.lower() for skill in known_skills})
+        self._exact = set(self.known)
+        self._substrings = {
+            skill[start:end] for skill in self.known
+            for start in range(len(skill)) for end in range(start + 1, len(skill) + 1)
+        }
+        # Longest first so the alternation tries "java" before "c"; any hit is enough
+        alternatives = sorted(self.known, key=len, reverse=True)
+        self._contains_known = re.compile("|".join(re.escape(skill) for skill in alternatives)) if alternatives else None
+
+        alphabet = sorted({char for skill in self.known for char in skill})
+        self._alphabet = {char: index for index, char in enumerate(alphabet)}
+        self._char_counts = np.zeros((len(self.known), len(alphabet)), dtype=np.int32)
+        for row, skill in enumerate(self.known):
+            for char in skill:
+                self._char_counts[row, self._alphabet[char]] += 1
+        self._lengths = np.array([len(skill) for skill in self.known], dtype=np.int32)
+
+        self.cache_size = cache_size
+        self._verdicts = {}
+        self._lock = threading.Lock()
+
+    def _fuzzy_candidates(self, skill, threshold):
+        """
+        Known skills that could reach `threshold`. partial_ratio is at most
+        2C / (m + C), with m the shorter length and C the characters both
+        strings share, so anything under the threshold (less a rounding
+        margin) is skipped.
+        """
+        counts = np.zeros(len(self._alphabet), dtype=np.int32)
+        for char in skill:
+            index = self._alphabet.get(char)
+            if index is not None:
+                counts[index] += 1
+        shared = np.minimum(self._char_counts, counts).sum(axis=1)
+        shorter = np.minimum(self._lengths, len(skill))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bound = np.where(shorter + shared > 0, 200 * shared / (shorter + shared), 0)
+        return [self.known[row] for row in np.flatnonzero(bound >= threshold - 1)]
+
+    def _validate(self, skill, threshold):
+        lowered = skill.lower()
+        if lowered in self._exact:
+            return True
+        if len(skill) >= 3 and (
+            lowered in self._substrings
+            or (self._contains_known is not None and self._contains_known.search(lowered))
+        ):
+            return True
+        return any(fuzz.partial_ratio(lowered, known) >= threshold for known in self._fuzzy_candidates(lowered, threshold))
+
+    def is_valid(self, skill, threshold=85):
+        key = (skill, threshold)
+        verdict = self._verdicts.get(key)
+        if verdict is None:
+            verdict = self._validate(skill, threshold)
+            with self._lock:
+                if len(self._verdicts) >= self.cache_size:
+                    self._verdicts.clear()
+                self._verdicts[key] = verdict
+        return verdict
@@ -0,0 +1,266 @@
+import re
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+_DURATION = re.compile(r"^\s*(\d+)\s*([mhd])\s*$")
+_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+
+def parse_windows(spec):
+    """{"24h": 86400, "7d": 604800} for "24h,7d"; raises ValueError for a malformed entry."""
+    windows = {}
+    for name in spec.split(","):
+        match = _DURATION.match(name)
+        if not match:
+            raise ValueError(f"Invalid trending window {name!r}, expected e.g. 30m, 24h or 7d")
+        windows[name.strip()] = int(match.group(1)) * _UNITS[match.group(2)]
+    return windows
+
+
+def trending_key(search_term, location):
+    """Normalized (search_term, location) pair; each pair has its own view."""
+    term = " ".join((search_term or "").lower().split()) or "software engineer"
+    place = " ".join((location or "").lower().split()) or "remote"
+    return term, place
+
+
+def key_filter(search_terms, locations):
+    """
+    allow(key) for TrendingSkills from comma-separated allowlists of search
+    terms and locations; "*" allows any value.
+    """
+    def allowed(spec):
+        values = {" ".join(value.lower().split()) for value in spec.split(",") if value.strip()}
+        return None if "*" in values else values
+
+    terms, places = allowed(search_terms), allowed(locations)
+    return lambda key: (terms is None or key[0] in terms) and (places is None or key[1] in places)
+
+
+class SkillWindows:
+    """
+    Rolling skill counts of one search key over several sliding windows.
+
+    A count is the number of distinct postings mentioning the skill that
+    were last seen within the window. A posting scraped again moves
+    forward in time instead of counting twice. Each window keeps its own
+    Counter and a time-ordered deque of sightings. Adding a posting and
+    expiring old sightings update the counters incrementally. Stale
+    sightings, superseded by a later one, are skipped when they expire.
+    """
+
+    def __init__(self, windows):
+        self.windows = windows
+        self._postings = {}
+        self._counts = {name: Counter() for name in windows}
+        self._counted = {name: set() for name in windows}
+        self._sightings = {name: deque() for name in windows}
+
+    def add(self, posting_id, skills, seen_at):
+        previous = self._postings.get(posting_id)
+        # Skills stay those of the first sighting, so counts decrement exactly what they incremented
+        skills = previous[1] if previous else frozenset(skills)
+        self._postings[posting_id] = (seen_at, skills)
+        for name in self.windows:
+            self._sightings[name].append((seen_at, posting_id))
+            if posting_id not in self._counted[name]:
+                self._counted[name].add(posting_id)
+                self._counts[name].update(skills)
+
+    def expire(self, now):
+        for name, length in self.windows.items():
+            sightings, counts, counted = self._sightings[name], self._counts[name], self._counted[name]
+            while sightings and sightings[0][0] < now - length:
+                seen_at, posting_id = sightings.popleft()
+                last_seen, skills = self._postings[posting_id]
+                if last_seen == seen_at and posting_id in counted:
+                    counted.discard(posting_id)
+                    counts.subtract(skills)
+                    for skill in skills:
+                        if counts[skill] <= 0:
+                            del counts[skill]
+        longest = max(self.windows.values())
+        for posting_id in [p for p, (last_seen, _) in self._postings.items() if last_seen < now - longest]:
+            del self._postings[posting_id]
+
+    def top(self, name, limit):
+        """(skill, count) pairs of window `name`, most frequent first."""
+        return self._counts[name].most_common(limit), len(self._counted[name])
+
+
+class TrendingSkills:
+    """
+    Materialized view of trending skills per (search_term, location) and
+    time window.
+
+    `fetch(search_term, location)` scrapes and returns (posting_id,
+    validated skills) pairs; it runs on background threads only. A
+    scheduler thread refreshes every tracked key each `interval` seconds
+    and, after each refresh, stores the top `limit` skills of every
+    window. Reads are a dict lookup and never wait for a scrape.
+
+    The `seed` keys are tracked from the start and never dropped; the
+    first one is the default view. Other keys are only tracked when
+    `allow(key)` says so, and the least recently read of them is dropped
+    once more than `max_keys` are tracked, so query parameters cannot
+    grow the scrape schedule or push out the default view.
+    """
+
+    def __init__(self, fetch, windows, interval=3600, limit=10, max_keys=50, seed=None, workers=2, allow=None):
+        self.fetch = fetch
+        self.windows = windows
+        self.interval = interval
+        self.limit = limit
+        self.max_keys = max_keys
+        self.allow = allow or (lambda key: True)
+        self.seed = [trending_key(search_term, location) for search_term, location in seed or []]
+        self._pinned = set(self.seed)
+        self.default_key = self.seed[0] if self.seed else None
+        self._counts = {}
+        self._views = {}
+        self._tracked = OrderedDict((key, time.time()) for key in self.seed)
+        self._in_flight = set()
+        # Keys a read already started a refresh for; later ones wait for the scheduler
+        self._requested = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="trending-refresh")
+        self._stop = threading.Event()
+        self._thread = None
+
+    def track(self, search_term, location):
+        """Tracks the key for scheduled refreshes; returns it, or None if it may not schedule scrapes."""
+        key = trending_key(search_term, location)
+        if key not in self._pinned and not self.allow(key):
+            return None
+        with self._lock:
+            self._tracked[key] = time.time()
+            self._tracked.move_to_end(key)
+            evictable = (tracked for tracked in list(self._tracked) if tracked not in self._pinned)
+            while len(self._tracked) > max(self.max_keys, len(self._pinned)):
+                dropped = next(evictable)
+                del self._tracked[dropped]
+                self._counts.pop(dropped, None)
+                self._requested.discard(dropped)
+                for name in self.windows:
+                    self._views.pop((dropped, name), None)
+        return key
+
+    def view(self, search_term, location, window):
+        """
+        The materialized view of the key and window. A key without a view
+        yet is answered with the default view, with the requested key
+        under "requested" and "pending" true if the key is allowed: the
+        first such read starts its first refresh in the background, the
+        scheduler retries it after that. None before the default view
+        exists.
+        """
+        if window not in self.windows:
+            raise ValueError(f"Unknown trending window {window!r}, expected one of {sorted(self.windows)}")
+        key = self.track(search_term, location)
+        with self._lock:
+            view = self._views.get((key, window)) if key is not None else None
+            if view is not None:
+                return view
+            default = self._views.get((self.default_key, window))
+            first_read = key is not None and key not in self._requested
+            if first_read:
+                self._requested.add(key)
+        if first_read:
+            self.refresh_async(key)
+        if default is None:
+            return None
+        return dict(default, requested=dict(zip(("search_term", "location"), trending_key(search_term, location))),
+                    pending=key is not None)
+
+    def refresh_async(self, key):
+        with self._lock:
+            if key in self._in_flight:
+                return None
+            self._in_flight.add(key)
+        return self._executor.submit(self.refresh, key)
+
+    def refresh(self, key):
+        """Scrapes `key`, adds its postings to the rolling counts and rebuilds its views."""
+        try:
+            postings = self.fetch(*key)
+            now = time.time()
+            with self._lock:
+                if key not in self._tracked:
+                    return
+                counts = self._counts.get(key)
+                if counts is None:
+                    counts = self._counts[key] = SkillWindows(self.windows)
+                for posting_id, skills in postings:
+                    counts.add(posting_id, skills, now)
+                counts.expire(now)
+                self._materialize(key, counts, now)
+            print(f"📈 Refreshed trending skills {key}: {len(postings)} postings")
+        except Exception as e:
+            print(f"❌ Trending skills refresh failed for {key}: {e}")
+        finally:
+            with self._lock:
+                self._in_flight.discard(key)
+
+    def _materialize(self, key, counts, now):
+        for name in self.windows:
+            top, postings = counts.top(name, self.limit)
+            self._views[(key, name)] = {
+                "search_term": key[0],
+                "location": key[1],
+                "window": name,
+                "trending_skills": [skill for skill, _ in top],
+                "counts": dict(top),
+                "postings": postings,
+                "refreshed_at": now
+            }
+
+    def refresh_all(self):
+        """Refreshes every tracked key, one after another to stay polite to the job boards."""
+        with self._lock:
+            keys = list(self._tracked)
+        for key in keys:
+            if self._stop.is_set():
+                break
+            with self._lock:
+                if key in self._in_flight:
+                    continue
+                self._in_flight.add(key)
+            self.refresh(key)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh_all()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Starts the scheduler thread (idempotent)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="trending-scheduler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._executor.shutdown(wait=False)
+
+    def stats(self):
+        now = time.time()
+        with self._lock:
+            return {
+                "windows": self.windows,
+                "tracked_keys": len(self._tracked),
+                "default_key": list(self.default_key) if self.default_key else None,
+                "in_flight": len(self._in_flight),
+                "views": [
+                    {
+                        "search_term": key[0],
+                        "location": key[1],
+                        "window": name,
+                        "postings": view["postings"],
+                        "age_seconds": round(now - view["refreshed_at"], 1)
+                    }
+                    for (key, name), view in sorted(self._views.items())
+                ]
+            }
@@ -0,0 +1,12 @@
+"""
+Tests import service modules the way the services do: shared code from
+backend/ and each service's siblings from its own directory.
+"""
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directory in ("", "job_recommendation", "job_scraper", "ner_service", "skill_analysis"):
+    path = os.path.join(BACKEND_DIR, directory)
+    if path not in sys.path:
+        sys.path.append(path)
@@ -0,0 +1,63 @@
+import os
+
+import pandas as pd
+import pytest
+
+from common import course_catalog
+from common.course_catalog import CourseCatalog, build_catalog, open_catalog
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = str(tmp_path / "courses.csv")
+    pd.DataFrame({
+        "Name": ["Python Basics", "SQL", None],
+        "Url": ["u/0", "u/1", "u/2"],
+        "Rating": [4.5, None, 4.9],
+        "Difficulty": ["Beginner Level", "Mixed", None],
+        "Tags": ["['Python', 'Programming']", "['SQL']", None],
+    }).to_csv(path)
+    return path
+
+
+def test_records_round_trip(csv_path, tmp_path):
+    catalog = CourseCatalog(build_catalog(csv_path, str(tmp_path / "courses.catalog")))
+    assert len(catalog) == 3
+    assert [catalog.record(course_id) for course_id in range(3)] == [
+        {"name": "Python Basics", "url": "u/0", "rating": 4.5, "difficulty": "Beginner Level", "tags": ["Python", "Programming"]},
+        {"name": "SQL", "url": "u/1", "rating": None, "difficulty": "Mixed", "tags": ["SQL"]},
+        {"name": None, "url": "u/2", "rating": 4.9, "difficulty": None, "tags": []},
+    ]
+    assert catalog.tag_course_ids("python").tolist() == [0]
+    assert catalog.tag_course_ids("missing").tolist() == []
+    # Arrays are views of the mapping, aligned for zero-copy reads
+    assert all(getattr(catalog, name).ctypes.data % course_catalog.ALIGNMENT == 0
+               for name in catalog.header["arrays"] if len(getattr(catalog, name)))
+
+
+def test_open_reuses_a_fresh_catalog_and_rebuilds_a_stale_one(csv_path, tmp_path, monkeypatch):
+    catalog_path = str(tmp_path / "courses.catalog")
+    builds = []
+    build = course_catalog.build_catalog
+    monkeypatch.setattr(course_catalog, "build_catalog", lambda *args: builds.append(args) or build(*args))
+    assert len(open_catalog(csv_path, catalog_path)) == 3
+    assert len(open_catalog(csv_path, catalog_path)) == 3
+    assert len(builds) == 1
+    # Same content with a new mtime (e.g. a fresh checkout) is still fresh
+    os.utime(csv_path, ns=(0, 0))
+    open_catalog(csv_path, catalog_path)
+    assert len(builds) == 1
+    pd.read_csv(csv_path, index_col=0).head(2).to_csv(csv_path)
+    assert len(open_catalog(csv_path, catalog_path)) == 2
+    assert len(builds) == 2
+
+
+def test_other_formats_are_rebuilt(csv_path, tmp_path, monkeypatch):
+    catalog_path = build_catalog(csv_path, str(tmp_path / "courses.catalog"))
+    monkeypatch.setattr(course_catalog, "FORMAT_VERSION", course_catalog.FORMAT_VERSION + 1)
+    with pytest.raises(ValueError):
+        CourseCatalog(catalog_path)
+    assert open_catalog(csv_path, catalog_path).header["format"] == course_catalog.FORMAT_VERSION
+    with open(catalog_path, "wb") as out:
+        out.write(b"not a catalog")
+    assert len(open_catalog(csv_path, catalog_path)) == 3
@@ -0,0 +1,96 @@
+"""
+CourseIndex (skill_analysis/course_index.py, over the common.course_catalog
+file) against the courses_df.iterrows() loop skill_gap_analysis used
+before: same courses per skill and same records, ordered best rated first.
+"""
+import math
+import os
+
+import pandas as pd
+from fuzzywuzzy import fuzz
+
+from common.course_catalog import DEFAULT_CSV_PATH, parse_tags
+from course_index import CourseIndex
+
+SKILLS = ["python", "machine learning", "sql", "negotiation", "cloud computing", "react", "data analysis",
+          "leadership", "excel", "go", "crm", "statistics", "cybersecurity", "docker", "nonexistent skill"]
+
+
+def baseline(courses_df, missing_skill):
+    """The original loop: courses with any tag partially matching the skill, in CSV order."""
+    matched = []
+    for position, (_, row) in enumerate(courses_df.iterrows()):
+        if any(fuzz.partial_ratio(missing_skill.lower(), tag.lower()) >= 70 for tag in row["Tags"]):
+            matched.append(position)
+    return matched
+
+
+def expected_order(courses_df, positions):
+    """Best rated first, unrated last, then easiest, then CSV order."""
+    levels = ["Beginner Level", "Intermediate Level", "Advanced Level"]
+
+    def rank(position):
+        rating, difficulty = courses_df["Rating"].iloc[position], courses_df["Difficulty"].iloc[position]
+        rated = isinstance(rating, float) and not math.isnan(rating)
+        return (not rated, -rating if rated else 0, levels.index(difficulty) if difficulty in levels else len(levels), position)
+    return sorted(positions, key=rank)
+
+
+def load(csv_path):
+    courses_df = pd.read_csv(csv_path)
+    courses_df["Tags"] = courses_df["Tags"].apply(parse_tags)
+    return courses_df
+
+
+def test_real_catalog_matches_the_baseline(tmp_path):
+    courses_df = load(DEFAULT_CSV_PATH)
+    index = CourseIndex(DEFAULT_CSV_PATH, str(tmp_path / "courses.catalog"))
+    for skill in SKILLS:
+        matched = baseline(courses_df, skill)
+        assert index.course_ids(skill) == expected_order(courses_df, matched), skill
+        for course in index.courses_for(skill, k=12):
+            position = courses_df.index[courses_df["Url"] == course["url"]][0]
+            assert course["name"] == courses_df["Name"].iloc[position]
+            assert course["tags"] == courses_df["Tags"].iloc[position]
+            assert course["for_skill"] == skill
+
+
+def test_edge_cases_match_the_baseline(tmp_path):
+    csv_path = str(tmp_path / "courses.csv")
+    pd.DataFrame({
+        "Name": ["Python Basics", "Advanced Python", "Python for Data", "Intro to SQL", "Untagged", None, "Négociation"],
+        "Url": ["u/0", "u/1", "u/2", "u/3", "u/4", "u/5", None],
+        "Rating": [4.5, 4.8, 4.5, None, 5.0, 4.0, 4.9],
+        "Difficulty": ["Intermediate Level", "Advanced Level", "Beginner Level", "Beginner Level", None,
+                       "Mixed", "Beginner Level"],
+        "Tags": ["['Python', 'Programming']", "['Python']", "['Python', 'Data Science']", "['SQL', 'Data Science']",
+                 None, "['Python Programming']", "['Negotiation', 'Business']"],
+    }).to_csv(csv_path)
+    courses_df = load(csv_path)
+    index = CourseIndex(csv_path, str(tmp_path / "courses.catalog"))
+    for skill in ("Python", "data science", "sql", "negotiation", "untagged"):
+        assert index.course_ids(skill) == expected_order(courses_df, baseline(courses_df, skill)), skill
+    # Rating desc, then easiest: Advanced 4.8, then the two 4.5 (Beginner before Intermediate), then 4.0
+    assert index.course_ids("python") == [1, 2, 0, 5]
+    assert index.courses_for("negotiation") == [{
+        "name": "Négociation", "url": None, "rating": 4.9, "difficulty": "Beginner Level",
+        "tags": ["Negotiation", "Business"], "for_skill": "negotiation"
+    }]
+    unnamed = index.courses_for("python programming", k=12)
+    assert {"name": None, "url": "u/5", "rating": 4.0, "difficulty": "Mixed", "tags": ["Python Programming"],
+            "for_skill": "python programming"} in unnamed
+    assert index.course_ids("sql") == [3]
+
+
+def test_reload_after_the_csv_changes(tmp_path):
+    csv_path = str(tmp_path / "courses.csv")
+    pd.DataFrame({"Name": ["A"], "Url": ["u/a"], "Rating": [4.0], "Difficulty": ["Beginner Level"],
+                  "Tags": ["['Python']"]}).to_csv(csv_path)
+    index = CourseIndex(csv_path, str(tmp_path / "courses.catalog"), check_interval=0)
+    assert index.course_ids("python") == [0]
+    pd.DataFrame({"Name": ["B", "A"], "Url": ["u/b", "u/a"], "Rating": [4.9, 4.0],
+                  "Difficulty": ["Beginner Level"] * 2, "Tags": ["['Python']", "['SQL']"]}).to_csv(csv_path)
+    os.utime(csv_path, ns=(0, 0))
+    assert index.maybe_reload() and index.reloads == 1
+    assert [course["name"] for course in index.courses_for("python")] == ["B"]
+    assert not index.maybe_reload()
@@ -0,0 +1,76 @@
+import pandas as pd
+
+from dedup import JobDeduplicator
+
+BODY = ("build data pipelines in python and sql on spark and airflow, work with analysts on dashboards "
+        "and with product on experiments across teams")
+
+
+def jobs(rows, prefix):
+    frame = pd.DataFrame([
+        {"title": title, "company": company, "location": "pune", "description": description,
+         "url": url, "skills": skills, "source": prefix}
+        for title, company, description, url, skills in rows
+    ])
+    frame.index = [f"{prefix}:{i}" for i in range(len(frame))]
+    return frame
+
+
+FIRESTORE = jobs([
+    ("Data Engineer", "Acme", BODY, "", ["python"]),
+    ("Data Engineer", "Acme", BODY + " apply today", "", []),
+    ("Sales Executive", "Globex", "sell crm software to mid market customers in western india every quarter", "", []),
+    ("Frontend Developer", "Initech", "", "https://jobs.initech.example/42", []),
+], "firestore")
+
+
+def test_merge_matches_full_dedup():
+    scraped = jobs([
+        ("Data Engineer", "ACME", BODY + " via linkedin", "https://www.linkedin.com/jobs/view/1/?trk=x", ["python", "sql"]),
+        ("Frontend Developer", "Initech", "", "https://jobs.initech.example/42?utm_source=board", []),
+        ("QA Engineer", "Hooli", "test plans", "https://hooli.example/qa", []),
+        ("QA Engineer", "Hooli", "test plans", "https://hooli.example/qa#apply", []),
+    ], "scraped")
+    merged, stats = JobDeduplicator().merge(FIRESTORE, scraped, base_version=1, version=(1, "key"))
+    full, full_stats = JobDeduplicator().dedup(pd.concat([FIRESTORE, scraped]))
+    assert list(merged.index) == list(full.index)
+    assert list(merged.index) == ["firestore:2", "firestore:3", "scraped:0", "scraped:2"]
+    assert stats == full_stats
+
+
+def test_base_is_deduplicated_once_per_version():
+    deduplicator = JobDeduplicator()
+    calls = []
+    clusters = deduplicator.clusters
+    deduplicator.clusters = lambda frame: calls.append(len(frame)) or clusters(frame)
+    for key in ("sde", "data engineer", "sales"):
+        deduplicator.merge(FIRESTORE, jobs([(key, "Acme", "", f"https://x.example/{key}", [])], "scraped"), 1)
+    deduplicator.merge(FIRESTORE, FIRESTORE.iloc[:0], 2)
+    assert calls == [len(FIRESTORE), len(FIRESTORE)]
+
+
+def test_merge_can_keep_the_base_copy():
+    scraped = jobs([
+        ("Data Engineer", "ACME", BODY + " via linkedin", "https://www.linkedin.com/jobs/view/1/?trk=x", ["python", "sql"]),
+        ("QA Engineer", "Hooli", "test plans", "https://hooli.example/qa", []),
+    ], "scraped")
+    deduplicator = JobDeduplicator()
+    base, _ = deduplicator.dedup_base(FIRESTORE, 1)
+    merged, stats = deduplicator.merge(FIRESTORE, scraped, 1, version=(1, "key", True), keep_base=True)
+    # The richer scraped copy of the Acme posting does not replace the base record
+    assert list(merged.index) == list(base.index) + ["scraped:1"]
+    assert stats["unique"] == len(base) + 1
+
+
+def test_same_title_company_and_location_needs_a_matching_url_or_description():
+    openings = jobs([
+        ("Sales Executive", "Globex", "north india territory, field sales to retail chains", "https://globex.example/1", []),
+        ("Sales Executive", "Globex", "inside sales for the smb segment from our office", "https://globex.example/2", []),
+        ("Sales Executive", "Globex", "inside sales for the SMB segment, from our office", "", ["crm"]),
+        ("Sales Executive", "Globex", "", "", []),
+    ], "scraped")
+    deduped, stats = JobDeduplicator().dedup(openings)
+    # Different URLs and descriptions: two openings. The same description without a URL is the second
+    # one again; without a description nothing shows it is either
+    assert list(deduped.index) == ["scraped:0", "scraped:1", "scraped:3"]
+    assert stats["unique"] == 3
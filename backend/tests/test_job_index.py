@@ -0,0 +1,108 @@
+import random
+
+import pandas as pd
+
+from job_index import JobIndex
+from scoring import fallback_prefix, rank_jobs, score_jobs
+
+JOBS = pd.DataFrame({
+    "title": ["Software Engineers", "Python Dev", "Sr. Python Developer", "Data Scientists", "", "Sales Executive",
+              "", "QA Engineer"],
+    "company": ["a", "b", "c", "d", "e", "f", "g", "h"],
+    "location": ["bangalore"] * 6 + ["pune", ""],
+    "description": [""] * 8,
+    "url": [f"https://jobs.example.com/{i}" for i in range(8)],
+    "skills": [["python"], ["python"], ["python", "django"], ["python"], ["python"], ["crm"], ["excel"], []],
+    "source": ["scraped"] * 8
+}, index=[f"job:{i}" for i in range(8)])
+
+
+def indexed(jobs):
+    index = JobIndex()
+    index.sync("test", {
+        job_id: (title, skills, location)
+        for job_id, title, skills, location in zip(jobs.index, jobs["title"], jobs["skills"], jobs["location"])
+    })
+    return index
+
+
+def recommended(jobs, role, skills, location):
+    recommendations, _ = rank_jobs(jobs, score_jobs(jobs, role, skills, location))
+    return {job["url"] for job in recommendations}
+
+
+def candidate_frame(index, jobs, role, skills, location):
+    """The caller's side of candidates(): without a role the leading fallback jobs are added."""
+    ids = index.candidates(role, skills, location)
+    if not role:
+        ids |= set(fallback_prefix(jobs))
+    return jobs[jobs.index.isin(ids)]
+
+
+def test_candidates_cover_full_scan_for_plurals_and_substrings():
+    index = indexed(JOBS)
+    for role, skills in [("software engineer", ["python"]), ("dev", ["python"]), ("python developer", []),
+                         ("data scientist", ["python"])]:
+        candidates = JOBS[JOBS.index.isin(index.candidates(role, skills, "bangalore"))]
+        assert recommended(JOBS, role, skills, "bangalore") <= recommended(candidates, role, skills, "bangalore")
+    assert "job:0" in index.candidates("software engineer", [], "")
+    assert {"job:1", "job:2"} <= index.candidates("dev", [], "")
+
+
+def test_role_matches_follow_adds_and_removes():
+    index = indexed(JOBS)
+    assert "job:5" in index.candidates("sales executive", [], "")
+    index.add("job:9", "Sales Executives - B2B", ["crm"], "pune")
+    assert "job:9" in index.candidates("sales executive", [], "")
+    index.remove("job:5")
+    index.remove("job:9")
+    assert "job:5" not in index.candidates("sales executive", ["crm"], "bangalore")
+    assert index.stats()["titles"] == 5
+
+
+def test_untitled_and_roleless_jobs_come_from_skill_and_location_postings():
+    index = indexed(JOBS)
+    # Untitled jobs need a matching skill (job:4) or no skills of their own; job:6 has neither
+    assert index.candidates("data scientist", ["python"], "bangalore") == {"job:3", "job:4"}
+    assert index.candidates("", ["django"], "bangalore") == {"job:2", "job:7"}
+    # Without skills only a close location can make up the points
+    assert index.candidates("", [], "pune") == {"job:6"}
+    assert index.candidates("", [], "") == set()
+
+
+def test_candidates_rank_like_the_full_scan():
+    rng = random.Random(3)
+    titles = ["Software Engineer", "Python Developer", "Data Scientist", "Sales Exec", "QA Analyst", "", "DevOps"]
+    skills = ["python", "django", "sql", "excel", "crm", "aws", "react"]
+    locations = ["bangalore", "bengaluru, ka", "pune", "remote", "mumbai", ""]
+    jobs = pd.DataFrame({
+        "title": [rng.choice(titles) for _ in range(300)],
+        "company": [f"c{i}" for i in range(300)],
+        "location": [rng.choice(locations) for _ in range(300)],
+        "description": [""] * 300,
+        "url": [f"https://jobs.example.com/{rng.randrange(250)}" for _ in range(300)],
+        "skills": [rng.sample(skills, rng.randint(0, 3)) for _ in range(300)],
+        "source": ["scraped"] * 300
+    }, index=[f"job:{i}" for i in range(300)])
+    index = indexed(jobs)
+    for role in ["", "python developer", "data", "sales executive"]:
+        for user_skills in [[], ["python"], ["excel", "crm"], ["golang"]]:
+            for location in ["", "bangalore", "pune"]:
+                candidates = candidate_frame(index, jobs, role, user_skills, location)
+                full, _ = rank_jobs(jobs, score_jobs(jobs, role, user_skills, location))
+                found, _ = rank_jobs(candidates, score_jobs(candidates, role, user_skills, location))
+                assert found == full, (role, user_skills, location)
+
+
+def test_job_held_by_two_sources_stays_until_both_drop_it():
+    index = JobIndex()
+    shared = ("Python Developer", ["python"], "pune")
+    index.sync("search a", {"scraped:1": shared, "scraped:2": ("QA", [], "pune")}, version=1)
+    index.sync("search b", {"scraped:1": shared}, version=1)
+    index.sync("search a", {"scraped:2": ("QA", [], "pune")}, version=2)
+    # search b did not change, so its sync is skipped; the job must still be there
+    index.sync("search b", {"scraped:1": shared}, version=1)
+    assert "scraped:1" in index.candidates("python developer", [], "")
+    index.sync("search b", {}, version=2)
+    assert "scraped:1" not in index
+    assert index.stats()["sources"] == 1
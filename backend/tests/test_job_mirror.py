@@ -0,0 +1,220 @@
+import time
+from types import SimpleNamespace
+
+from job_mirror import JobCorpusMirror
+
+COLUMNS = ["title", "description", "skills"]
+
+
+class FakeDocument:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = dict(data)
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class FakeWatch:
+    def __init__(self, callback):
+        self.callback = callback
+        self.is_active = True
+
+    def unsubscribe(self):
+        self.is_active = False
+
+
+class FakeCollection:
+    """The collection methods the mirror uses: stream, where(>=), order_by and on_snapshot."""
+
+    def __init__(self, documents=None):
+        self.documents = dict(documents or {})
+        self.watches = []
+        self._filter = None
+        self._order = None
+
+    def _query(self, field_filter=None, order=None):
+        query = FakeCollection(self.documents)
+        query.watches = self.watches
+        query._filter, query._order = field_filter or self._filter, order or self._order
+        return query
+
+    def where(self, field, op, value):
+        assert op == ">="
+        return self._query(field_filter=(field, value))
+
+    def order_by(self, field):
+        return self._query(order=field)
+
+    def stream(self):
+        items = list(self.documents.items())
+        if self._filter is not None:
+            field, value = self._filter
+            items = [(doc_id, data) for doc_id, data in items if data.get(field) is not None and data[field] >= value]
+        if self._order is not None:
+            items.sort(key=lambda item: item[1].get(self._order))
+        return [FakeDocument(doc_id, data) for doc_id, data in items]
+
+    def on_snapshot(self, callback):
+        watch = FakeWatch(callback)
+        self.watches.append(watch)
+        documents = self.stream()
+        changes = [SimpleNamespace(type=SimpleNamespace(name="ADDED"), document=document) for document in documents]
+        callback(documents, changes, time.time())
+        return watch
+
+    def change(self, kind, doc_id, data=None):
+        """Writes or deletes a document and notifies the active listeners like Firestore would."""
+        if kind == "REMOVED":
+            document = FakeDocument(doc_id, self.documents.pop(doc_id))
+        else:
+            self.documents[doc_id] = data
+            document = FakeDocument(doc_id, data)
+        for watch in self.watches:
+            if watch.is_active:
+                watch.callback(None, [SimpleNamespace(type=SimpleNamespace(name=kind), document=document)], time.time())
+
+
+def to_job(doc_id, data):
+    return {"title": data["title"], "description": data["description"], "skills": []}
+
+
+class CountingExtractor:
+    def __init__(self):
+        self.descriptions = []
+
+    def __call__(self, descriptions):
+        self.descriptions.extend(descriptions)
+        return [description.split() for description in descriptions]
+
+
+def make_mirror(collection, mode="listener", extract=None, extractor_ready=None):
+    return JobCorpusMirror(collection, to_job, extract or CountingExtractor(), COLUMNS, mode=mode,
+                           poll_interval=0.02, max_backoff=0.1, extractor_ready=extractor_ready)
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+def test_listener_follows_changes_without_reextracting_unchanged_jobs():
+    collection = FakeCollection({"a": {"title": "Dev", "description": "python sql"}})
+    extract = CountingExtractor()
+    mirror = make_mirror(collection, extract=extract).start()
+    assert mirror.wait_until_ready(5)
+    wait_for(lambda: collection.watches)
+    version = mirror.version
+    assert extract.descriptions == ["python sql"]
+
+    collection.change("ADDED", "b", {"title": "Data Engineer", "description": "spark"})
+    collection.change("MODIFIED", "a", {"title": "Senior Dev", "description": "python sql"})
+    collection.change("REMOVED", "b")
+    mirror.stop()
+
+    frame = mirror.frame()
+    assert list(frame.index) == ["firestore:a"] and frame.loc["firestore:a", "title"] == "Senior Dev"
+    assert mirror.version == version + 3
+    assert extract.descriptions == ["python sql", "spark"]
+
+
+def test_listener_is_restarted_after_an_error():
+    collection = FakeCollection({"a": {"title": "Dev", "description": "python"}})
+    failures = {"left": 1}
+
+    def flaky_to_job(doc_id, data):
+        if doc_id == "b" and failures["left"]:
+            failures["left"] -= 1
+            raise RuntimeError("listener stream broke")
+        return to_job(doc_id, data)
+
+    mirror = JobCorpusMirror(collection, flaky_to_job, CountingExtractor(), COLUMNS,
+                             poll_interval=0.02, max_backoff=0.1).start()
+    wait_for(lambda: collection.watches)
+    collection.change("ADDED", "b", {"title": "Data Engineer", "description": "spark"})
+    # The replay of the re-subscribed listener brings in the document the failed callback lost
+    wait_for(lambda: "firestore:b" in mirror.frame().index)
+    assert not collection.watches[0].is_active and collection.watches[-1].is_active
+    mirror.stop()
+    assert mirror.stats()["listener_restarts"] == 1 and mirror.stats()["errors"] == 1
+
+
+def test_listener_that_stops_is_resubscribed():
+    collection = FakeCollection({"a": {"title": "Dev", "description": "python"}})
+    mirror = make_mirror(collection).start()
+    wait_for(lambda: collection.watches)
+    collection.watches[0].is_active = False
+    wait_for(lambda: len(collection.watches) == 2)
+    mirror.stop()
+    assert mirror.stats()["listener_restarts"] == 1
+
+
+def test_documents_deleted_while_the_listener_is_down_are_removed():
+    collection = FakeCollection({
+        "a": {"title": "Dev", "description": "python"},
+        "b": {"title": "QA", "description": "selenium"}
+    })
+    mirror = make_mirror(collection)
+    removed = []
+    mirror.on_change(lambda upserted, gone: removed.extend(gone))
+    mirror.start()
+    wait_for(lambda: collection.watches)
+    # The listener stops; a document is deleted before it is re-subscribed
+    collection.watches[0].is_active = False
+    del collection.documents["b"]
+    wait_for(lambda: len(collection.watches) == 2)
+    mirror.stop()
+    assert list(mirror.frame().index) == ["firestore:a"]
+    assert removed == ["firestore:b"]
+
+
+def test_watermark_picks_up_documents_sharing_the_watermark_timestamp():
+    collection = FakeCollection({"a": {"title": "Dev", "description": "python", "updated_at": 100.0}})
+    extract = CountingExtractor()
+    mirror = make_mirror(collection, mode="watermark", extract=extract)
+    mirror.load()
+    # Written after the first read, with the same timestamp as the watermark
+    collection.documents["b"] = {"title": "QA", "description": "selenium", "updated_at": 100.0}
+    mirror.poll()
+    collection.documents["c"] = {"title": "SRE", "description": "linux", "updated_at": 101.0}
+    mirror.poll()
+    mirror.poll()
+    assert sorted(mirror.frame().index) == ["firestore:a", "firestore:b", "firestore:c"]
+    assert extract.descriptions == ["python", "selenium", "linux"]
+    assert mirror.version == 3
+
+
+def test_watermark_run_loop_keeps_polling():
+    collection = FakeCollection({"a": {"title": "Dev", "description": "python", "updated_at": 1.0}})
+    mirror = make_mirror(collection, mode="watermark").start()
+    assert mirror.wait_until_ready(5)
+    collection.documents["b"] = {"title": "QA", "description": "selenium", "updated_at": 2.0}
+    wait_for(lambda: "firestore:b" in mirror.frame().index)
+    mirror.stop()
+
+
+def test_skills_extracted_before_the_model_is_ready_are_redone():
+    collection = FakeCollection({"a": {"title": "Dev", "description": "Python SQL"}})
+    model_ready = False
+
+    def extract(descriptions):
+        # lowercase stands in for the model's output, the raw split for pattern-only skills
+        return [description.lower().split() if model_ready else description.split() for description in descriptions]
+
+    mirror = make_mirror(collection, extract=extract, extractor_ready=lambda: model_ready)
+    changes = []
+    mirror.on_change(lambda upserted, removed: changes.append(set(upserted)))
+    mirror.start()
+    assert mirror.wait_until_ready(5)
+    assert mirror.frame().loc["firestore:a", "skills"] == ["Python", "SQL"]
+    assert mirror.stats()["provisional_skills"] == 1
+    version = mirror.version
+
+    model_ready = True
+    wait_for(lambda: len(changes) == 2)
+    mirror.stop()
+    assert mirror.frame().loc["firestore:a", "skills"] == ["python", "sql"]
+    assert mirror.version == version + 1 and changes[-1] == {"firestore:a"}
+    assert mirror.stats()["provisional_skills"] == 0
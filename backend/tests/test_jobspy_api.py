@@ -0,0 +1,230 @@
+"""
+Concurrency checks of job_scraper/jobspy_api.py against a fake
+scrape_jobs that sleeps, in-process through httpx's ASGI transport.
+benchmarks/bench_jobspy_api.py prints the numbers behind them.
+"""
+import asyncio
+import importlib
+import json
+import sys
+import time
+import types
+
+import pandas as pd
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+SCRAPE_SECONDS = 0.3
+scrape_calls = []
+down_sites = set()
+
+
+def fake_scrape_jobs(site_name, search_term, results_wanted=20, **params):
+    scrape_calls.append((site_name[0], search_term))
+    time.sleep(SCRAPE_SECONDS)
+    if site_name[0] in down_sites:
+        raise ConnectionError(f"{site_name[0]} is down")
+    return pd.DataFrame({
+        "site": site_name[0],
+        "job_url": [f"https://{site_name[0]}.example/{search_term}/{i}" for i in range(results_wanted)],
+        "title": search_term
+    })
+
+
+@pytest.fixture(scope="module")
+def api(tmp_path_factory):
+    # jobspy_api imports scrape_jobs from jobspy at import time; serve it the fake instead
+    patch = pytest.MonkeyPatch()
+    patch.setitem(sys.modules, "jobspy", types.SimpleNamespace(scrape_jobs=fake_scrape_jobs))
+    patch.setenv("SCRAPE_CACHE_PATH", str(tmp_path_factory.mktemp("cache") / "scrape_cache.sqlite3"))
+    patch.setenv("SCRAPE_CONCURRENCY", "4")
+    patch.setenv("SCRAPE_MAX_QUEUE", "4")
+    patch.setenv("SCRAPE_MAX_PER_CLIENT", "2")
+    patch.setenv("SCRAPE_SITE_RETRIES", "0")
+    sys.modules.pop("jobspy_api", None)
+    yield importlib.import_module("jobspy_api")
+    sys.modules.pop("jobspy_api", None)
+    patch.undo()
+
+
+def client(api, client_id=None):
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=api.app, client=("127.0.0.1", 1234)), base_url="http://test", timeout=60,
+        headers={"X-Client-Id": client_id} if client_id else None
+    )
+
+
+def search(term):
+    return {"search_term": term, "location": "remote"}
+
+
+def test_event_loop_keeps_serving_during_scrapes(api):
+    async def run():
+        async with client(api) as c:
+            scrapes = [asyncio.create_task(c.get("/scrape_jobs", params=search(f"loop {i}"))) for i in range(4)]
+            await asyncio.sleep(0.05)
+            started = time.perf_counter()
+            assert (await c.get("/scrape_stats")).status_code == 200
+            probe_s = time.perf_counter() - started
+            responses = await asyncio.gather(*scrapes)
+        return probe_s, [r.status_code for r in responses]
+
+    probe_s, statuses = asyncio.run(run())
+    assert statuses == [200] * 4
+    assert probe_s < SCRAPE_SECONDS / 2
+
+
+def test_users_behind_one_host_join_a_running_scrape(api):
+    """server.js is one host: its users must not be limited as one client when they share a scrape."""
+    async def run():
+        async with client(api) as shared, client(api, "user-1") as user:
+            return await asyncio.gather(*[
+                (user if i % 2 else shared).get("/scrape_jobs", params=search("Data  Engineer" if i % 3 else "data engineer"))
+                for i in range(12)
+            ])
+
+    scrape_calls.clear()
+    coalesced = api.scrape_gate.coalesced
+    responses = asyncio.run(run())
+    assert [r.status_code for r in responses] == [200] * 12
+    assert len(scrape_calls) == len(api.SITES)
+    assert api.scrape_gate.coalesced - coalesced == 11
+
+
+def test_per_client_limit_counts_scrapes_it_started(api):
+    async def run():
+        async with client(api, "greedy") as greedy, client(api, "polite") as polite:
+            requests = [greedy.get("/scrape_jobs", params=search(f"greedy {i}")) for i in range(4)]
+            # Joining one of greedy's scrapes is not a new scrape, so it never counts
+            requests += [greedy.get("/scrape_jobs", params=search("greedy 0")), polite.get("/scrape_jobs", params=search("polite"))]
+            return await asyncio.gather(*requests)
+
+    responses = asyncio.run(run())
+    statuses = [r.status_code for r in responses]
+    assert sorted(statuses[:4]) == [200, 200, 429, 429]
+    assert statuses[4:] == [200, 200]
+    assert all(int(r.headers["retry-after"]) >= 1 for r in responses if r.status_code == 429)
+    assert api.scrape_gate.stats()["clients_scraping"] == 0
+
+
+def test_queue_limit_answers_503(api):
+    async def run():
+        async with client(api) as c:
+            return await asyncio.gather(*[c.get("/scrape_jobs", params=search(f"burst {i}")) for i in range(12)])
+
+    statuses = [r.status_code for r in asyncio.run(run())]
+    gate = api.scrape_gate
+    assert statuses.count(503) == 12 - (gate.workers + gate.max_queue)
+    assert statuses.count(200) == gate.workers + gate.max_queue
+
+
+
+def expire(api, term, age):
+    """Ages the cached entry of `term` by `age` seconds (the memory tier is read first)."""
+    key = api.scrape_key(term, "remote", 20)
+    entry = api.scrape_cache.peek(key)
+    api.scrape_cache._memory[key] = entry._replace(fetched_at=entry.fetched_at - age)
+
+
+async def settle(api):
+    while api._revalidating:
+        await asyncio.sleep(0.01)
+
+
+def test_outage_does_not_replace_cached_response(api):
+    async def run():
+        async with client(api) as c:
+            assert (await c.get("/scrape_jobs", params=search("outage"))).headers["x-scrape-partial"] == "false"
+            expire(api, "outage", api.scrape_cache.ttl)
+            down_sites.update(api.SITES)
+            stale = await c.get("/scrape_jobs", params=search("outage"))
+            assert stale.headers["x-cache"] == "STALE" and len(stale.json()) == 100
+            await settle(api)
+            # The failed background refresh stored nothing: the complete response is still served
+            again = await c.get("/scrape_jobs", params=search("outage"))
+            assert again.headers["x-cache"] == "STALE"
+            assert again.headers["x-scrape-partial"] == "false" and len(again.json()) == 100
+            # Nothing cached: the failure is answered but not stored
+            missing = await c.get("/scrape_jobs", params=search("outage nothing cached"))
+            assert missing.json() == {"message": "No jobs found"} and missing.headers["x-scrape-partial"] == "true"
+            assert api.scrape_cache.peek(api.scrape_key("outage nothing cached", "remote", 20)) is None
+            await settle(api)
+
+    scrape_calls.clear()
+    try:
+        asyncio.run(run())
+    finally:
+        down_sites.clear()
+    # The first scrape, the failed refresh, the next stale read's refresh and the uncached search
+    assert len(scrape_calls) == 4 * len(api.SITES)
+
+
+def test_partial_response_is_fresh_only_briefly(api):
+    async def run():
+        async with client(api) as c:
+            down_sites.add("glassdoor")
+            partial = await c.get("/scrape_jobs", params=search("partial"))
+            assert partial.headers["x-scrape-partial"] == "true" and len(partial.json()) == 80
+            assert (await c.get("/scrape_jobs", params=search("partial"))).headers["x-cache"] == "HIT"
+            down_sites.clear()
+            # Once past the short ttl the next request refreshes it with the complete response
+            expire(api, "partial", api.SCRAPE_CACHE_PARTIAL_TTL)
+            assert (await c.get("/scrape_jobs", params=search("partial"))).headers["x-cache"] == "STALE"
+            await settle(api)
+            complete = await c.get("/scrape_jobs", params=search("partial"))
+            assert complete.headers["x-cache"] == "HIT"
+            assert complete.headers["x-scrape-partial"] == "false" and len(complete.json()) == 100
+
+    try:
+        asyncio.run(run())
+    finally:
+        down_sites.clear()
+
+
+def test_partial_refresh_keeps_complete_response(api):
+    async def run():
+        async with client(api) as c:
+            await c.get("/scrape_jobs", params=search("degraded refresh"))
+            expire(api, "degraded refresh", api.scrape_cache.ttl)
+            down_sites.add("linkedin")
+            await c.get("/scrape_jobs", params=search("degraded refresh"))
+            await settle(api)
+            kept = await c.get("/scrape_jobs", params=search("degraded refresh"))
+            assert kept.headers["x-cache"] == "STALE"
+            assert kept.headers["x-scrape-partial"] == "false" and len(kept.json()) == 100
+            await settle(api)
+
+    scrape_calls.clear()
+    try:
+        asyncio.run(run())
+    finally:
+        down_sites.clear()
+    # Still stale, so the read after the partial refresh started another one
+    assert len(scrape_calls) == 3 * len(api.SITES)
+
+
+def test_response_formats_and_pages(api):
+    async def run():
+        async with client(api) as c:
+            records = (await c.get("/scrape_jobs", params=search("formats"))).json()
+            ndjson = await c.get("/scrape_jobs", params={**search("formats"), "format": "ndjson"})
+            columns = (await c.get("/scrape_jobs", params={**search("formats"), "format": "columns"})).json()
+            page = await c.get("/scrape_jobs", params={**search("formats"), "offset": 95, "limit": 10})
+            bad = [
+                (await c.get("/scrape_jobs", params={**search("formats"), **params})).status_code
+                for params in ({"format": "xml"}, {"offset": -1}, {"limit": -5})
+            ]
+            arrow = await c.get("/scrape_jobs", params={**search("formats"), "format": "arrow"})
+            return records, ndjson, columns, page, bad, arrow
+
+    records, ndjson, columns, page, bad, arrow = asyncio.run(run())
+    assert len(records) == 100 and records[0]["site"] in api.SITES
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line) for line in ndjson.text.splitlines()] == records
+    assert columns["rows"] == 100
+    assert [dict(zip(columns["columns"], row)) for row in zip(*columns["data"].values())] == records
+    assert page.json() == records[95:] and page.headers["x-total-count"] == "100"
+    assert bad == [400, 400, 400]
+    if not api.arrow_available():
+        assert arrow.status_code == 501
@@ -0,0 +1,66 @@
+"""
+Entity parity of the NER backends (common.ner_backends) with the
+full-precision pytorch backend. Needs torch and transformers (plus
+optimum[onnxruntime] for onnx) and dslim/bert-base-NER in the local
+model cache; skipped otherwise.
+"""
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from common.ner_backends import load_ner_pipeline  # noqa: E402
+from common.ner_batcher import BatchedNER  # noqa: E402
+
+MODEL_NAME = "dslim/bert-base-NER"
+
+DESCRIPTIONS = [
+    "Acme Corp is hiring a backend engineer in Bangalore.",
+    "You will build REST APIs with Python, Django and PostgreSQL on AWS.",
+    "Experience with Kubernetes, Docker and CI/CD pipelines is a plus.",
+    "Our team at Google Cloud works closely with Microsoft and Oracle partners.",
+    "Infosys is looking for a Java developer with Spring Boot and Hibernate experience in Pune.",
+    "Join Flipkart's data platform team: Spark, Kafka, Airflow and Snowflake on GCP.",
+    "Frontend role at Zomato using React, Redux and TypeScript.",
+    "Salesforce administrators with Tableau and SAP exposure, based in Hyderabad.",
+    "The role reports to the engineering manager in London.",
+    "Strong communication skills and ownership are expected.",
+    " ".join(["Build ML models with TensorFlow and PyTorch for Amazon Web Services customers."] * 40),
+]
+
+# Share of descriptions whose ORG/MISC entities must equal pytorch's exactly
+MIN_SAME = {"int8": 0.8, "onnx": 1.0}
+BACKEND_PACKAGES = {"int8": [], "onnx": ["onnxruntime", "optimum.onnxruntime"]}
+
+
+def entities(backend):
+    """ORG/MISC words per description (what extract_skills keeps), and the backend actually used."""
+    try:
+        ner_pipeline = load_ner_pipeline(MODEL_NAME, backend=backend, aggregation_strategy="simple")
+    except OSError as e:
+        pytest.skip(f"{MODEL_NAME} not available: {e}")
+    results = BatchedNER(ner_pipeline, batch_size=4)(DESCRIPTIONS)
+    return [
+        sorted({entity["word"].lower() for entity in found if entity["entity_group"] in ("ORG", "MISC")})
+        for found in results
+    ], ner_pipeline.backend
+
+
+@pytest.fixture(scope="module")
+def reference():
+    skills, used = entities("pytorch")
+    assert used == "pytorch"
+    return skills
+
+
+@pytest.mark.parametrize("backend", sorted(MIN_SAME))
+def test_backend_matches_pytorch_entities(backend, reference):
+    for package in BACKEND_PACKAGES[backend]:
+        pytest.importorskip(package)
+    skills, used = entities(backend)
+    assert used == backend, f"{backend} fell back to {used}"
+    same = sum(a == b for a, b in zip(reference, skills)) / len(reference)
+    assert same >= MIN_SAME[backend], [
+        (description[:60], expected, got)
+        for description, expected, got in zip(DESCRIPTIONS, reference, skills) if expected != got
+    ]
@@ -0,0 +1,55 @@
+"""
+common.ner_client.NERClient with the NER server unreachable, and the
+input checks of ner_service/ner_server.py (no model needed for either).
+"""
+import threading
+
+import pytest
+
+from common.ner_client import NERClient
+
+UNREACHABLE = "http://127.0.0.1:9"
+
+
+class SlowModel:
+    """Fallback loader that blocks until released; the model tags every text with one entity."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.loads = 0
+
+    def __call__(self):
+        self.loads += 1
+        assert self.release.wait(5)
+        return lambda texts: [[{"word": text}] for text in texts]
+
+
+def test_fallback_loads_in_the_background():
+    model = SlowModel()
+    client = NERClient(UNREACHABLE, load_fallback=model, timeout=1, fallback_wait=0.05)
+    # While the fallback loads, calls get no entities instead of waiting for it
+    assert client(["python", "react"]) == [[], []]
+    assert client(["python"]) == [[]]
+    model.release.set()
+    client._fallback.get(None)
+    assert client(["python"]) == [[{"word": "python"}]]
+    assert model.loads == 1 and client.fallback_calls == 1
+
+
+def test_session_per_thread():
+    client = NERClient(UNREACHABLE)
+    sessions = []
+    threads = [threading.Thread(target=lambda: sessions.append(client.session)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(session) for session in sessions + [client.session]}) == 4
+    assert client.session is client.session
+
+
+@pytest.mark.parametrize("payload", [{}, {"texts": "python"}, {"texts": ["python", 3]}, ["python"], None])
+def test_server_rejects_texts_that_are_not_a_list_of_strings(payload):
+    import ner_server
+    response = ner_server.app.test_client().post("/ner", json=payload)
+    assert response.status_code == 400
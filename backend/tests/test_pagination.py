@@ -0,0 +1,101 @@
+import base64
+
+import pandas as pd
+import pytest
+
+from pagination import RankingPages, encode_cursor
+from scoring import rank_jobs, rank_positions, score_jobs
+
+
+def make_jobs(size=60):
+    roles = ["software engineer", "senior software engineer", "data analyst", "sales executive"]
+    jobs = pd.DataFrame([{
+        "title": roles[index % len(roles)],
+        "company": f"company {index}",
+        "location": "bangalore" if index % 3 else "pune",
+        "description": f"description {index}",
+        "url": f"https://jobs.example/{index}",
+        "skills": ["python", "sql"] if index % 2 else ["excel"],
+        "source": "scraped"
+    } for index in range(size)])
+    jobs.index = [f"job:{index}" for index in range(size)]
+    return jobs
+
+
+def paged(jobs, window=1000):
+    return RankingPages(lambda job_ids, context: jobs[jobs.index.isin(job_ids)], max_limit=50, window=window)
+
+
+def test_pages_follow_the_full_ranking():
+    jobs = make_jobs()
+    scores = score_jobs(jobs, "software engineer", ["python"], "bangalore")
+    full, _ = rank_jobs(jobs, scores)
+    pages = paged(jobs)
+    page = pages.first_page("u1", jobs, scores, 7)
+    ids = [job["id"] for job in page["jobs"]]
+    while page["next_cursor"]:
+        page = pages.next_page("u1", page["next_cursor"], 7)
+        ids += [job["id"] for job in page["jobs"]]
+    assert ids == [f"job:{job['url'].rsplit('/', 1)[1]}" for job in full]
+    assert page["total"] == len(full)
+
+
+def test_later_pages_read_the_current_rows():
+    jobs = make_jobs()
+    scores = score_jobs(jobs, "software engineer", ["python"], "bangalore")
+    pages = paged(jobs)
+    first = pages.first_page("u1", jobs, scores, 5)
+    second_ids = [job["id"] for job in pages.next_page("u1", first["next_cursor"], 5)["jobs"]]
+    # The ranking holds ids and scores only: a job edited since is served as it is now
+    jobs.loc[second_ids[0], "title"] = "staff software engineer"
+    assert pages.next_page("u1", first["next_cursor"], 5)["jobs"][0]["title"] == "staff software engineer"
+
+
+def test_pages_cover_the_ranking_window():
+    jobs = make_jobs(200)
+    scores = score_jobs(jobs, "software engineer", ["python"], "bangalore")
+    full, _ = rank_jobs(jobs, scores)
+    pages = paged(jobs, window=60)
+    page = pages.first_page("u1", jobs, scores, 25)
+    ids = [job["id"] for job in page["jobs"]]
+    while page["next_cursor"]:
+        page = pages.next_page("u1", page["next_cursor"], 25)
+        ids += [job["id"] for job in page["jobs"]]
+    assert len(full) > 60 and page["total"] == 60
+    assert ids == [f"job:{job['url'].rsplit('/', 1)[1]}" for job in full[:60]]
+
+
+def test_top_k_keeps_the_full_sort_order_with_ties():
+    jobs = make_jobs(200)
+    scores = score_jobs(jobs, "software engineer", ["python", "excel"], "bangalore")
+    positions, match_scores, _ = rank_positions(jobs, scores)
+    for limit in (1, 7, 50, len(positions) - 1):
+        top, top_scores, _ = rank_positions(jobs, scores, limit=limit)
+        assert top == positions[:limit] and top_scores == match_scores[:limit]
+
+
+def test_jobs_gone_since_the_first_page_are_left_out():
+    jobs = make_jobs()
+    scores = score_jobs(jobs, "software engineer", ["python"], "bangalore")
+    pages = paged(jobs)
+    first = pages.first_page("u1", jobs, scores, 5)
+    second_ids = [job["id"] for job in pages.next_page("u1", first["next_cursor"], 5)["jobs"]]
+    jobs.drop(index=second_ids[0], inplace=True)
+    assert [job["id"] for job in pages.next_page("u1", first["next_cursor"], 5)["jobs"]] == second_ids[1:]
+    assert pages.next_page("someone else", first["next_cursor"], 5) is None
+
+
+def test_bad_cursor_or_limit_is_rejected():
+    jobs = make_jobs()
+    scores = score_jobs(jobs, "software engineer", ["python"], "bangalore")
+    pages = paged(jobs)
+    first = pages.first_page("u1", jobs, scores, 5)
+    ranking_id = base64.urlsafe_b64decode(first["next_cursor"] + "==").decode().split(":")[0]
+    for cursor in (encode_cursor(ranking_id, -5), "not a cursor", encode_cursor(ranking_id, "x")):
+        with pytest.raises(ValueError):
+            pages.next_page("u1", cursor, 5)
+    for limit in (0, -1, 51):
+        with pytest.raises(ValueError):
+            pages.next_page("u1", first["next_cursor"], limit)
+        with pytest.raises(ValueError):
+            pages.first_page("u1", jobs, scores, limit)
@@ -0,0 +1,64 @@
+import json
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import response_encoding
+from response_encoding import dumps, encode_columns, frame_records, iter_ndjson, loads
+
+
+def scrape_frame():
+    """A jobspy-shaped frame with the dtypes a scrape produces, missing values included."""
+    return pd.DataFrame({
+        "job_url": ["https://a.example/1", "https://a.example/2", None],
+        "title": ["Data Engineer", None, "SDE"],
+        "min_amount": [120000.0, np.nan, 90000.5],
+        "company_rating": pd.array([4, None, 3], dtype="Int64"),
+        "is_remote": [True, False, True],
+        "openings": np.array([1, 2, 3], dtype=np.int64),
+        "date_posted": pd.to_datetime(["2026-03-01", None, "2026-03-03"]),
+        "emails": [["hr@a.example"], None, []],
+    })
+
+
+def test_records_keep_types_and_null_every_missing_value():
+    records = frame_records(scrape_frame())
+    assert records[0] == {
+        "job_url": "https://a.example/1", "title": "Data Engineer", "min_amount": 120000.0, "company_rating": 4,
+        "is_remote": True, "openings": 1, "date_posted": "2026-03-01T00:00:00", "emails": ["hr@a.example"],
+    }
+    assert records[1]["title"] is None and records[1]["min_amount"] is None
+    assert records[1]["company_rating"] is None and records[1]["date_posted"] is None
+    assert records[2]["job_url"] is None and records[2]["is_remote"] is True
+    assert type(records[2]["openings"]) is int
+
+
+def test_json_is_standard_and_stdlib_fallback_matches(monkeypatch):
+    records = frame_records(scrape_frame())
+    encoded = dumps(records)
+    assert json.loads(encoded) == records
+    monkeypatch.setattr(response_encoding, "orjson", None)
+    assert json.loads(dumps(records)) == records
+    # Stray NaN and numpy scalars outside frame_records still encode as valid JSON
+    assert json.loads(dumps({"nan": float("nan"), "n": np.int64(3)})) == {"nan": None, "n": 3}
+
+
+def test_columns_and_ndjson_decode_to_the_same_records(monkeypatch):
+    monkeypatch.setattr(response_encoding, "NDJSON_CHUNK_ROWS", 2)
+    records = frame_records(scrape_frame())
+    columns = loads(encode_columns(records))
+    assert columns["columns"] == list(records[0]) and columns["rows"] == 3
+    assert [dict(zip(columns["columns"], row)) for row in zip(*columns["data"].values())] == records
+    chunks = list(iter_ndjson(records))
+    assert len(chunks) == 2
+    assert [loads(line) for line in b"".join(chunks).splitlines()] == records
+
+
+@pytest.mark.parametrize("fallback", [False, True])
+def test_non_finite_numbers_are_not_emitted_as_invalid_json(fallback, monkeypatch):
+    if fallback:
+        monkeypatch.setattr(response_encoding, "orjson", None)
+    encoded = dumps({"values": [float("inf"), -math.inf, np.float32("nan"), 1.5]})
+    assert json.loads(encoded, parse_constant=pytest.fail) == {"values": [None, None, None, 1.5]}
@@ -0,0 +1,58 @@
+import time
+
+from result_cache import MemoryBackend, RedisBackend, ResultCache
+
+PROFILE = ("data engineer", ["python", "sql"], "pune")
+RECOMMENDATIONS = [{"title": "Data Engineer", "match_score": 82.5}]
+
+
+def test_corpus_change_invalidates_the_key():
+    cache = ResultCache(MemoryBackend())
+    cache.put(cache.key("u1", PROFILE, (3, 7), "fuzzy"), RECOMMENDATIONS)
+    assert cache.get(cache.key("u1", PROFILE, (3, 7), "fuzzy")) == RECOMMENDATIONS
+    # A new mirror version, a new scrape snapshot: both miss and get recomputed
+    assert cache.get(cache.key("u1", PROFILE, (4, 7), "fuzzy")) is None
+    assert cache.get(cache.key("u1", PROFILE, (3, 8), "fuzzy")) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_profile_edits_and_variants_invalidate_but_skill_order_does_not():
+    cache = ResultCache(MemoryBackend())
+    cache.put(cache.key("u1", PROFILE, (1, 1), "fuzzy"), RECOMMENDATIONS)
+    assert cache.get(cache.key("u1", ("data engineer", ["sql", "python"], "pune"), (1, 1), "fuzzy")) == RECOMMENDATIONS
+    assert cache.get(cache.key("u1", ("data engineer", ["python"], "pune"), (1, 1), "fuzzy")) is None
+    assert cache.get(cache.key("u1", PROFILE, (1, 1), "semantic")) is None
+    assert cache.get(cache.key("u2", PROFILE, (1, 1), "fuzzy")) is None
+
+
+def test_memory_backend_expires_and_evicts():
+    backend = MemoryBackend(capacity=2)
+    backend.set("a", 1, ttl=60)
+    backend.set("b", 2, ttl=60)
+    backend.get("a")
+    backend.set("c", 3, ttl=60)
+    assert backend.get("b") is None and backend.get("a") == 1 and len(backend) == 2
+    backend.set("d", 4, ttl=0.01)
+    time.sleep(0.02)
+    assert backend.get("d") is None
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def setex(self, key, ttl, value):
+        self.values[key] = value.encode("utf-8")
+
+
+def test_redis_backend_round_trips_json():
+    client = FakeRedis()
+    cache = ResultCache(RedisBackend(client))
+    key = cache.key("u1", PROFILE, (1, 2))
+    cache.put(key, RECOMMENDATIONS)
+    assert list(client.values) == ["recommendations:" + key]
+    assert cache.get(key) == RECOMMENDATIONS
+    assert cache.get(cache.key("u1", PROFILE, (2, 2))) is None
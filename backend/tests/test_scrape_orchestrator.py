@@ -0,0 +1,48 @@
+import pandas as pd
+import pytest
+
+from common.scrape_orchestrator import ScrapeFailed, ScrapeOrchestrator, all_failed, is_partial
+from scrape_refresher import ScrapeRefresher
+
+
+class FakeBoards:
+    """scrape_jobs stand-in: sites listed in `down` raise, the others return one job each."""
+
+    def __init__(self, down=()):
+        self.down = set(down)
+
+    def __call__(self, site_name, search_term=None, **params):
+        site = site_name[0]
+        if site in self.down:
+            raise ConnectionError(f"{site} unreachable")
+        return pd.DataFrame({"site": [site], "job_url": [f"https://{site}.example/1"], "title": [search_term]})
+
+
+def fetch_with(orchestrator):
+    """How scrape_and_process_jobs scrapes."""
+    def fetch(role, location):
+        return orchestrator.scrape_answered(["indeed", "linkedin"], search_term=role, location=location).jobs
+    return fetch
+
+
+def test_partial_and_failed_results():
+    boards = FakeBoards(down={"linkedin"})
+    orchestrator = ScrapeOrchestrator(boards, retries=0, timeout=5)
+    result = orchestrator.scrape(["indeed", "linkedin"], search_term="sde")
+    assert is_partial(result) and not all_failed(result) and len(result.jobs) == 1
+    boards.down.add("indeed")
+    result = orchestrator.scrape(["indeed", "linkedin"], search_term="sde")
+    assert all_failed(result) and result.jobs.empty
+    with pytest.raises(ScrapeFailed, match="indeed=error"):
+        orchestrator.scrape_answered(["indeed", "linkedin"], search_term="sde")
+
+
+def test_outage_keeps_previous_snapshot():
+    boards = FakeBoards()
+    refresher = ScrapeRefresher(fetch_with(ScrapeOrchestrator(boards, retries=0, timeout=5)))
+    key = refresher.track("sde", "pune")
+    good = refresher.refresh(key)
+    assert len(good.jobs) == 2
+    boards.down.update({"indeed", "linkedin"})
+    assert refresher.refresh(key) is None
+    assert refresher.get("sde", "pune") is good
@@ -0,0 +1,102 @@
+import threading
+
+import pandas as pd
+
+from scrape_refresher import ScrapeRefresher, search_key
+
+
+class FakeScrape:
+    """Stands in for scrape_and_process_jobs: one job per call, or raises when told to fail."""
+
+    def __init__(self):
+        self.calls = []
+        self.fail = False
+
+    def __call__(self, role, location):
+        self.calls.append((role, location))
+        if self.fail:
+            raise ConnectionError("job board unreachable")
+        return pd.DataFrame({"title": [f"{role} {len(self.calls)}"], "location": [location]})
+
+
+def test_get_queues_refresh_and_wait_returns_snapshot():
+    fetch = FakeScrape()
+    refresher = ScrapeRefresher(fetch, max_age=60)
+    assert refresher.get("Data Engineer ", "Bangalore") is None
+    snapshot = refresher.wait("data engineer", "bangalore", timeout=5)
+    assert snapshot.key == search_key("data engineer", "bangalore") == ("data engineer", "bangalore")
+    assert snapshot.version == 1 and list(snapshot.jobs["title"]) == ["data engineer 1"]
+    assert fetch.calls == [("data engineer", "bangalore")]
+
+
+def test_refresh_bumps_version():
+    fetch = FakeScrape()
+    refresher = ScrapeRefresher(fetch)
+    key = refresher.track("python developer", "remote")
+    versions = [refresher.refresh(key).version for _ in range(3)]
+    assert versions == [1, 2, 3]
+    assert refresher.stats()["snapshots"][0]["version"] == 3
+
+
+def test_failed_refresh_keeps_previous_snapshot():
+    fetch = FakeScrape()
+    refresher = ScrapeRefresher(fetch)
+    key = refresher.track("python developer", "remote")
+    good = refresher.refresh(key)
+    fetch.fail = True
+    assert refresher.refresh(key) is None
+    assert refresher.get("python developer", "remote") is good
+    assert refresher.stats()["in_flight"] == 0
+
+
+def test_fresh_snapshot_is_not_refreshed_again():
+    fetch = FakeScrape()
+    refresher = ScrapeRefresher(fetch, max_age=60)
+    refresher.refresh(refresher.track("sde", "pune"))
+    refresher.get("sde", "pune")
+    assert len(fetch.calls) == 1
+
+
+def test_concurrent_gets_share_one_refresh():
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch(role, location):
+        calls.append(role)
+        release.wait(5)
+        return pd.DataFrame({"title": [role]})
+
+    refresher = ScrapeRefresher(slow_fetch)
+    for _ in range(5):
+        refresher.get("sde", "pune")
+    release.set()
+    assert refresher.wait("sde", "pune", timeout=5).version == 1
+    assert calls == ["sde"]
+
+
+def test_keys_nobody_asks_for_expire():
+    fetch = FakeScrape()
+    refresher = ScrapeRefresher(fetch, track_ttl=100)
+    old = refresher.track("old role", "delhi")
+    refresher.refresh(old)
+    refresher.track("new role", "delhi")
+    refresher._tracked[old] -= 1000
+    assert refresher.expire() == [old]
+    refresher.refresh_all()
+    assert fetch.calls == [("old role", "delhi"), ("new role", "delhi")]
+    assert [s["preferred_role"] for s in refresher.stats()["snapshots"]] == ["new role"]
+    assert refresher.stats()["tracked_keys"] == 1
+
+
+def test_callbacks_see_new_and_dropped_snapshots():
+    fetch = FakeScrape()
+    refresher = ScrapeRefresher(fetch, track_ttl=100)
+    seen = []
+    refresher.on_refresh(lambda key, snapshot: seen.append((key, snapshot and snapshot.version)))
+    key = refresher.track("sde", "pune")
+    refresher.refresh(key)
+    fetch.fail = True
+    refresher.refresh(key)
+    refresher._tracked[key] -= 1000
+    refresher.expire()
+    assert seen == [(key, 1), (key, None)]
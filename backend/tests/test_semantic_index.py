@@ -0,0 +1,53 @@
+import threading
+
+from semantic_index import SemanticJobIndex
+
+TITLES = ["Python Developer", "Data Scientist", "Sales Executive", "Frontend Engineer", "DevOps Engineer"]
+
+
+def make_jobs(prefix, count):
+    return {
+        f"{prefix}:{i}": (TITLES[i % len(TITLES)], f"{TITLES[i % len(TITLES)]} role number {i} at company {i % 7}")
+        for i in range(count)
+    }
+
+
+def test_search_limited_to_job_ids_returns_k():
+    index = SemanticJobIndex(None)
+    index.sync("a", make_jobs("a", 200))
+    index.sync("b", make_jobs("b", 20))
+    allowed = [f"b:{i}" for i in range(20)]
+    hits = index.search("python developer", ["python"], k=10, job_ids=allowed)
+    assert len(hits) == 10
+    assert {job_id for job_id, _ in hits} <= set(allowed)
+    assert index.search("python developer", [], k=5, job_ids=[]) == []
+
+
+def test_refit_keeps_jobs_added_meanwhile():
+    index = SemanticJobIndex(None, refit_growth=2.0)
+    index.add(make_jobs("a", 50))
+    fitted = index.encoder
+    original_fit = type(fitted).fit
+    started, release = threading.Event(), threading.Event()
+
+    def slow_fit(encoder, texts):
+        started.set()
+        release.wait(5)
+        original_fit(encoder, texts)
+
+    type(fitted).fit = slow_fit
+    try:
+        refit = threading.Thread(target=index.add, args=(make_jobs("b", 60),))
+        refit.start()
+        assert started.wait(5)
+        # The old index still answers and takes new jobs while the refit runs
+        assert index.search("data scientist", [], k=3)
+        index.add({"late": ("Data Scientist", "late data scientist role")})
+        index.remove(["a:0"])
+        release.set()
+        refit.join(5)
+    finally:
+        type(fitted).fit = original_fit
+    assert index.encoder is not fitted and index.stats()["jobs"] == 110
+    ids = {job_id for job_id, _ in index.search("data scientist", [], k=200)}
+    assert "late" in ids and "a:0" not in ids
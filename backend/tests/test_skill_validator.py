@@ -0,0 +1,78 @@
+"""
+SkillValidator (skill_analysis/skill_validator.py) against the is_valid_skill
+loop it replaced, on the service's own skill lists and a fixture of real,
+misspelled, fragmentary and unrelated skills.
+"""
+import ast
+import os
+import random
+
+import pytest
+from fuzzywuzzy import fuzz
+
+from skill_validator import SkillValidator
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+NOISE = ["microsoft", "bangalore", "team", "experience", "google cloud", "excel", "tableau", "figma",
+         "kafka", "go-lang", "ms office", "leadership", "ux", "ml", "qa", "sap", "crm tools", "xyz", "de", ""]
+
+
+def service_skills():
+    """sales_skills + computer_science_skills of skill_analysis_api.py, read without importing it (it connects to Firestore)."""
+    with open(os.path.join(BACKEND_DIR, "skill_analysis", "skill_analysis_api.py"), encoding="utf-8") as source:
+        tree = ast.parse(source.read())
+    lists = {
+        target.id: ast.literal_eval(node.value)
+        for node in tree.body if isinstance(node, ast.Assign)
+        for target in node.targets if getattr(target, "id", None) in ("sales_skills", "computer_science_skills")
+    }
+    return lists["sales_skills"] + lists["computer_science_skills"]
+
+
+def unbounded_is_valid_skill(skill, known_skills, threshold=85):
+    """is_valid_skill as it was before SkillValidator: every known skill, every call."""
+    if skill.lower() in [ks.lower() for ks in known_skills]:
+        return True
+    for known_skill in known_skills:
+        if skill.lower() in known_skill.lower() or known_skill.lower() in skill.lower():
+            if len(skill) < 3:
+                continue
+            return True
+    for known_skill in known_skills:
+        if fuzz.partial_ratio(skill.lower(), known_skill.lower()) >= threshold:
+            return True
+    return False
+
+
+def skills_fixture(known, size=1500, seed=17):
+    rng = random.Random(seed)
+    words = sorted(known) + NOISE
+    fixture = []
+    for _ in range(size):
+        skill = rng.choice(words)
+        kind = rng.random()
+        if kind < 0.2 and len(skill) > 3:
+            position = rng.randrange(len(skill))
+            skill = skill[:position] + rng.choice("abcdefghijklmnopqrstuvwxyz") + skill[position + 1:]
+        elif kind < 0.35 and skill:
+            start = rng.randrange(len(skill))
+            skill = skill[start:start + rng.randint(1, 6)]
+        elif kind < 0.5:
+            skill = skill.upper() if rng.random() < 0.5 else f"{skill} {rng.choice(NOISE)}"
+        elif kind < 0.6:
+            skill = "".join(rng.choice("bdfghjklmnpqstvwxz") for _ in range(rng.randint(1, 8)))
+        fixture.append(skill)
+    return fixture
+
+
+@pytest.mark.parametrize("threshold", [85, 70])
+def test_verdicts_match_the_unbounded_loop(threshold):
+    known = service_skills()
+    validator = SkillValidator(known)
+    fixture = skills_fixture({skill.lower() for skill in known})
+    expected = [unbounded_is_valid_skill(skill, known, threshold) for skill in fixture]
+    cold = [validator.is_valid(skill, threshold) for skill in fixture]
+    mismatches = [skill for skill, want, got in zip(fixture, expected, cold) if want != got]
+    assert mismatches == []
+    assert [validator.is_valid(skill, threshold) for skill in fixture] == cold
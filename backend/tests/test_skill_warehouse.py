@@ -0,0 +1,111 @@
+import sqlite3
+from datetime import date, datetime, time, timezone
+
+import pytest
+
+from common.skill_warehouse import SkillWarehouse
+
+TODAY = date(2026, 3, 14)
+
+
+def at(day):
+    return datetime.combine(day, time(9), tzinfo=timezone.utc).timestamp()
+
+
+def postings(*skill_lists, prefix="https://jobs.example/"):
+    return [{"posting_id": f"{prefix}{i}", "skills": skills} for i, skills in enumerate(skill_lists)]
+
+
+@pytest.fixture
+def warehouse(tmp_path):
+    warehouse = SkillWarehouse(str(tmp_path / "warehouse.sqlite3"))
+    yield warehouse
+    warehouse.stop()
+
+
+def test_frequency_counts_distinct_postings_per_period(warehouse):
+    day = TODAY.replace(day=13)
+    warehouse.record("skill_analysis", "Data Engineer", "Pune", postings(["python", "sql"], ["python"]), at(day))
+    # The same posting scraped again the same day counts once
+    warehouse.record("skill_analysis", "data engineer", "pune", postings(["python", "sql"]), at(day))
+    warehouse.record("skill_analysis", "data engineer", "pune", postings(["sql"]), at(TODAY))
+    warehouse.flush()
+    result = warehouse.frequency("skill_analysis", "data engineer", "pune", days=7, today=TODAY)
+    # Ties on postings are broken by name
+    assert result["skills"] == ["python", "sql"]
+    assert [(row["period"], row["postings"], row["counts"]) for row in result["series"]] == [
+        ("2026-03-13", 2, {"python": 2, "sql": 1}),
+        ("2026-03-14", 1, {"python": 0, "sql": 1}),
+    ]
+    assert result["series"][0]["share"] == {"python": 1.0, "sql": 0.5}
+    assert warehouse.stats()["duplicates"] == 1
+
+
+def test_growth_compares_shares_period_over_period(warehouse):
+    previous, current = TODAY.replace(day=5), TODAY.replace(day=12)
+    warehouse.record("skill_analysis", "sde", "remote", postings(["python"], ["python"], ["java"], ["java"]), at(previous))
+    warehouse.record("skill_analysis", "sde", "remote", postings(["python"], ["python"], ["python"], ["rust"]), at(current))
+    warehouse.flush()
+    result = warehouse.growth("skill_analysis", "sde", "remote", period_days=7, min_postings=1, today=TODAY)
+    assert result["current"]["postings"] == 4 and result["previous"]["postings"] == 4
+    assert [(row["skill"], row["share"], row["growth"]) for row in result["skills"]] == [
+        ("rust", 0.25, None), ("python", 0.75, 0.5)
+    ]
+
+
+def test_co_occurrence_shares(warehouse):
+    warehouse.record("skill_analysis", "sde", "remote", postings(["python", "sql"], ["python", "sql", "aws"], ["python"]), at(TODAY))
+    warehouse.flush()
+    result = warehouse.co_occurrence("skill_analysis", "Python", "sde", "remote", days=7, today=TODAY)
+    assert result["postings"] == 3
+    assert result["co_occurring"] == [
+        {"skill": "sql", "postings": 2, "share": 0.6667},
+        {"skill": "aws", "postings": 1, "share": 0.3333},
+    ]
+
+
+def test_services_are_counted_apart(warehouse):
+    # The same search from both services: one posting each, different ids and vocabularies
+    warehouse.record("skill_analysis", "sde", "remote", postings(["python"]), at(TODAY))
+    warehouse.record("job_recommendation", "sde", "remote",
+                     postings(["python", "team player"], prefix="scraped:https://jobs.example/"), at(TODAY))
+    warehouse.flush()
+    validated = warehouse.frequency("skill_analysis", "sde", "remote", days=1, today=TODAY)
+    assert validated["skills"] == ["python"] and validated["series"][0]["postings"] == 1
+    assert warehouse.co_occurrence("skill_analysis", "python", days=1, today=TODAY)["co_occurring"] == []
+    unvalidated = warehouse.frequency("job_recommendation", days=1, today=TODAY)
+    assert unvalidated["skills"] == ["python", "team player"]
+
+
+def test_rollups_of_an_old_file_are_rebuilt_per_service(tmp_path):
+    path = str(tmp_path / "warehouse.sqlite3")
+    db = sqlite3.connect(path)
+    db.executescript("""
+        CREATE TABLE jobs (day TEXT NOT NULL, search_term TEXT NOT NULL, location TEXT NOT NULL, posting_id TEXT NOT NULL,
+            scraped_at REAL NOT NULL, service TEXT, site TEXT, title TEXT, company TEXT, job_location TEXT, url TEXT,
+            PRIMARY KEY (day, search_term, location, posting_id)) WITHOUT ROWID;
+        CREATE TABLE job_skills (day TEXT NOT NULL, search_term TEXT NOT NULL, location TEXT NOT NULL,
+            posting_id TEXT NOT NULL, skill TEXT NOT NULL,
+            PRIMARY KEY (day, search_term, location, posting_id, skill)) WITHOUT ROWID;
+        CREATE TABLE search_daily (search_term TEXT NOT NULL, location TEXT NOT NULL, day TEXT NOT NULL,
+            postings INTEGER NOT NULL, PRIMARY KEY (search_term, location, day)) WITHOUT ROWID;
+        CREATE TABLE skill_daily (search_term TEXT NOT NULL, location TEXT NOT NULL, skill TEXT NOT NULL, day TEXT NOT NULL,
+            postings INTEGER NOT NULL, PRIMARY KEY (search_term, location, skill, day)) WITHOUT ROWID;
+        CREATE INDEX skill_daily_by_day ON skill_daily (search_term, location, day);
+        CREATE TABLE skill_pairs_daily (search_term TEXT NOT NULL, location TEXT NOT NULL, skill TEXT NOT NULL,
+            other_skill TEXT NOT NULL, day TEXT NOT NULL, postings INTEGER NOT NULL,
+            PRIMARY KEY (search_term, location, skill, day, other_skill)) WITHOUT ROWID;
+        INSERT INTO jobs VALUES ('2026-03-14', 'sde', 'remote', 'a', 0, 'skill_analysis', NULL, NULL, NULL, NULL, NULL);
+        INSERT INTO jobs VALUES ('2026-03-14', 'sde', 'remote', 'scraped:a', 0, 'job_recommendation', NULL, NULL, NULL, NULL, NULL);
+        INSERT INTO job_skills VALUES ('2026-03-14', 'sde', 'remote', 'a', 'python');
+        INSERT INTO job_skills VALUES ('2026-03-14', 'sde', 'remote', 'a', 'sql');
+        INSERT INTO job_skills VALUES ('2026-03-14', 'sde', 'remote', 'scraped:a', 'python');
+        INSERT INTO search_daily VALUES ('sde', 'remote', '2026-03-14', 2);
+    """)
+    db.close()
+    warehouse = SkillWarehouse(path)
+    result = warehouse.frequency("skill_analysis", "sde", "remote", days=1, today=TODAY)
+    assert result["series"][0]["postings"] == 1 and result["series"][0]["counts"] == {"python": 1, "sql": 1}
+    assert warehouse.co_occurrence("skill_analysis", "sql", days=1, today=TODAY)["co_occurring"][0]["skill"] == "python"
+    assert warehouse.frequency("job_recommendation", days=1, today=TODAY)["skills"] == ["python"]
+    warehouse.stop()
@@ -0,0 +1,101 @@
+import threading
+import time
+
+from common.scrape_orchestrator import ScrapeOrchestrator
+from test_scrape_orchestrator import FakeBoards
+from trending_skills import TrendingSkills, key_filter, parse_windows
+
+WINDOWS = parse_windows("24h,7d")
+
+
+def fetch_with(orchestrator):
+    """How skill_analysis_api.scrape_validated_skills scrapes: one posting per job, its title as the skill."""
+    def fetch(search_term, location):
+        jobs = orchestrator.scrape_answered(["indeed", "linkedin"], search_term=search_term, location=location).jobs
+        return [(url, [f"{site} skill"]) for url, site in zip(jobs["job_url"], jobs["site"])]
+    return fetch
+
+
+def test_outage_keeps_the_previous_view():
+    boards = FakeBoards()
+    trending = TrendingSkills(fetch_with(ScrapeOrchestrator(boards, retries=0, timeout=5)), WINDOWS)
+    key = trending.track("software engineer", "remote")
+    trending.refresh(key)
+    before = trending.view("software engineer", "remote", "24h")
+    assert before["postings"] == 2
+    boards.down.update({"indeed", "linkedin"})
+    trending.refresh(key)
+    assert trending.view("software engineer", "remote", "24h") is before
+
+
+class SlowFetch:
+    """Blocks every scrape until released, returning one posting whose skill names the search."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = []
+
+    def __call__(self, search_term, location):
+        self.calls.append((search_term, location))
+        assert self.release.wait(5)
+        return [(f"{search_term}/{location}", [f"{search_term} skill"])]
+
+
+def trending_with(fetch, **options):
+    trending = TrendingSkills(fetch, WINDOWS, seed=[("software engineer", "remote")], **options)
+    fetch.release.set()
+    trending.refresh(trending.default_key)
+    fetch.release.clear()
+    return trending
+
+
+def wait_for(condition):
+    deadline = time.time() + 5
+    while not condition():
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+
+def test_new_key_gets_the_default_view_without_waiting():
+    fetch = SlowFetch()
+    trending = trending_with(fetch)
+    started = time.perf_counter()
+    first = trending.view("Data  Engineer", "remote", "24h")
+    assert time.perf_counter() - started < 0.5
+    assert first["pending"] and first["search_term"] == "software engineer"
+    assert first["requested"] == {"search_term": "data engineer", "location": "remote"}
+    # Reads while its first scrape runs do not start another one
+    trending.view("data engineer", "remote", "24h")
+    fetch.release.set()
+    wait_for(lambda: "pending" not in trending.view("data engineer", "remote", "24h"))
+    assert trending.view("data engineer", "remote", "24h")["trending_skills"] == ["data engineer skill"]
+    assert fetch.calls.count(("data engineer", "remote")) == 1
+    trending.stop()
+
+
+def test_keys_outside_the_allowlist_never_scrape():
+    fetch = SlowFetch()
+    trending = trending_with(fetch, allow=key_filter("software engineer, data engineer", "*"))
+    answer = trending.view("anything at all", "remote", "24h")
+    assert answer["pending"] is False and answer["search_term"] == "software engineer"
+    assert trending.stats()["tracked_keys"] == 1
+    assert fetch.calls == [("software engineer", "remote")]
+    trending.stop()
+
+
+def test_default_key_survives_eviction():
+    fetch = SlowFetch()
+    fetch.release.set()
+    trending = trending_with(fetch, max_keys=2)
+    for i in range(5):
+        trending.track(f"role {i}", "remote")
+    assert trending.stats()["tracked_keys"] == 2
+    assert trending.view("software engineer", "remote", "24h")["trending_skills"] == ["software engineer skill"]
+    trending.stop()
+
+
+def test_key_filter():
+    allow = key_filter("Software  Engineer,data engineer", "*")
+    assert allow(("software engineer", "pune")) and allow(("data engineer", "remote"))
+    assert not allow(("software", "remote"))
+    assert not key_filter("*", "remote")(("software engineer", "pune"))